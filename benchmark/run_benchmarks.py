@@ -0,0 +1,396 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+@author: David Herron
+"""
+
+'''
+A benchmark suite for the PLRE.
+
+The suite generates a synthetic workload (random k-CNF formulae and random
+truth-value assignments; see workloads.py) and measures, for each parsing
+and evaluation engine of the PLRE:
+- throughput: expressions parsed per second, or formula evaluations
+  (truth-value assignments x formulae) per second; the best of several
+  repeats
+- peak memory: the peak Python heap allocation (via tracemalloc) while
+  setting up and running the benchmark once
+
+Results are compared against stored baseline results (baseline.json), and
+any benchmark whose throughput has dropped, or whose peak memory has
+grown, by more than a tolerance is flagged as a regression; the exit
+status is then 1. Baseline results are machine-specific: regenerate them
+with --save-baseline on the machine used for regression checks.
+
+Example:
+$ cd benchmark
+$ python run_benchmarks.py
+$ python run_benchmarks.py --save-baseline
+$ python run_benchmarks.py --benchmarks parse_handcoded eval_compiled
+'''
+
+#%%
+
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+benchmark_dir = os.path.dirname(os.path.abspath(__file__))
+plre_parent_dir = os.path.dirname(benchmark_dir)
+sys.path.append(plre_parent_dir)
+
+import plre.plre_utils as pu
+from plre.CNFVisitorA import CNFVisitorA
+from plre.plre_adaptive import AdaptiveEvaluator
+from plre.plre_bitset import BitsetEvaluator
+from plre.plre_clausetable import SharedClauseEvaluator
+from plre.plre_compiler import CNFCompiler, CompiledEvaluator
+from plre.plre_incremental import IncrementalEvaluator
+from plre.plre_parser import parse_clauses
+from plre.plre_symbols import SymbolTable
+
+import workloads
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+#%%
+
+DEFAULT_WORKLOAD = {
+    'nr_symbols': 200,
+    'nr_formulas': 100,
+    'nr_clauses': 8,
+    'clause_width': 3,
+    'nr_assignments': 100,
+    'density': 0.5,
+    'seed': 0,
+}
+
+DEFAULT_BASELINE = os.path.join(benchmark_dir, 'baseline.json')
+
+
+class Workload():
+    '''
+    A generated workload: a propSymbolSet, CNF expression texts and
+    truth-value assignments.
+    '''
+
+    def __init__(self, params:dict):
+        self.params = params
+        self.symbols = workloads.make_symbols(params['nr_symbols'])
+        self.expressions = workloads.random_formula_texts(
+            params['nr_formulas'], self.symbols, params['nr_clauses'],
+            params['clause_width'], seed=params['seed'])
+        self.assignments = workloads.random_assignments(
+            params['nr_assignments'], self.symbols, params['density'],
+            seed=params['seed'] + 1)
+
+    def compiled(self):
+        compiler = CNFCompiler(self.symbols)
+        return [compiler.compile_expression(expr) for expr in self.expressions]
+
+    @property
+    def nr_evaluations(self):
+        return len(self.expressions) * len(self.assignments)
+
+
+#%%
+
+# Each benchmark is a function that sets up its engine for a workload and
+# returns (run, unit): run() performs the measured work and returns the
+# number of units of work done. A benchmark holding resources to release
+# (e.g. worker processes) returns (run, unit, close) instead.
+
+def bench_parse_antlr(workload):
+    def run():
+        trees = [pu.parse_cnf(expr)[0] for expr in workload.expressions]
+        return len(trees)
+    return run, 'expressions/s'
+
+
+def bench_parse_handcoded(workload):
+    def run():
+        clauses = [parse_clauses(expr) for expr in workload.expressions]
+        return len(clauses)
+    return run, 'expressions/s'
+
+
+def bench_compile(workload):
+    def run():
+        compiler = CNFCompiler(workload.symbols)
+        formulas = [compiler.compile_expression(expr) for expr in workload.expressions]
+        return len(formulas)
+    return run, 'expressions/s'
+
+
+def bench_eval_visitor(workload):
+    trees = [pu.parse_cnf(expr)[0] for expr in workload.expressions]
+    symbolTable = SymbolTable(workload.symbols)
+    def run():
+        for tva in workload.assignments:
+            visitor = CNFVisitorA(symbolTable, tva)
+            for tree in trees:
+                visitor.visit(tree)
+        return workload.nr_evaluations
+    return run, 'evaluations/s'
+
+
+def bench_eval_compiled(workload):
+    formulas = workload.compiled()
+    evaluator = CompiledEvaluator(workload.symbols, [])
+    def run():
+        for tva in workload.assignments:
+            evaluator.set_assignment(tva)
+            evaluator.evaluate_all(formulas)
+        return workload.nr_evaluations
+    return run, 'evaluations/s'
+
+
+def bench_eval_adaptive(workload):
+    evaluator = AdaptiveEvaluator(workload.symbols, workload.compiled())
+    def run():
+        for tva in workload.assignments:
+            evaluator.evaluate_all(tva)
+        return workload.nr_evaluations
+    return run, 'evaluations/s'
+
+
+def bench_eval_incremental(workload):
+    evaluator = IncrementalEvaluator(workload.symbols, workload.compiled())
+    def run():
+        for tva in workload.assignments:
+            evaluator.update(tva)
+        return workload.nr_evaluations
+    return run, 'evaluations/s'
+
+
+def bench_eval_bitset(workload):
+    evaluator = BitsetEvaluator(workload.symbols, workload.compiled())
+    packed = [evaluator.pack(tva) for tva in workload.assignments]
+    def run():
+        for A in packed:
+            evaluator.evaluate(A)
+        return workload.nr_evaluations
+    return run, 'evaluations/s'
+
+
+def bench_eval_shared(workload):
+    evaluator = SharedClauseEvaluator(workload.symbols, workload.compiled())
+    def run():
+        for tva in workload.assignments:
+            evaluator.evaluate_all(tva)
+        return workload.nr_evaluations
+    return run, 'evaluations/s'
+
+
+def bench_eval_batch(workload):
+    from plre.plre_batch import BatchEvaluator, assignment_matrix
+    evaluator = BatchEvaluator(workload.symbols, workload.compiled())
+    X = assignment_matrix(workload.symbols, workload.assignments)
+    def run():
+        evaluator.evaluate(X)
+        return workload.nr_evaluations
+    return run, 'evaluations/s'
+
+
+def bench_eval_sparse(workload):
+    from plre.plre_sparse import SparseBatchEvaluator, sparse_assignments
+    evaluator = SparseBatchEvaluator(workload.symbols, workload.compiled())
+    indices, indptr = sparse_assignments(workload.symbols, workload.assignments)
+    def run():
+        evaluator.evaluate(indices, indptr)
+        return workload.nr_evaluations
+    return run, 'evaluations/s'
+
+
+def bench_eval_fuzzy(workload):
+    from plre.plre_batch import assignment_matrix
+    from plre.plre_fuzzy import FuzzyEvaluator
+    evaluator = FuzzyEvaluator(workload.symbols, workload.compiled())
+    P = assignment_matrix(workload.symbols, workload.assignments).astype(float)
+    def run():
+        evaluator.evaluate(P)
+        return workload.nr_evaluations
+    return run, 'evaluations/s'
+
+
+def bench_eval_sharedmem(workload):
+    from plre.plre_batch import assignment_matrix
+    from plre.plre_sharedmem import SharedMemoryBatchEvaluator
+    # (min_parallel_rows=0, so that the workload is sent to the workers
+    # rather than evaluated in this process)
+    evaluator = SharedMemoryBatchEvaluator(workload.symbols, workload.compiled(),
+                                           max_workers=2, min_parallel_rows=0)
+    X = evaluator.assignment_buffer(len(workload.assignments))
+    X[...] = assignment_matrix(workload.symbols, workload.assignments)
+    def run():
+        evaluator.evaluate(X)
+        return workload.nr_evaluations
+    return run, 'evaluations/s', evaluator.close
+
+
+BENCHMARKS = {
+    'parse_antlr': bench_parse_antlr,
+    'parse_handcoded': bench_parse_handcoded,
+    'compile': bench_compile,
+    'eval_visitor': bench_eval_visitor,
+    'eval_compiled': bench_eval_compiled,
+    'eval_adaptive': bench_eval_adaptive,
+    'eval_incremental': bench_eval_incremental,
+    'eval_bitset': bench_eval_bitset,
+    'eval_shared': bench_eval_shared,
+}
+
+# benchmarks requiring NumPy
+NUMPY_BENCHMARKS = {
+    'eval_batch': bench_eval_batch,
+    'eval_sparse': bench_eval_sparse,
+    'eval_fuzzy': bench_eval_fuzzy,
+    'eval_sharedmem': bench_eval_sharedmem,
+}
+
+
+def available_benchmarks():
+    benchmarks = dict(BENCHMARKS)
+    if numpy is not None:
+        benchmarks.update(NUMPY_BENCHMARKS)
+    return benchmarks
+
+
+#%%
+
+def measure(benchmark, workload:Workload, repeat:int = 3):
+    '''
+    Measure the throughput and peak memory of one benchmark.
+    '''
+    tracemalloc.start()
+    run, unit, *close = benchmark(workload)
+    try:
+        run()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        best = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            units = run()
+            elapsed = time.perf_counter() - start
+            if best is None or elapsed < best:
+                best = elapsed
+    finally:
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+        for release in close:
+            release()
+    return {'throughput': units / best if best > 0 else float('inf'),
+            'unit': unit,
+            'peak_memory_bytes': peak}
+
+
+def run_benchmarks(names:list, params:dict, repeat:int = 3):
+    '''
+    Run the named benchmarks on a workload generated with params.
+    '''
+    benchmarks = available_benchmarks()
+    workload = Workload(params)
+    results = {}
+    for name in names:
+        if name not in benchmarks:
+            raise ValueError(f'benchmark not available: {name}')
+        results[name] = measure(benchmarks[name], workload, repeat)
+    return {'workload': params, 'results': results}
+
+
+def compare(current:dict, baseline:dict, tolerance:float):
+    '''
+    Compare results against baseline results, returning a list of
+    regression messages. (Results with no baseline are listed by
+    missing_baselines().)
+    '''
+    regressions = []
+    for name, result in current['results'].items():
+        base = baseline['results'].get(name)
+        if base is None:
+            continue
+        if result['throughput'] < base['throughput'] * (1 - tolerance):
+            regressions.append(f'{name}: throughput {result["throughput"]:.4g} {result["unit"]} '
+                               f'< baseline {base["throughput"]:.4g}')
+        if result['peak_memory_bytes'] > base['peak_memory_bytes'] * (1 + tolerance):
+            regressions.append(f'{name}: peak memory {result["peak_memory_bytes"]} bytes '
+                               f'> baseline {base["peak_memory_bytes"]}')
+    return regressions
+
+
+def missing_baselines(current:dict, baseline:dict):
+    '''
+    Return the names of the results that have no baseline to compare
+    against.
+    '''
+    return [name for name in current['results'] if name not in baseline['results']]
+
+
+#%%
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Run the PLRE benchmark suite.')
+    parser.add_argument('--benchmarks', nargs='+', metavar='NAME',
+                        default=sorted(available_benchmarks()),
+                        help='the benchmarks to run (default: all available)')
+    for key, value in DEFAULT_WORKLOAD.items():
+        parser.add_argument('--' + key.replace('_', '-'), type=type(value),
+                            default=value, dest=key)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE,
+                        help='the baseline results file')
+    parser.add_argument('--save-baseline', action='store_true',
+                        help='store the results as the new baseline')
+    parser.add_argument('--output', help='also write the results to this file')
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help='relative change flagged as a regression')
+    args = parser.parse_args(argv)
+
+    params = {key: getattr(args, key) for key in DEFAULT_WORKLOAD}
+    current = run_benchmarks(args.benchmarks, params, args.repeat)
+
+    for name, result in current['results'].items():
+        print(f'{name:18s} {result["throughput"]:12.4g} {result["unit"]:14s} '
+              f'peak {result["peak_memory_bytes"] / 1e6:8.2f} MB')
+
+    if args.output:
+        with open(args.output, 'w') as fp:
+            json.dump(current, fp, indent=2)
+
+    if args.save_baseline:
+        with open(args.baseline, 'w') as fp:
+            json.dump(current, fp, indent=2)
+        print(f'baseline saved: {args.baseline}')
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print('no baseline results to compare against')
+        return 0
+    with open(args.baseline, 'r') as fp:
+        baseline = json.load(fp)
+    if baseline['workload'] != params:
+        print('workload differs from the baseline workload; not comparing')
+        return 0
+
+    for name in missing_baselines(current, baseline):
+        print(f'no baseline for {name}; regenerate the baseline with --save-baseline')
+    regressions = compare(current, baseline, args.tolerance)
+    for message in regressions:
+        print(f'REGRESSION {message}')
+    if not regressions:
+        print('no regressions')
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
+
@@ -0,0 +1,63 @@
+"""
+@author: David Herron
+"""
+
+'''
+A module of synthetic workload generators for benchmarking the PLRE.
+
+The generators produce random k-CNF formulae (as CNF expression text) over
+a set of propositional symbols, and random batches of truth-value
+assignments (as lists of the symbols assigned truth value True). All
+generators are deterministic, given a seed.
+'''
+
+#%%
+
+import random
+
+#%%
+
+def make_symbols(nr_symbols:int):
+    '''
+    Return a propSymbolSet of nr_symbols symbols: ['S0', 'S1', ...].
+    '''
+    return [f'S{idx}' for idx in range(nr_symbols)]
+
+
+def random_clause_text(rng:random.Random, symbols:list,
+                       clause_width:int, negation_prob:float = 0.5):
+    '''
+    Return the text of a random clause of clause_width distinct literals.
+    '''
+    literals = []
+    for symbol in rng.sample(symbols, clause_width):
+        if rng.random() < negation_prob:
+            literals.append('!' + symbol)
+        else:
+            literals.append(symbol)
+    return '(' + ' | '.join(literals) + ')'
+
+
+def random_formula_texts(nr_formulas:int, symbols:list,
+                         nr_clauses:int, clause_width:int,
+                         negation_prob:float = 0.5, seed:int = 0):
+    '''
+    Return the texts of nr_formulas random k-CNF formulae, each a
+    conjunction of nr_clauses clauses of clause_width literals.
+    '''
+    rng = random.Random(seed)
+    return [' & '.join(random_clause_text(rng, symbols, clause_width, negation_prob)
+                       for _ in range(nr_clauses))
+            for _ in range(nr_formulas)]
+
+
+def random_assignments(nr_assignments:int, symbols:list,
+                       density:float = 0.5, seed:int = 0):
+    '''
+    Return nr_assignments random truth-value assignments, in each of which
+    every symbol is True with probability density.
+    '''
+    rng = random.Random(seed)
+    return [[symbol for symbol in symbols if rng.random() < density]
+            for _ in range(nr_assignments)]
+
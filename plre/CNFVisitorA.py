@@ -22,6 +22,8 @@ requiring processing.
 from antlr4 import *
 from .CNFParser import CNFParser
 from .CNFVisitor import CNFVisitor
+from .plre_symbols import SymbolTable
+from . import plre_metrics as metrics
 
 
 class CNFVisitorA(CNFVisitor):
@@ -34,35 +36,48 @@ class CNFVisitorA(CNFVisitor):
 
     def __init__(self, propSymbolSet:list,
                        truthValueAssignment:list,
-                       verbose:bool = False):
+                       verbose:bool = False,
+                       shortCircuit:bool = False):
         super().__init__()
 
-        # verify there are no duplicate symbols
-        propSymbolSet2 = set(propSymbolSet)
-        if len(propSymbolSet2) < len(propSymbolSet):
-            raise ValueError('propSymbolSet contains duplicate symbols')
-        self.propSymbolSet = propSymbolSet
-
-        # verify the validity of the truthValueAssignment
-        if not isinstance(truthValueAssignment, list): 
-            raise ValueError('a truth-value assignment (list) is required')
-        if len(truthValueAssignment) > len(propSymbolSet):
-            raise ValueError('a truth-value assignment cannot be larger than propSymbolSet')
-        # (note: it is valid for a tVA to be empty, i.e. for no symbol to be True)
-        for symbol in truthValueAssignment:
-            if not symbol in propSymbolSet:
-                raise ValueError(f'symbol in truth-value assignment not in propSymbolSet: {symbol}')
+        # intern the propositional symbols in a hash-indexed symbol table
+        # (this also verifies there are no duplicate symbols)
+        self.symbolTable = SymbolTable.of(propSymbolSet)
+        self.propSymbolSet = self.symbolTable.symbols
+
+        # verify the validity of the truthValueAssignment, and hold it as
+        # a list of truth values indexed by symbol index
+        self.truthValues = self.symbolTable.truth_values(truthValueAssignment)
         self.truthValueAssignment = truthValueAssignment    
 
         # initialise container for tracking which symbols are referenced 
         # in CNF expressions and which not
-        self.propSymbolUsage = [False] * len(propSymbolSet)
+        self.propSymbolUsage = [False] * len(self.propSymbolSet)
 
         self.verbose = verbose
 
+        # In short-circuit mode, the visitor stops visiting the clauses of
+        # a CNF expression as soon as one clause is False, and stops
+        # visiting the literals of a clause as soon as one literal is True.
+        # Note that atoms that are not visited are not recorded in
+        # propSymbolUsage.
+        self.shortCircuit = shortCircuit
+
 
     def visitCnf(self, ctx:CNFParser.CnfContext):
 
+        # the root node of a parse tree; if instrumentation is enabled,
+        # time the evaluation of the whole CNF expression
+        if not metrics.enabled:
+            return self._visitCnf(ctx)
+        with metrics.timer('evaluate'):
+            metrics.increment('formulas_evaluated')
+            metrics.increment('nodes_visited')
+            return self._visitCnf(ctx)
+
+
+    def _visitCnf(self, ctx:CNFParser.CnfContext):
+
         # Calculate the number of clauses in the CNF expression
         # as a function of the number of its children.
         # getChildCount(): 2,     4,       6,         8, ...
@@ -88,12 +103,20 @@ class CNFVisitorA(CNFVisitor):
             childIdx = int(clauseIdx * 2)
             truthValue = self.visit(ctx.getChild(childIdx))
             truthValue_cum = truthValue_cum and truthValue
+            if self.shortCircuit and not truthValue_cum:
+                if metrics.enabled:
+                    metrics.increment('short_circuits')
+                break
 
         return truthValue_cum
     
 
     def visitClause(self, ctx:CNFParser.ClauseContext):
  
+        if metrics.enabled:
+            metrics.increment('clauses_evaluated')
+            metrics.increment('nodes_visited')
+
         # A clause may be surrounded by LPAREN '(' and RPAREN ')', but a single
         # literal is also feasible. So we have to handle both cases.
         # If nr_children is 1 (ie < 3), we no parentheses (single literal only).
@@ -137,6 +160,10 @@ class CNFVisitorA(CNFVisitor):
 
         truthValue_cum = truthValue
         for literalIdx in range(1, nr_literals):
+            if self.shortCircuit and truthValue_cum:
+                if metrics.enabled:
+                    metrics.increment('short_circuits')
+                break
             childIdx = (literalIdx * 2) + 1
             truthValue = self.visit(ctx.getChild(childIdx))
             truthValue_cum = truthValue_cum or truthValue
@@ -150,6 +177,9 @@ class CNFVisitorA(CNFVisitor):
 
     def visitLiteral(self, ctx:CNFParser.LiteralContext):
   
+        if metrics.enabled:
+            metrics.increment('nodes_visited')
+
         if ctx.getChildCount() == 2:  # NOT atom
             op = ctx.getChild(0).getText()
             if op in ['~', '!', 'NOT']:
@@ -169,28 +199,26 @@ class CNFVisitorA(CNFVisitor):
     
 
     def visitAtom(self, ctx:CNFParser.AtomContext):
+        if metrics.enabled:
+            metrics.increment('nodes_visited')
+
         # an atom node is a leaf node of the parse tree, whose text 
         # is a propositional symbol within a CNF expression
         propSymbol = ctx.getText()
 
         # verify that the propositional symbol encountered in the CNF 
         # expression is a member of the set of propositional symbols
-        # specified for this visitor
-        if not propSymbol in self.propSymbolSet:
+        # specified for this visitor, and obtain its index
+        idx = self.symbolTable.index.get(propSymbol)
+        if idx is None:
              raise ValueError(f'symbol in CNF expression not recognised: {propSymbol}')
         
         # record which propositional symbols have been used in one or more 
         # CNF expressions, so we can identify and report which symbols have not
-        idx = self.propSymbolSet.index(propSymbol)
         self.propSymbolUsage[idx] = True
 
         # assign specified truth value to propositional symbol
-        if propSymbol in self.truthValueAssignment:
-            truthValue = True
-        else:
-            truthValue = False
-        
-        return truthValue  
+        return self.truthValues[idx]
 
 
 
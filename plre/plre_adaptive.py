@@ -0,0 +1,164 @@
+"""
+@author: David Herron
+"""
+
+'''
+This module specifies an adaptive evaluator of the truth values of a set
+of compiled CNF expressions, which reorders clauses and literals according
+to profiles of how they have evaluated over the truth-value assignments
+observed so far.
+
+With short-circuit evaluation, a CNF expression is False as soon as one
+of its clauses is False, and a clause is True as soon as one of its
+literals is True. So the average amount of work done per truth-value
+assignment is least when the clauses most likely to be False are
+evaluated first, and, within each clause, the literals most likely to be
+True are evaluated first.
+
+Every sample_interval-th truth-value assignment is a profiling sample:
+all clauses and literals are evaluated (without short-circuiting, so that
+the profile is not biased by the current ordering), and per-clause
+falsification counts and per-literal satisfaction counts are updated.
+After every reorder_interval profiling samples, the clauses of each CNF
+expression are reordered by descending falsification rate (shorter
+clauses first, among equals), and the literals of each clause by
+descending satisfaction rate. All other truth-value assignments are
+evaluated with short-circuiting, using the current ordering.
+
+Reordering never changes truth values; results are always reported in
+the original order of the CNF expressions.
+'''
+
+#%%
+
+from .plre_compiler import literal_table
+from .plre_symbols import SymbolTable
+
+#%%
+
+class AdaptiveEvaluator():
+    '''
+    An evaluator of the truth values of a fixed set of compiled CNF
+    expressions (CompiledFormula objects) that adapts its evaluation order
+    to the truth-value assignments it observes.
+    '''
+
+    def __init__(self, propSymbolSet:list,
+                       formulas:list,
+                       sample_interval:int = 16,
+                       reorder_interval:int = 64):
+
+        if sample_interval < 1 or reorder_interval < 1:
+            raise ValueError('sample_interval and reorder_interval must be positive')
+
+        self.symbolTable = SymbolTable.of(propSymbolSet)
+        self.propSymbolSet = self.symbolTable.symbols
+        self.formulas = list(formulas)
+        self.sample_interval = sample_interval
+        self.reorder_interval = reorder_interval
+
+        self.reset_profile()
+
+
+    def reset_profile(self):
+        '''
+        Discard all profile counts and restore the original evaluation order.
+        '''
+        self.nr_assignments = 0
+        self.nr_samples = 0
+        # clause_false[f][c]: number of samples in which clause c of
+        # formula f was False
+        self._clause_false = [[0] * len(formula.clauses)
+                              for formula in self.formulas]
+        # literal_true[f][c][l]: number of samples in which literal l of
+        # clause c of formula f was True
+        self._literal_true = [[[0] * len(clause) for clause in formula.clauses]
+                              for formula in self.formulas]
+        # the current evaluation order of each formula
+        self._plans = [formula.clauses for formula in self.formulas]
+
+
+    def ordered_clauses(self, formulaIdx:int):
+        '''
+        Return the clauses of a formula in their current evaluation order.
+        '''
+        return self._plans[formulaIdx]
+
+
+    def _profile(self, table:list):
+        '''
+        Evaluate all formulas without short-circuiting, updating the
+        profile counts.
+        '''
+        results = []
+        for formulaIdx, formula in enumerate(self.formulas):
+            clause_false = self._clause_false[formulaIdx]
+            literal_true = self._literal_true[formulaIdx]
+            result = True
+            for clauseIdx, clause in enumerate(formula.clauses):
+                counts = literal_true[clauseIdx]
+                satisfied = False
+                for literalIdx, literal in enumerate(clause):
+                    if table[literal]:
+                        counts[literalIdx] += 1
+                        satisfied = True
+                if not satisfied:
+                    clause_false[clauseIdx] += 1
+                    result = False
+            results.append(result)
+        return results
+
+
+    def _reorder(self):
+        '''
+        Reorder the clauses and literals of every formula per the profile.
+        '''
+        plans = []
+        for formulaIdx, formula in enumerate(self.formulas):
+            clause_false = self._clause_false[formulaIdx]
+            literal_true = self._literal_true[formulaIdx]
+            clauses = formula.clauses
+            clause_order = sorted(range(len(clauses)),
+                                  key=lambda c: (-clause_false[c], len(clauses[c])))
+            plan = []
+            for clauseIdx in clause_order:
+                clause = clauses[clauseIdx]
+                counts = literal_true[clauseIdx]
+                literal_order = sorted(range(len(clause)), key=lambda l: -counts[l])
+                plan.append(tuple(clause[l] for l in literal_order))
+            plans.append(tuple(plan))
+        self._plans = plans
+
+
+    def _evaluate_table(self, table:list):
+        results = []
+        for plan in self._plans:
+            result = True
+            for clause in plan:
+                for literal in clause:
+                    if table[literal]:
+                        break
+                else:
+                    result = False
+                    break
+            results.append(result)
+        return results
+
+
+    def evaluate_all(self, truthValueAssignment:list):
+        '''
+        Evaluate the truth values of all formulas, given a truth-value
+        assignment (the list of symbols assigned truth value True).
+        '''
+        table = literal_table(self.symbolTable.truth_values(truthValueAssignment))
+
+        self.nr_assignments += 1
+        if self.nr_assignments % self.sample_interval:
+            return self._evaluate_table(table)
+
+        results = self._profile(table)
+        self.nr_samples += 1
+        if self.nr_samples % self.reorder_interval == 0:
+            self._reorder()
+        return results
+
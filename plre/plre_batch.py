@@ -0,0 +1,282 @@
+"""
+@author: David Herron
+"""
+
+'''
+This module specifies a batch evaluator that evaluates the truth values of
+a set of compiled CNF expressions for a whole batch of truth-value
+assignments at once, using NumPy.
+
+A batch of truth-value assignments is a Boolean matrix X of shape (N, S):
+one row per truth-value assignment, and one column per propositional
+symbol, in propSymbolSet order. The result is a Boolean matrix of shape
+(N, F): one column per CNF expression.
+
+The clauses of all the CNF expressions are numbered 0..C-1 and encoded as
+a (S, C) clause-literal incidence matrix L, where L[s, c] is the number of
+positive occurrences of symbol s in clause c minus the number of its
+negative occurrences. For a 0/1 assignment row x, the quantity
+
+    x @ L[:, c] + (number of negative literals in clause c)
+
+counts the literals of clause c that are True, so clause c is satisfied
+iff that count is positive. The clause truth values for the whole batch
+therefore take one matrix product. A CNF expression is True iff all of its
+(contiguously numbered) clauses are True, which is a segmented reduction
+over the clause axis.
+
+The incidence matrix is dense; its size is S x C.
+
+For diagnostics, evaluate_with_violations() also returns which clauses
+each truth-value assignment violates, as a sparse matrix taken from the
+same (N, C) clause truth values (see ViolationReport).
+
+This module requires NumPy.
+'''
+
+#%%
+
+import numpy as np
+
+from .plre_formulaset import FormulaSet, csr_arrays
+from .plre_symbols import SymbolTable
+from . import plre_metrics as metrics
+
+#%%
+
+def assignment_matrix(propSymbolSet:list, truthValueAssignments:list):
+    '''
+    Convert a list of truth-value assignments (each a list of the symbols
+    assigned truth value True, as used by CNFVisitorA) into a Boolean
+    assignment matrix of shape (N, S).
+    '''
+    symbolTable = SymbolTable.of(propSymbolSet)
+    X = np.zeros((len(truthValueAssignments), len(symbolTable)), dtype=bool)
+    for row, truthValueAssignment in enumerate(truthValueAssignments):
+        X[row, list(symbolTable.true_indices(truthValueAssignment))] = True
+    return X
+
+
+#%%
+
+class ViolationReport():
+    '''
+    The clauses violated (evaluated False) in a batch of N truth-value
+    assignments, together with the truth values of the formulas.
+
+    The violations form a sparse (N, C) Boolean matrix in CSR form: the
+    (global) numbers of the clauses violated by assignment i are
+    indices[indptr[i]:indptr[i+1]], in increasing order. (A
+    scipy.sparse.csr_matrix can be built from (data, indices, indptr),
+    with data all ones.) Clause c belongs to formula clause_formula[c],
+    and is clause c - clause_offsets[clause_formula[c]] of that formula.
+
+    The per-formula rollups are formula_violations, the number of
+    assignments for which each formula is False, and clause_violations,
+    the number of assignments violating each clause.
+    '''
+
+    __slots__ = ('truth_values', 'indptr', 'indices', 'clause_offsets', 'clause_formula',
+                 'formula_violations', 'clause_violations')
+
+    def __init__(self, truth_values, indptr, indices, clause_offsets, clause_formula,
+                       formula_violations, clause_violations):
+        self.truth_values = truth_values
+        self.indptr = indptr
+        self.indices = indices
+        self.clause_offsets = clause_offsets
+        self.clause_formula = clause_formula
+        self.formula_violations = formula_violations
+        self.clause_violations = clause_violations
+
+    @property
+    def nr_violations(self):
+        return len(self.indices)
+
+    def violated_clauses(self, row:int):
+        '''
+        Return the (global) numbers of the clauses violated by a
+        truth-value assignment.
+        '''
+        return self.indices[self.indptr[row]:self.indptr[row + 1]]
+
+    def violated_formula_clauses(self, row:int, formulaIdx:int):
+        '''
+        Return the numbers, within a formula, of the clauses of that
+        formula violated by a truth-value assignment.
+        '''
+        clauses = self.violated_clauses(row)
+        start, stop = self.clause_offsets[formulaIdx], self.clause_offsets[formulaIdx + 1]
+        lo, hi = np.searchsorted(clauses, [start, stop])
+        return clauses[lo:hi] - start
+
+
+#%%
+
+class BatchEvaluator():
+    '''
+    An evaluator of the truth values of a fixed set of compiled CNF
+    expressions (CompiledFormula objects, or a FormulaSet) for batches of truth-value
+    assignments given as Boolean matrices.
+    '''
+
+    def __init__(self, propSymbolSet:list, formulas:list):
+
+        self.symbolTable = SymbolTable.of(propSymbolSet)
+        self.propSymbolSet = self.symbolTable.symbols
+        # (a FormulaSet is used as is, without materialising its formulas)
+        if not isinstance(formulas, FormulaSet):
+            formulas = list(formulas)
+        self.formulas = formulas
+        nr_symbols = len(self.symbolTable)
+
+        # number the clauses of all the formulas contiguously, formula
+        # by formula; clause_offsets[f] is the number of the first clause
+        # of formula f (and clause_offsets[F] is the total, C)
+        literals, literal_offsets, clause_offsets = csr_arrays(formulas)
+        self.clause_offsets = clause_offsets.astype(np.int64)
+        nr_clauses = len(literal_offsets) - 1
+
+        # build the clause-literal incidence matrix and the count of
+        # negative literals per clause
+        literal_clauses = np.repeat(np.arange(nr_clauses), np.diff(literal_offsets))
+        negative = literals < 0
+        incidence = np.zeros((nr_symbols, nr_clauses), dtype=np.float32)
+        np.add.at(incidence, (np.abs(literals) - 1, literal_clauses),
+                  np.where(negative, -1, 1).astype(np.float32))
+        self.incidence = incidence
+        self.neg_counts = np.bincount(literal_clauses[negative],
+                                      minlength=nr_clauses).astype(np.float32)
+
+        # the segmented reduction over clauses skips formulas with no
+        # clauses (which are trivially True)
+        self._clause_formula = np.repeat(np.arange(len(self.clause_offsets) - 1),
+                                         np.diff(self.clause_offsets))
+        nonempty = self.clause_offsets[:-1] < self.clause_offsets[1:]
+        self._nonempty = np.flatnonzero(nonempty)
+        self._nonempty_starts = self.clause_offsets[:-1][nonempty]
+
+
+    @property
+    def nr_formulas(self):
+        return len(self.formulas)
+
+    @property
+    def nr_clauses(self):
+        return int(self.clause_offsets[-1])
+
+
+    def _check_assignments(self, X):
+        X = np.asarray(X)
+        if X.ndim != 2 or X.shape[1] != len(self.propSymbolSet):
+            raise ValueError(f'assignment matrix must have shape (N, {len(self.propSymbolSet)})')
+        return X
+
+
+    def evaluate_clauses(self, X):
+        '''
+        Evaluate the truth values of all clauses for a batch of truth-value
+        assignments, returning a Boolean matrix of shape (N, C).
+        '''
+        X = self._check_assignments(X)
+        true_literal_counts = X.astype(np.float32) @ self.incidence
+        true_literal_counts += self.neg_counts
+        return true_literal_counts > 0
+
+
+    def reduce_clauses(self, clause_values):
+        '''
+        Reduce a Boolean matrix of clause truth values, of shape (N, C),
+        to a Boolean matrix of formula truth values, of shape (N, F).
+        '''
+        nr_rows = clause_values.shape[0]
+        result = np.ones((nr_rows, self.nr_formulas), dtype=bool)
+        if len(self._nonempty):
+            result[:, self._nonempty] = np.logical_and.reduceat(
+                clause_values, self._nonempty_starts, axis=1)
+        return result
+
+
+    def evaluate(self, X):
+        '''
+        Evaluate the truth values of all formulas for a batch of
+        truth-value assignments, returning a Boolean matrix of shape (N, F).
+        '''
+        if not metrics.enabled:
+            return self.reduce_clauses(self.evaluate_clauses(X))
+
+        with metrics.timer('evaluate_batch'):
+            result = self.reduce_clauses(self.evaluate_clauses(X))
+        metrics.increment('assignments_evaluated', result.shape[0])
+        return result
+
+
+    def evaluate_with_violations(self, X):
+        '''
+        Evaluate the truth values of all formulas for a batch of
+        truth-value assignments, and report the clauses each assignment
+        violates, from the same clause evaluation. Returns a
+        ViolationReport.
+        '''
+        if not metrics.enabled:
+            return self._evaluate_with_violations(X)
+
+        with metrics.timer('evaluate_batch'):
+            report = self._evaluate_with_violations(X)
+        metrics.increment('assignments_evaluated', report.truth_values.shape[0])
+        return report
+
+
+    def _evaluate_with_violations(self, X):
+        clause_values = self.evaluate_clauses(X)
+        result = self.reduce_clauses(clause_values)
+        nr_rows = clause_values.shape[0]
+        rows, clauses = np.nonzero(~clause_values)
+        indptr = np.zeros(nr_rows + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=nr_rows), out=indptr[1:])
+        return ViolationReport(
+            result, indptr, clauses, self.clause_offsets, self._clause_formula,
+            nr_rows - np.count_nonzero(result, axis=0),
+            np.bincount(clauses, minlength=self.nr_clauses))
+
+
+    # aggregate queries, per truth-value assignment (row) of a batch
+
+    def all_satisfied(self, X):
+        '''
+        Return a Boolean vector of length N: whether all formulas are True
+        for each truth-value assignment. (All formulas are True iff all
+        clauses are True, so the reduction over formulas is skipped.)
+        '''
+        return self.evaluate_clauses(X).all(axis=1)
+
+
+    def first_violation(self, X):
+        '''
+        Return an integer vector of length N: the index of the first False
+        formula for each truth-value assignment, or -1 if all are True.
+        '''
+        result = self.evaluate(X)
+        first = np.argmin(result, axis=1) if result.shape[1] else \
+                np.zeros(result.shape[0], dtype=np.intp)
+        return np.where(result.all(axis=1), -1, first)
+
+
+    def count_satisfied(self, X):
+        '''
+        Return an integer vector of length N: the number of True formulas
+        for each truth-value assignment.
+        '''
+        return np.count_nonzero(self.evaluate(X), axis=1)
+
+
+    def violated_indices(self, X):
+        '''
+        Return, for each truth-value assignment, an integer array of the
+        indices of the False formulas.
+        '''
+        result = self.evaluate(X)
+        if result.shape[0] == 0:
+            return []
+        rows, cols = np.nonzero(~result)
+        return np.split(cols, np.searchsorted(rows, np.arange(1, result.shape[0])))
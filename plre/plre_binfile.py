@@ -0,0 +1,241 @@
+"""
+@author: David Herron
+"""
+
+'''
+This module specifies a versioned, memory-mappable binary file format for
+compiled formula sets (see plre_formulaset), so that a PLRE input text
+file need be parsed only once, and then loaded by any number of processes
+in time independent of the number of CNF expressions.
+
+A formula set file consists of (all integers little-endian):
+- a fixed-size header (see _HEADER): a magic number, the format version,
+  the numbers of symbols, formulas, clauses and literals, the byte
+  offsets of the sections below, the item sizes of the two offset arrays,
+  and the SHA-256 checksum of the source text file (all zero if unknown)
+- the propSymbolSet, as UTF-8 text with one symbol per line
+- the literals array (int32)
+- the clause_offsets array (int32 or int64)
+- the formula_offsets array (int32 or int64)
+
+The arrays start at 64-byte aligned offsets, so that reading a formula
+set file with mmap=True maps the file (numpy.memmap) and returns a
+FormulaSet whose arrays are read-only views of the mapped pages. Processes
+that map the same file share those pages.
+
+Usage:
+
+    from plre.plre_binfile import load_compiled
+    formulaSet = load_compiled('constraints.txt', 'constraints.plrefs', propSymbolSet)
+
+load_compiled() reads the binary file if it was compiled from the current
+contents of the text file (with the same propSymbolSet), and otherwise
+(re)compiles the text file and writes the binary file.
+'''
+
+#%%
+
+import hashlib
+import os
+import struct
+
+import numpy as np
+
+from .plre_formulaset import FormulaSet
+
+#%%
+
+MAGIC = b'PLREFS\x00\x01'
+
+FORMAT_VERSION = 1
+
+_HEADER = struct.Struct('<8sIIQQQQQQQQQBB6x32s')
+
+_ALIGNMENT = 64
+
+_NO_CHECKSUM = bytes(32)
+
+
+def _aligned(offset:int):
+    return -(-offset // _ALIGNMENT) * _ALIGNMENT
+
+
+def source_checksum(filepath):
+    '''
+    Return the SHA-256 checksum (32 bytes) of the contents of a file.
+    '''
+    digest = hashlib.sha256()
+    with open(filepath, 'rb') as fp:
+        for block in iter(lambda: fp.read(1 << 20), b''):
+            digest.update(block)
+    return digest.digest()
+
+
+#%%
+
+def write_formula_set(filepath, formulaSet:FormulaSet, checksum:bytes = None):
+    '''
+    Write a FormulaSet to a formula set file, optionally recording the
+    checksum of its source text file (see source_checksum()).
+
+    The file is written under a temporary name and then renamed, so
+    processes never observe a partially written file.
+    '''
+    if checksum is None:
+        checksum = _NO_CHECKSUM
+    if len(checksum) != 32:
+        raise ValueError('checksum must be a SHA-256 digest of 32 bytes')
+
+    symbols = '\n'.join(formulaSet.propSymbolSet).encode('utf-8')
+    literals = formulaSet.literals.astype('<i4', copy=False)
+    clause_offsets = formulaSet.clause_offsets
+    clause_offsets = clause_offsets.astype(clause_offsets.dtype.newbyteorder('<'), copy=False)
+    formula_offsets = formulaSet.formula_offsets
+    formula_offsets = formula_offsets.astype(formula_offsets.dtype.newbyteorder('<'), copy=False)
+
+    symbols_offset = _HEADER.size
+    literals_offset = _aligned(symbols_offset + len(symbols))
+    clause_offsets_offset = _aligned(literals_offset + literals.nbytes)
+    formula_offsets_offset = _aligned(clause_offsets_offset + clause_offsets.nbytes)
+
+    header = _HEADER.pack(MAGIC, FORMAT_VERSION, _HEADER.size,
+                          len(formulaSet.propSymbolSet), len(formulaSet),
+                          formulaSet.nr_clauses, len(literals),
+                          symbols_offset, len(symbols),
+                          literals_offset, clause_offsets_offset, formula_offsets_offset,
+                          clause_offsets.itemsize, formula_offsets.itemsize,
+                          checksum)
+
+    tmp_filepath = f'{filepath}.tmp{os.getpid()}'
+    try:
+        with open(tmp_filepath, 'wb') as fp:
+            fp.write(header)
+            fp.write(symbols)
+            for offset, arr in ((literals_offset, literals),
+                                (clause_offsets_offset, clause_offsets),
+                                (formula_offsets_offset, formula_offsets)):
+                fp.write(bytes(offset - fp.tell()))
+                fp.write(arr.tobytes())
+        os.replace(tmp_filepath, filepath)
+    finally:
+        if os.path.exists(tmp_filepath):
+            os.remove(tmp_filepath)
+
+
+#%%
+
+def read_header(filepath):
+    '''
+    Return the header of a formula set file as a dict. Raises ValueError
+    if the file is not a formula set file of a supported format version.
+    '''
+    with open(filepath, 'rb') as fp:
+        data = fp.read(_HEADER.size)
+        file_size = os.fstat(fp.fileno()).st_size
+    if len(data) < _HEADER.size or data[:len(MAGIC)] != MAGIC:
+        raise ValueError(f'not a PLRE formula set file: {filepath}')
+    fields = _HEADER.unpack(data)
+    if fields[1] != FORMAT_VERSION:
+        raise ValueError(f'unsupported formula set file format version: {fields[1]}')
+
+    header = dict(zip(('magic', 'version', 'header_size',
+                       'nr_symbols', 'nr_formulas', 'nr_clauses', 'nr_literals',
+                       'symbols_offset', 'symbols_nbytes',
+                       'literals_offset', 'clause_offsets_offset', 'formula_offsets_offset',
+                       'clause_offsets_itemsize', 'formula_offsets_itemsize',
+                       'checksum'), fields))
+    del header['magic']
+
+    end = header['formula_offsets_offset'] + \
+          (header['nr_formulas'] + 1) * header['formula_offsets_itemsize']
+    if (header['clause_offsets_itemsize'] not in (4, 8) or
+            header['formula_offsets_itemsize'] not in (4, 8) or end > file_size):
+        raise ValueError(f'corrupt PLRE formula set file: {filepath}')
+    return header
+
+
+def read_formula_set(filepath, mmap:bool = True):
+    '''
+    Read a FormulaSet from a formula set file. With mmap=True, the arrays
+    of the FormulaSet are read-only views of the memory-mapped file, and
+    reading takes time independent of the size of the file.
+    '''
+    header = read_header(filepath)
+
+    with open(filepath, 'rb') as fp:
+        fp.seek(header['symbols_offset'])
+        symbols = fp.read(header['symbols_nbytes']).decode('utf-8')
+    propSymbolSet = symbols.split('\n') if symbols else []
+    if len(propSymbolSet) != header['nr_symbols']:
+        raise ValueError(f'corrupt PLRE formula set file: {filepath}')
+
+    if mmap:
+        data = np.memmap(filepath, dtype=np.uint8, mode='r')
+    else:
+        data = np.fromfile(filepath, dtype=np.uint8)
+
+    def section(offset, dtype, count):
+        dtype = np.dtype(dtype)
+        return data[offset:offset + count * dtype.itemsize].view(dtype)
+
+    literals = section(header['literals_offset'], '<i4', header['nr_literals'])
+    clause_offsets = section(header['clause_offsets_offset'],
+                             f'<i{header["clause_offsets_itemsize"]}', header['nr_clauses'] + 1)
+    formula_offsets = section(header['formula_offsets_offset'],
+                              f'<i{header["formula_offsets_itemsize"]}', header['nr_formulas'] + 1)
+
+    # the arrays were validated when the file was written
+    return FormulaSet(propSymbolSet, literals, clause_offsets, formula_offsets,
+                      validate=False)
+
+
+#%%
+
+def compile_file(source_filepath, filepath, propSymbolSet:list, use_mmap:bool = False):
+    '''
+    Compile the CNF expressions of a PLRE input text file into a formula
+    set file, returning the FormulaSet.
+    '''
+    checksum = source_checksum(source_filepath)
+    formulaSet = FormulaSet.from_file(source_filepath, propSymbolSet, use_mmap)
+    write_formula_set(filepath, formulaSet, checksum)
+    return formulaSet
+
+
+def load_compiled(source_filepath, filepath, propSymbolSet:list, mmap:bool = True):
+    '''
+    Return the FormulaSet of a PLRE input text file, read from the formula
+    set file filepath if that file was compiled from the current contents
+    of the text file with the same propSymbolSet; otherwise compile the
+    text file and (re)write the formula set file.
+    '''
+    if os.path.exists(filepath):
+        try:
+            header = read_header(filepath)
+        except ValueError:
+            header = None
+        if header is not None and header['checksum'] == source_checksum(source_filepath):
+            formulaSet = read_formula_set(filepath, mmap)
+            if formulaSet.propSymbolSet == list(propSymbolSet):
+                return formulaSet
+
+    compile_file(source_filepath, filepath, propSymbolSet)
+    return read_formula_set(filepath, mmap)
+
+
+def open_formula_set(filepath, propSymbolSet:list = None, mmap:bool = True):
+    '''
+    Return the FormulaSet of a file that is either a formula set file
+    (which carries its own propSymbolSet) or a PLRE input text file, which
+    is compiled with respect to the given propSymbolSet.
+    '''
+    with open(filepath, 'rb') as fp:
+        is_formula_set_file = fp.read(len(MAGIC)) == MAGIC
+    if is_formula_set_file:
+        formulaSet = read_formula_set(filepath, mmap)
+        if propSymbolSet is not None and formulaSet.propSymbolSet != list(propSymbolSet):
+            raise ValueError(f'propSymbolSet differs from that of formula set file: {filepath}')
+        return formulaSet
+    if propSymbolSet is None:
+        raise ValueError(f'a propSymbolSet is required to compile: {filepath}')
+    return FormulaSet.from_file(filepath, propSymbolSet)
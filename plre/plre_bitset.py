@@ -0,0 +1,139 @@
+"""
+@author: David Herron
+"""
+
+'''
+This module specifies a bitset evaluator of the truth values of compiled
+CNF expressions, as an alternative to the visitor-based CNFVisitorA.
+
+A truth-value assignment is packed into the bits of a Python int: bit i
+is set iff the symbol with index i in the propSymbolSet is True. Each
+clause is represented by a pair of masks over the same bits: pos, with
+the bits of the symbols occurring positively in the clause, and neg,
+with the bits of the symbols occurring negatively. Given a packed
+truth-value assignment A, a clause is satisfied iff
+
+    (pos & A) | (neg & ~A)
+
+is non-zero. The cost of evaluating a clause is then a handful of integer
+operations, regardless of the number of literals in the clause.
+
+Truth-value assignments can also be given as integer scalars other than
+int (e.g. a NumPy uint64), or as sequences of 64-bit words (e.g. a NumPy
+uint64 array), least significant word first.
+'''
+
+#%%
+
+import numbers
+
+from .plre_symbols import SymbolTable
+
+#%%
+
+def pack_assignment(propSymbolSet:list, truthValueAssignment:list):
+    '''
+    Pack a truth-value assignment (the list of symbols assigned truth value
+    True) into an int.
+    '''
+    symbolTable = SymbolTable.of(propSymbolSet)
+    packed = 0
+    for idx in symbolTable.true_indices(truthValueAssignment):
+        packed |= 1 << idx
+    return packed
+
+
+def pack_words(words):
+    '''
+    Pack a sequence of 64-bit words, least significant word first, into
+    an int.
+    '''
+    packed = 0
+    for wordIdx, word in enumerate(words):
+        packed |= int(word) << (64 * wordIdx)
+    return packed
+
+
+def clause_masks(clause):
+    '''
+    Return the (pos, neg) masks of a compiled clause.
+    '''
+    pos = 0
+    neg = 0
+    for literal in clause:
+        if literal > 0:
+            pos |= 1 << (literal - 1)
+        else:
+            neg |= 1 << (-literal - 1)
+    return pos, neg
+
+
+#%%
+
+class BitsetEvaluator():
+    '''
+    An evaluator of the truth values of a fixed set of compiled CNF
+    expressions (CompiledFormula objects) for truth-value assignments
+    packed into ints (or sequences of 64-bit words).
+    '''
+
+    def __init__(self, propSymbolSet:list, formulas:list):
+
+        self.symbolTable = SymbolTable.of(propSymbolSet)
+        self.propSymbolSet = self.symbolTable.symbols
+        self.formulas = list(formulas)
+
+        # one tuple of (pos, neg) clause masks per formula
+        self.masks = [tuple(clause_masks(clause) for clause in formula.clauses)
+                      for formula in self.formulas]
+
+
+    def pack(self, truthValueAssignment:list):
+        '''
+        Pack a truth-value assignment (the list of symbols assigned truth
+        value True) into an int.
+        '''
+        return pack_assignment(self.symbolTable, truthValueAssignment)
+
+
+    def _packed(self, assignment):
+        # (NumPy integer scalars, e.g. np.uint64, are numbers.Integral too)
+        if isinstance(assignment, numbers.Integral):
+            packed = int(assignment)
+        else:
+            packed = pack_words(assignment)
+        if packed < 0 or packed >> len(self.propSymbolSet):
+            raise ValueError('packed truth-value assignment has bits set beyond propSymbolSet')
+        return packed
+
+
+    def evaluate_formula(self, formulaIdx:int, assignment):
+        '''
+        Evaluate the truth value of one formula, given a packed truth-value
+        assignment.
+        '''
+        A = self._packed(assignment)
+        notA = ~A
+        for pos, neg in self.masks[formulaIdx]:
+            if not ((pos & A) or (neg & notA)):
+                return False
+        return True
+
+
+    def evaluate(self, assignment):
+        '''
+        Evaluate the truth values of all formulas, given a packed
+        truth-value assignment.
+        '''
+        A = self._packed(assignment)
+        notA = ~A
+        results = []
+        for masks in self.masks:
+            result = True
+            for pos, neg in masks:
+                if not ((pos & A) or (neg & notA)):
+                    result = False
+                    break
+            results.append(result)
+        return results
+
@@ -0,0 +1,179 @@
+"""
+@author: David Herron
+"""
+
+'''
+This module specifies a bounded, least-recently-used (LRU) cache of
+compiled CNF expressions, keyed by a canonical form of the text of the
+CNF expressions.
+
+Two CNF expressions have the same canonical form if they differ only in
+whitespace (including line breaks), in the spelling of operators (e.g.
+'&' vs 'AND', '!' vs '~' vs 'NOT'), in optional parentheses around
+single-literal clauses, or in the order of the literals within a clause.
+For example, '(B | !A) AND C' and '(NOT A OR B) & (C)' both have the
+canonical form '(!A | B) & (C)'. All CNF expressions with the same
+canonical form share a single CompiledFormula object, and are compiled
+only once. Repeated occurrences of exactly the same text are looked up
+without being parsed again.
+'''
+
+#%%
+
+from collections import OrderedDict
+
+from .plre_compiler import CNFCompiler
+from . import plre_metrics as metrics
+from .plre_parser import parse_cnf_fast
+
+#%%
+
+def canonical_clauses(clauses:list):
+    '''
+    Return the canonical form of clauses given as lists of (symbol, negated)
+    pairs: the literals of each clause are sorted by symbol (a positive
+    literal before its negation), and the order of the clauses is retained.
+    '''
+    return [sorted(clause) for clause in clauses]
+
+
+def canonical_text(clauses:list):
+    '''
+    Return the canonical text of (canonical) clauses.
+    '''
+    return ' & '.join('(' + ' | '.join(('!' + symbol) if negated else symbol
+                                       for symbol, negated in clause) + ')'
+                      for clause in clauses)
+
+
+def canonical_expression(expression_text:str):
+    '''
+    Return the canonical text of a CNF expression, or None if the CNF
+    expression is not syntactically valid.
+    '''
+    clauses = parse_cnf_fast(expression_text)
+    if clauses is None:
+        return None
+    return canonical_text(canonical_clauses(clauses))
+
+
+#%%
+
+class ParseCache():
+    '''
+    A bounded LRU cache of CompiledFormula objects, compiled with respect
+    to a given set of propositional symbols, and keyed by the canonical
+    text of CNF expressions.
+
+    The text attribute of a cached CompiledFormula is the canonical text
+    of the CNF expression. Syntactically invalid CNF expressions are not
+    cached. A maxsize of None means the cache is unbounded.
+
+    In front of the canonical entries is a second LRU mapping of (at most
+    maxsize) exact texts to their canonical keys, so that a hit on text
+    seen before does not parse the text.
+    '''
+
+    def __init__(self, propSymbolSet:list, maxsize:int = 4096):
+
+        if maxsize is not None and maxsize < 1:
+            raise ValueError('maxsize must be positive, or None')
+        self.compiler = CNFCompiler(propSymbolSet)
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._keys = OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, expression_text):
+        key = self._keys.get(expression_text)
+        if key is None:
+            key = canonical_expression(expression_text)
+        return key in self._entries
+
+
+    def compile(self, expression_text:str):
+        '''
+        Return the CompiledFormula for a CNF expression, compiling it only
+        if no CNF expression with the same canonical form is cached.
+        Returns None if the CNF expression contains syntax errors.
+        '''
+        entries = self._entries
+        keys = self._keys
+        key = keys.get(expression_text)
+        if key is not None:
+            formula = entries.get(key)
+            if formula is not None:
+                self.hits += 1
+                if metrics.enabled:
+                    metrics.increment('cache_hits')
+                keys.move_to_end(expression_text)
+                entries.move_to_end(key)
+                return formula
+            # (the canonical entry was evicted)
+            del keys[expression_text]
+
+        clauses = parse_cnf_fast(expression_text)
+        if clauses is None:
+            return None
+        clauses = canonical_clauses(clauses)
+        key = canonical_text(clauses)
+        keys[expression_text] = key
+        if self.maxsize is not None and len(keys) > self.maxsize:
+            keys.popitem(last=False)
+
+        formula = entries.get(key)
+        if formula is not None:
+            self.hits += 1
+            if metrics.enabled:
+                metrics.increment('cache_hits')
+            entries.move_to_end(key)
+            return formula
+
+        self.misses += 1
+        if metrics.enabled:
+            metrics.increment('cache_misses')
+        formula = self.compiler.compile_clauses(clauses, key)
+        entries[key] = formula
+        if self.maxsize is not None and len(entries) > self.maxsize:
+            entries.popitem(last=False)
+            self.evictions += 1
+            if metrics.enabled:
+                metrics.increment('cache_evictions')
+        return formula
+
+
+    def compile_all(self, expressions:list):
+        '''
+        Return the CompiledFormula for each of a list of CNF expressions.
+        '''
+        return [self.compile(expression_text) for expression_text in expressions]
+
+
+    def stats(self):
+        '''
+        Return the cache counters as a dict.
+        '''
+        return {'size': len(self._entries),
+                'maxsize': self.maxsize,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions}
+
+
+    def clear(self):
+        '''
+        Discard all cached entries and reset the counters.
+        '''
+        self._entries.clear()
+        self._keys.clear()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
@@ -0,0 +1,130 @@
+"""
+@author: David Herron
+"""
+
+'''
+This module specifies a shared, hash-consed table of the distinct clauses
+of a set of compiled CNF expressions, and an evaluator that evaluates each
+distinct clause exactly once per truth-value assignment.
+
+Constraint libraries often repeat clauses across formulas (e.g.
+mutual-exclusion pairs such as (!Red | !Green)). Two clauses are the same
+entry of the clause table if they have the same set of literals,
+regardless of the order or repetition of the literals. Each formula is
+then represented by the identifiers of its clauses within the table, and
+its truth value is computed from the shared clause truth values.
+
+The work done per truth-value assignment is proportional to the total
+size of the distinct clauses, rather than to the total size of all the
+clauses of all the formulas.
+'''
+
+#%%
+
+from .plre_compiler import literal_table
+from .plre_symbols import SymbolTable
+from . import plre_metrics as metrics
+
+#%%
+
+class ClauseTable():
+    '''
+    A hash-consed table of distinct clauses, each a tuple of signed
+    integer literals (see plre_compiler) identified by its position
+    within the table.
+    '''
+
+    def __init__(self):
+        self.clauses = []
+        self._index = {}
+        self.nr_occurrences = 0
+
+    def __len__(self):
+        return len(self.clauses)
+
+    def __contains__(self, clause):
+        return frozenset(clause) in self._index
+
+    def intern(self, clause):
+        '''
+        Return the identifier of a clause, adding the clause to the table
+        if no clause with the same set of literals is present.
+        '''
+        self.nr_occurrences += 1
+        key = frozenset(clause)
+        clauseId = self._index.get(key)
+        if clauseId is None:
+            clauseId = self._index[key] = len(self.clauses)
+            self.clauses.append(tuple(sorted(key)))
+        return clauseId
+
+    def intern_formula(self, formula):
+        '''
+        Return the tuple of the identifiers of the clauses of a compiled
+        CNF expression.
+        '''
+        return tuple(self.intern(clause) for clause in formula.clauses)
+
+
+#%%
+
+class SharedClauseEvaluator():
+    '''
+    An evaluator of the truth values of a fixed set of compiled CNF
+    expressions (CompiledFormula objects, or a FormulaSet), built over a
+    shared ClauseTable.
+    '''
+
+    def __init__(self, propSymbolSet:list, formulas):
+
+        self.symbolTable = SymbolTable.of(propSymbolSet)
+        self.propSymbolSet = self.symbolTable.symbols
+
+        self.clauseTable = ClauseTable()
+        self.formula_clauses = [self.clauseTable.intern_formula(formula)
+                                for formula in formulas]
+
+
+    @property
+    def nr_formulas(self):
+        return len(self.formula_clauses)
+
+
+    def sharing_stats(self):
+        '''
+        Return the number of clause occurrences across all formulas and
+        the number of distinct clauses, as a dict.
+        '''
+        return {'clause_occurrences': self.clauseTable.nr_occurrences,
+                'distinct_clauses': len(self.clauseTable)}
+
+
+    def evaluate_clauses(self, truthValueAssignment:list):
+        '''
+        Evaluate the truth value of each distinct clause, given a
+        truth-value assignment (the list of symbols assigned truth value
+        True), returning a list indexed by clause identifier.
+        '''
+        table = literal_table(self.symbolTable.truth_values(truthValueAssignment))
+        clause_values = []
+        append = clause_values.append
+        for clause in self.clauseTable.clauses:
+            for literal in clause:
+                if table[literal]:
+                    append(True)
+                    break
+            else:
+                append(False)
+        if metrics.enabled:
+            metrics.increment('clauses_evaluated', len(clause_values))
+        return clause_values
+
+
+    def evaluate_all(self, truthValueAssignment:list):
+        '''
+        Evaluate the truth values of all formulas, given a truth-value
+        assignment (the list of symbols assigned truth value True).
+        '''
+        clause_values = self.evaluate_clauses(truthValueAssignment)
+        lookup = clause_values.__getitem__
+        return [all(map(lookup, clauseIds)) for clauseIds in self.formula_clauses]
@@ -0,0 +1,290 @@
+"""
+@author: David Herron
+"""
+
+'''
+This module specifies the 'plre' command-line batch evaluator.
+
+The command loads a set of constraints (CNF expressions) once --- from a
+PLRE input text file, given a propSymbolSet file, or from a formula set
+file (see plre_binfile) --- and then streams truth-value assignments from
+a file or stdin, evaluating them chunk by chunk and streaming one line of
+results per assignment to a file or stdout. Memory use is bounded by the
+chunk size, whatever the number of assignments.
+
+Input formats:
+- jsonl: one JSON list per line, of the symbols assigned truth value True
+- csv: a header row of symbols, then one row of 0/1 values per line (the
+  columns may be any subset of the propSymbolSet, in any order; symbols
+  without a column are False)
+Blank input lines are skipped.
+
+Output (one line per assignment), per --report:
+- values: a JSON list of the truth values of the formulas
+- all: true if all formulas are True, false otherwise
+- count: the number of formulas that are True
+- violations: a JSON list of the indices of the formulas that are False
+
+With --workers N > 1, chunks are evaluated in N worker processes; results
+are still written in input order. The constraints are compiled once, in
+the parent process, and their arrays are passed to the workers; formula
+set files are memory-mapped instead, so workers share their pages.
+
+The command requires NumPy (pip install 'plre[numpy]').
+
+Examples:
+$ plre constraints.txt --symbols symbols.txt < assignments.jsonl > results.jsonl
+$ plre constraints.plrefs --input frames.csv --format csv --report violations --workers 8
+'''
+
+#%%
+
+import argparse
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+import csv
+import itertools
+import json
+import sys
+
+from . import plre_utils as pu
+
+try:
+    import numpy as np
+    from .plre_batch import BatchEvaluator, assignment_matrix
+    from .plre_binfile import open_formula_set
+    from .plre_formulaset import FormulaSet
+except ModuleNotFoundError as e:
+    if e.name != 'numpy':
+        raise
+    # (reported by main())
+    np = None
+    BatchEvaluator = None
+
+#%%
+
+FORMATS = ('jsonl', 'csv')
+
+REPORTS = ('values', 'all', 'count', 'violations')
+
+# the evaluation state of a (worker) process, created once per process
+_state = None
+
+def _init_worker(constraints, propSymbolSet:list, columns:list,
+                 input_format:str, report:str):
+    '''
+    Create the evaluation state of a process. The constraints are either
+    a file, or the CSR arrays of a FormulaSet compiled by the parent
+    process.
+    '''
+    global _state
+    if isinstance(constraints, tuple):
+        # (the arrays were validated by the parent process)
+        formulaSet = FormulaSet(propSymbolSet, *constraints, validate=False)
+    else:
+        formulaSet = open_formula_set(constraints, propSymbolSet)
+    evaluator = BatchEvaluator(formulaSet.symbolTable, formulaSet)
+    column_indices = None
+    if columns is not None:
+        index = formulaSet.symbolTable.index
+        for symbol in columns:
+            if symbol not in index:
+                raise ValueError(f'line 1: CSV column not in propSymbolSet: {symbol}')
+        column_indices = np.array([index[symbol] for symbol in columns], dtype=np.intp)
+    _state = (evaluator, column_indices, input_format, report)
+
+
+#%%
+
+def _parse_jsonl(evaluator:BatchEvaluator, numbered_lines:list):
+    truthValueAssignments = []
+    for line_number, line in numbered_lines:
+        try:
+            truthValueAssignment = json.loads(line)
+        except ValueError as e:
+            raise ValueError(f'line {line_number}: invalid JSON: {e}') from e
+        if not isinstance(truthValueAssignment, list) or \
+                not all(isinstance(symbol, str) for symbol in truthValueAssignment):
+            raise ValueError(f'line {line_number}: expected a JSON list of symbols')
+        truthValueAssignments.append(truthValueAssignment)
+    try:
+        return assignment_matrix(evaluator.symbolTable, truthValueAssignments)
+    except ValueError:
+        # locate the offending line
+        for (line_number, _), tva in zip(numbered_lines, truthValueAssignments):
+            try:
+                evaluator.symbolTable.true_indices(tva)
+            except ValueError as e:
+                raise ValueError(f'line {line_number}: {e}') from e
+        raise
+
+
+def _parse_csv(evaluator:BatchEvaluator, column_indices, numbered_lines:list):
+    rows = list(csv.reader(line for _, line in numbered_lines))
+    try:
+        values = np.array(rows, dtype=np.int8)
+    except (ValueError, OverflowError):
+        values = None
+    if values is None or values.ndim != 2 or values.shape[1] != len(column_indices) or \
+            not np.isin(values, (0, 1)).all():
+        for (line_number, _), row in zip(numbered_lines, rows):
+            if len(row) != len(column_indices) or \
+                    any(value.strip() not in ('0', '1') for value in row):
+                raise ValueError(f'line {line_number}: expected {len(column_indices)} 0/1 values')
+        raise ValueError('invalid CSV input')
+    X = np.zeros((len(rows), len(evaluator.propSymbolSet)), dtype=bool)
+    X[:, column_indices] = values != 0
+    return X
+
+
+def _format_results(evaluator:BatchEvaluator, X, report:str):
+    if report == 'values':
+        lines = [json.dumps(row) for row in evaluator.evaluate(X).tolist()]
+    elif report == 'all':
+        lines = ['true' if value else 'false' for value in evaluator.all_satisfied(X)]
+    elif report == 'count':
+        lines = [str(count) for count in evaluator.count_satisfied(X).tolist()]
+    else:
+        lines = [json.dumps(indices.tolist()) for indices in evaluator.violated_indices(X)]
+    return ''.join(line + '\n' for line in lines)
+
+
+def _evaluate_chunk(numbered_lines:list):
+    '''
+    Evaluate a chunk of (line number, input line) pairs, returning the
+    output text for the chunk.
+    '''
+    evaluator, column_indices, input_format, report = _state
+    if input_format == 'jsonl':
+        X = _parse_jsonl(evaluator, numbered_lines)
+    else:
+        X = _parse_csv(evaluator, column_indices, numbered_lines)
+    return _format_results(evaluator, X, report)
+
+
+def _chunks(numbered_lines, chunksize:int):
+    iterator = ((line_number, line) for line_number, line in numbered_lines if line.strip())
+    while True:
+        chunk = list(itertools.islice(iterator, chunksize))
+        if not chunk:
+            return
+        yield chunk
+
+
+#%%
+
+def evaluate_stream(constraints, input_stream, output_stream,
+                    propSymbolSet:list = None,
+                    input_format:str = 'jsonl',
+                    report:str = 'values',
+                    chunksize:int = 10000,
+                    max_workers:int = 1):
+    '''
+    Evaluate the truth-value assignments read from input_stream against
+    the constraints of a file, writing one line of results per assignment
+    to output_stream. Returns the number of assignments evaluated.
+    Raises ValueError, with the input line number, for invalid input.
+    '''
+    if input_format not in FORMATS:
+        raise ValueError(f'input format must be one of {FORMATS}')
+    if report not in REPORTS:
+        raise ValueError(f'report must be one of {REPORTS}')
+    if chunksize < 1 or max_workers < 1:
+        raise ValueError('chunksize and max_workers must be positive')
+
+    numbered_lines = enumerate(input_stream, start=1)
+    columns = None
+    if input_format == 'csv':
+        header = next(numbered_lines, (1, ''))[1]
+        columns = [symbol.strip() for symbol in next(csv.reader([header]), [])]
+    initargs = (constraints, propSymbolSet, columns, input_format, report)
+    chunks = _chunks(numbered_lines, chunksize)
+
+    # (also validates the constraints and CSV header before any workers
+    # are started)
+    _init_worker(*initargs)
+    formulaSet = _state[0].formulas
+    if not isinstance(formulaSet.literals, np.memmap):
+        # pass the compiled constraints to the workers, rather than have
+        # each compile the file again
+        initargs = ((formulaSet.literals, formulaSet.clause_offsets, formulaSet.formula_offsets),
+                    formulaSet.propSymbolSet) + initargs[2:]
+
+    nr_assignments = 0
+    if max_workers == 1:
+        for chunk in chunks:
+            output_stream.write(_evaluate_chunk(chunk))
+            nr_assignments += len(chunk)
+        return nr_assignments
+
+    # keep a bounded number of chunks in flight, so that input is read
+    # no faster than it is evaluated
+    with ProcessPoolExecutor(max_workers, initializer=_init_worker,
+                             initargs=initargs) as executor:
+        pending = deque()
+        for chunk in chunks:
+            pending.append((executor.submit(_evaluate_chunk, chunk), len(chunk)))
+            if len(pending) >= 2 * max_workers:
+                future, nr_rows = pending.popleft()
+                output_stream.write(future.result())
+                nr_assignments += nr_rows
+        while pending:
+            future, nr_rows = pending.popleft()
+            output_stream.write(future.result())
+            nr_assignments += nr_rows
+    return nr_assignments
+
+
+#%%
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='plre',
+        description='Evaluate streamed truth-value assignments against CNF constraints.')
+    parser.add_argument('constraints',
+                        help='a PLRE input text file, or a formula set file')
+    parser.add_argument('--symbols', metavar='FILE',
+                        help='the propSymbolSet file (required for PLRE input text files)')
+    parser.add_argument('--input', default='-',
+                        help='the assignments file (default: stdin)')
+    parser.add_argument('--output', default='-',
+                        help='the results file (default: stdout)')
+    parser.add_argument('--format', choices=FORMATS, default='jsonl',
+                        help='the format of the assignments (default: jsonl)')
+    parser.add_argument('--report', choices=REPORTS, default='values',
+                        help='what to output per assignment (default: values)')
+    parser.add_argument('--chunk-size', type=int, default=10000,
+                        help='assignments evaluated per chunk (default: 10000)')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='worker processes (default: 1)')
+    args = parser.parse_args(argv)
+
+    if np is None:
+        print("plre: error: NumPy is required; install it with: pip install 'plre[numpy]'",
+              file=sys.stderr)
+        return 1
+
+    input_stream = output_stream = None
+    try:
+        propSymbolSet = pu.get_prop_symbols(args.symbols) if args.symbols else None
+        input_stream = sys.stdin if args.input == '-' else open(args.input, 'r', newline='')
+        output_stream = sys.stdout if args.output == '-' else open(args.output, 'w')
+        evaluate_stream(args.constraints, input_stream, output_stream,
+                        propSymbolSet=propSymbolSet,
+                        input_format=args.format,
+                        report=args.report,
+                        chunksize=args.chunk_size,
+                        max_workers=args.workers)
+    except (OSError, ValueError) as e:
+        print(f'plre: error: {e}', file=sys.stderr)
+        return 1
+    finally:
+        if input_stream not in (None, sys.stdin):
+            input_stream.close()
+        if output_stream not in (None, sys.stdout):
+            output_stream.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,89 @@
+"""
+@author: David Herron
+"""
+
+'''
+This module specifies a thin client of the PLRE evaluation server (see
+plre_server). It depends on the Python standard library alone, and keeps
+one persistent HTTP connection to the server.
+
+Usage:
+
+    from plre.plre_client import PLREClient
+    with PLREClient(port=8765) as client:
+        truthValues = client.evaluate('colours', ['Red', 'Big'])
+        batchTruthValues = client.evaluate_batch('colours', [['Red'], ['Green']])
+'''
+
+#%%
+
+import http.client
+import json
+
+#%%
+
+class PLREClient():
+    '''
+    A client of a PLRE evaluation server.
+
+    Requests the server rejects (e.g. an unknown formula set, or a symbol
+    that is not in the propSymbolSet of the formula set) raise ValueError
+    with the server's message.
+    '''
+
+    def __init__(self, host:str = '127.0.0.1', port:int = 8765, timeout:float = None):
+        self._connection = http.client.HTTPConnection(host, port, timeout=timeout)
+
+
+    def _request(self, method:str, path:str, body:dict = None):
+        data = None if body is None else json.dumps(body).encode('utf-8')
+        headers = {'Content-Type': 'application/json'} if data is not None else {}
+        self._connection.request(method, path, body=data, headers=headers)
+        response = self._connection.getresponse()
+        reply = json.loads(response.read())
+        if response.status in (400, 404):
+            raise ValueError(reply['error'])
+        if response.status != 200:
+            raise RuntimeError(f'PLRE server error {response.status}: {reply}')
+        return reply
+
+
+    def formula_sets(self):
+        '''
+        Return a dict describing the formula sets served, by name.
+        '''
+        return self._request('GET', '/formula-sets')
+
+
+    def stats(self):
+        return self._request('GET', '/stats')
+
+
+    def evaluate(self, name:str, truthValueAssignment:list):
+        '''
+        Return the truth values of the formulas of a named formula set,
+        given a truth-value assignment (the list of symbols assigned truth
+        value True).
+        '''
+        return self._request('POST', f'/formula-sets/{name}/evaluate',
+                             {'assignment': list(truthValueAssignment)})['result']
+
+
+    def evaluate_batch(self, name:str, truthValueAssignments:list):
+        '''
+        Return the truth values of the formulas of a named formula set for
+        each of a list of truth-value assignments.
+        '''
+        return self._request('POST', f'/formula-sets/{name}/evaluate',
+                             {'assignments': [list(tva) for tva in truthValueAssignments]})['results']
+
+
+    def close(self):
+        self._connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
@@ -0,0 +1,273 @@
+"""
+@author: David Herron
+"""
+
+'''
+This module compiles CNF expressions into a compact, flat intermediate
+representation (IR), and evaluates the truth values of compiled CNF
+expressions using that IR alone --- without revisiting parse trees.
+
+A compiled CNF expression is a tuple of clauses, where each clause is a
+tuple of signed integer literals. A propositional symbol is identified by
+its 1-based position within the set of propositional symbols (the
+propSymbolSet). A positive literal refers to the symbol itself; a negative
+literal refers to the negation of the symbol (as per the DIMACS CNF
+convention). For example, given propSymbolSet ['A', 'B', 'C', 'D'], the
+CNF expression '(A | B) & (C | !D)' compiles to ((1, 2), (3, -4)).
+
+The parse tree of a CNF expression is walked once, at compile time.
+A compiled CNF expression can then be evaluated for any number of
+truth-value assignments at the cost of a few list lookups per literal.
+'''
+
+#%%
+
+from .CNFParser import CNFParser
+from .plre_parser import cnf_tree_to_clauses, parse_cnf_fast
+from .plre_symbols import SymbolTable
+from . import plre_metrics as metrics
+
+#%%
+
+class CompiledFormula():
+    '''
+    A CNF expression compiled into a tuple of clauses of signed integer
+    literals.
+
+    The (optional) text of the CNF expression from which the compiled
+    formula was produced is retained for reporting purposes only.
+    '''
+
+    __slots__ = ('clauses', 'text')
+
+    def __init__(self, clauses, text:str = None):
+        self.clauses = tuple(tuple(clause) for clause in clauses)
+        self.text = text
+
+    def __len__(self):
+        return len(self.clauses)
+
+    def __iter__(self):
+        return iter(self.clauses)
+
+    def __eq__(self, other):
+        if not isinstance(other, CompiledFormula):
+            return NotImplemented
+        return self.clauses == other.clauses
+
+    def __hash__(self):
+        return hash(self.clauses)
+
+    def __repr__(self):
+        return f'CompiledFormula({self.clauses!r})'
+
+    def __getstate__(self):
+        return (self.clauses, self.text)
+
+    def __setstate__(self, state):
+        self.clauses, self.text = state
+
+
+#%%
+
+class CNFCompiler():
+    '''
+    A compiler of CNF expressions into CompiledFormula objects, with
+    respect to a given set of propositional symbols.
+
+    A compiler is instantiated for a given propSymbolSet, which is
+    subsequently used to map the symbols encountered in CNF expressions
+    to integer symbol identifiers.
+    '''
+
+    def __init__(self, propSymbolSet:list):
+
+        self.symbolTable = SymbolTable.of(propSymbolSet)
+        self.propSymbolSet = self.symbolTable.symbols
+
+        # initialise container for tracking which symbols are referenced
+        # in compiled CNF expressions and which not
+        self.propSymbolUsage = [False] * len(propSymbolSet)
+
+
+    def compile_clauses(self, clauses, text:str = None):
+        '''
+        Compile clauses, given as lists of (symbol, negated) pairs, into
+        a CompiledFormula.
+        '''
+        lookup = self.symbolTable.lookup
+        propSymbolUsage = self.propSymbolUsage
+        compiled = []
+        for clause in clauses:
+            compiled_clause = []
+            for symbol, negated in clause:
+                idx = lookup(symbol)
+                propSymbolUsage[idx] = True
+                compiled_clause.append(-(idx + 1) if negated else idx + 1)
+            compiled.append(compiled_clause)
+        return CompiledFormula(compiled, text)
+
+
+    def compile_tree(self, tree:CNFParser.CnfContext, text:str = None):
+        '''
+        Compile the parse tree of a CNF expression into a CompiledFormula.
+        '''
+        return self.compile_clauses(cnf_tree_to_clauses(tree), text)
+
+
+    def compile_expression(self, expression_text:str):
+        '''
+        Parse and compile the text of a CNF expression.
+
+        The CNF expression is parsed with the hand-coded parser, which
+        falls back to the ANTLR parser to report syntax errors. Returns
+        None if the CNF expression contains syntax errors, as does
+        parse_cnf().
+        '''
+        clauses = parse_cnf_fast(expression_text)
+        if clauses is None:
+            return None
+        return self.compile_clauses(clauses, expression_text)
+
+
+#%%
+
+def literal_table(values:list):
+    '''
+    Convert a list of symbol truth values, indexed by symbol index, into a
+    lookup table indexed directly by signed literal: entries 1..n hold the
+    truth values of the symbols, and (via Python's negative indexing)
+    entries -1..-n hold the truth values of their negations.
+    '''
+    # [unused] + [v1, ..., vn] + [not vn, ..., not v1]
+    return [False] + values + [not value for value in reversed(values)]
+
+
+#%%
+
+class CompiledEvaluator():
+    '''
+    An evaluator of the truth values of compiled CNF expressions, given
+    a truth-value assignment.
+
+    Like CNFVisitorA, an evaluator is instantiated for a given
+    truth-value assignment (the list of symbols assigned truth value
+    True), which is subsequently used to evaluate the truth value of any
+    CompiledFormula compiled with respect to the same propSymbolSet.
+
+    The truth-value assignment is held as a lookup table indexed directly
+    by signed literal (see literal_table()).
+    '''
+
+    def __init__(self, propSymbolSet:list,
+                       truthValueAssignment:list):
+
+        self.symbolTable = SymbolTable.of(propSymbolSet)
+        self.propSymbolSet = self.symbolTable.symbols
+
+        self.set_assignment(truthValueAssignment)
+
+
+    def set_assignment(self, truthValueAssignment:list):
+        '''
+        Bind the evaluator to a new truth-value assignment.
+        '''
+        values = self.symbolTable.truth_values(truthValueAssignment)
+        self.truthValueAssignment = truthValueAssignment
+        self._table = literal_table(values)
+
+
+    def evaluate(self, formula:CompiledFormula):
+        '''
+        Evaluate the truth value of a compiled CNF expression.
+
+        A clause is True as soon as one of its literals is True, and the
+        CNF expression is False as soon as one of its clauses is False.
+        '''
+        if metrics.enabled:
+            return self._evaluate_instrumented(formula)
+        table = self._table
+        for clause in formula.clauses:
+            for literal in clause:
+                if table[literal]:
+                    break
+            else:
+                return False
+        return True
+
+
+    def _evaluate_instrumented(self, formula:CompiledFormula):
+        '''
+        evaluate(), counting clauses and literals evaluated and
+        short-circuits, and timing the evaluation.
+        '''
+        with metrics.timer('evaluate'):
+            table = self._table
+            nr_clauses = 0
+            nr_literals = 0
+            result = True
+            for clause in formula.clauses:
+                nr_clauses += 1
+                for literal in clause:
+                    nr_literals += 1
+                    if table[literal]:
+                        break
+                else:
+                    result = False
+                    break
+        metrics.increment('formulas_evaluated')
+        metrics.increment('clauses_evaluated', nr_clauses)
+        metrics.increment('literals_evaluated', nr_literals)
+        if not result and nr_clauses < len(formula.clauses):
+            metrics.increment('short_circuits')
+        return result
+
+
+    def evaluate_all(self, formulas):
+        '''
+        Evaluate the truth values of a sequence of compiled CNF expressions.
+        '''
+        evaluate = self.evaluate
+        return [evaluate(formula) for formula in formulas]
+
+
+    # aggregate queries: each evaluates the compiled CNF expressions in
+    # order, without materialising their truth values, and stops as soon
+    # as its answer is known
+
+    def all_satisfied(self, formulas):
+        '''
+        Return True if all of a sequence of compiled CNF expressions are
+        True; stops at the first False one.
+        '''
+        return all(map(self.evaluate, formulas))
+
+
+    def first_violation(self, formulas):
+        '''
+        Return the index of the first of a sequence of compiled CNF
+        expressions that is False, or None if all are True.
+        '''
+        evaluate = self.evaluate
+        for formulaIdx, formula in enumerate(formulas):
+            if not evaluate(formula):
+                return formulaIdx
+        return None
+
+
+    def count_satisfied(self, formulas):
+        '''
+        Return the number of a sequence of compiled CNF expressions that
+        are True.
+        '''
+        return sum(map(self.evaluate, formulas))
+
+
+    def violated_indices(self, formulas):
+        '''
+        Return the indices of those of a sequence of compiled CNF
+        expressions that are False.
+        '''
+        evaluate = self.evaluate
+        return [formulaIdx for formulaIdx, formula in enumerate(formulas)
+                if not evaluate(formula)]
@@ -0,0 +1,233 @@
+"""
+@author: David Herron
+"""
+
+'''
+This module specifies FormulaSet, a compact, array-backed container for
+large sets of compiled CNF expressions (formulas).
+
+A FormulaSet stores all of its formulas in a CSR (compressed sparse row)
+style layout of three flat NumPy arrays:
+- literals: the signed integer literals of all clauses of all formulas,
+  concatenated (int32)
+- clause_offsets: clause c consists of literals[clause_offsets[c]:
+  clause_offsets[c+1]]
+- formula_offsets: formula f consists of clauses formula_offsets[f] ..
+  formula_offsets[f+1] - 1
+
+The signed integer literals are those of CompiledFormula (see
+plre_compiler): a positive literal s+1 refers to the symbol with index s
+within the propSymbolSet, and a negative literal -(s+1) to its negation.
+Offset arrays are int32 when the counts allow, and int64 otherwise.
+
+Individual formulas are accessed through lightweight FormulaView objects,
+which expose the same clauses attribute as CompiledFormula, so a
+FormulaSet can be passed wherever a list of CompiledFormula is accepted.
+
+This module requires NumPy.
+'''
+
+#%%
+
+from array import array
+
+import numpy as np
+
+from .plre_compiler import CNFCompiler, CompiledFormula
+from .plre_parser import parse_clauses_checked
+from .plre_symbols import SymbolTable
+from . import plre_utils as pu
+
+#%%
+
+def _offset_dtype(max_value:int):
+    return np.int32 if max_value < 2**31 else np.int64
+
+
+def csr_arrays(formulas):
+    '''
+    Return the (literals, clause_offsets, formula_offsets) arrays of a
+    FormulaSet, or of a sequence of CompiledFormula objects.
+    '''
+    if isinstance(formulas, FormulaSet):
+        return formulas.literals, formulas.clause_offsets, formulas.formula_offsets
+
+    literals = array('i')
+    clause_offsets = array('q', [0])
+    formula_offsets = array('q', [0])
+    for formula in formulas:
+        for clause in formula.clauses:
+            literals.extend(clause)
+            clause_offsets.append(len(literals))
+        formula_offsets.append(len(clause_offsets) - 1)
+    return (np.frombuffer(literals, dtype=np.int32).copy(),
+            np.array(clause_offsets, dtype=_offset_dtype(len(literals))),
+            np.array(formula_offsets, dtype=_offset_dtype(len(clause_offsets))))
+
+
+#%%
+
+class FormulaView():
+    '''
+    A view of one formula of a FormulaSet.
+    '''
+
+    __slots__ = ('formula_set', 'index')
+
+    def __init__(self, formula_set, index:int):
+        self.formula_set = formula_set
+        self.index = index
+
+    @property
+    def clauses(self):
+        '''
+        The clauses of the formula, as a tuple of tuples of signed integer
+        literals (materialised on each access).
+        '''
+        return self.formula_set.formula_clauses(self.index)
+
+    def __len__(self):
+        formula_offsets = self.formula_set.formula_offsets
+        return int(formula_offsets[self.index + 1] - formula_offsets[self.index])
+
+    def __iter__(self):
+        return iter(self.clauses)
+
+    def to_compiled(self):
+        '''
+        Return the formula as a (standalone) CompiledFormula.
+        '''
+        return CompiledFormula(self.clauses)
+
+    def __repr__(self):
+        return f'FormulaView({self.index}, {self.clauses!r})'
+
+
+#%%
+
+class FormulaSet():
+    '''
+    An array-backed set of compiled CNF expressions over a given set of
+    propositional symbols, stored in a CSR-style layout.
+    '''
+
+    def __init__(self, propSymbolSet:list,
+                       literals,
+                       clause_offsets,
+                       formula_offsets,
+                       validate:bool = True):
+
+        self.symbolTable = SymbolTable.of(propSymbolSet)
+        self.propSymbolSet = self.symbolTable.symbols
+
+        self.literals = np.asarray(literals)
+        self.clause_offsets = np.asarray(clause_offsets)
+        self.formula_offsets = np.asarray(formula_offsets)
+
+        # verify the consistency of the arrays (which reads all of them)
+        if validate:
+            self._validate()
+
+
+    def _validate(self):
+        if (len(self.clause_offsets) == 0 or len(self.formula_offsets) == 0
+                or self.clause_offsets[0] != 0 or self.formula_offsets[0] != 0
+                or self.clause_offsets[-1] != len(self.literals)
+                or self.formula_offsets[-1] != len(self.clause_offsets) - 1
+                or np.any(np.diff(self.clause_offsets) < 0)
+                or np.any(np.diff(self.formula_offsets) < 0)):
+            raise ValueError('inconsistent formula set arrays')
+        if len(self.literals) and (np.any(self.literals == 0) or
+                                   np.abs(self.literals).max() > len(self.symbolTable)):
+            raise ValueError('formula set literal out of range of propSymbolSet')
+
+
+    @classmethod
+    def from_formulas(cls, propSymbolSet:list, formulas):
+        '''
+        Create a FormulaSet from a sequence of CompiledFormula objects.
+        '''
+        return cls(propSymbolSet, *csr_arrays(formulas))
+
+
+    @classmethod
+    def from_expressions(cls, propSymbolSet:list, expressions):
+        '''
+        Create a FormulaSet by parsing and compiling the text of CNF
+        expressions. Raises ValueError (CNFSyntaxError for syntax errors)
+        at the first CNF expression that cannot be compiled.
+        '''
+        return cls.from_formulas(propSymbolSet,
+                                 _compile_expressions(propSymbolSet, enumerate(expressions)))
+
+
+    @classmethod
+    def from_file(cls, filepath, propSymbolSet:list, use_mmap:bool = False):
+        '''
+        Create a FormulaSet from the CNF expressions of a PLRE input text
+        file, which is read lazily. Raises ValueError at the first CNF
+        expression that cannot be compiled, with its line number.
+        '''
+        return cls.from_formulas(propSymbolSet,
+                                 _compile_expressions(propSymbolSet,
+                                                      pu.iter_cnf_expressions(filepath, use_mmap),
+                                                      'line '))
+
+
+    def __len__(self):
+        return len(self.formula_offsets) - 1
+
+    def __getitem__(self, index:int):
+        nr_formulas = len(self)
+        if index < 0:
+            index += nr_formulas
+        if not 0 <= index < nr_formulas:
+            raise IndexError('formula index out of range')
+        return FormulaView(self, index)
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield FormulaView(self, index)
+
+
+    @property
+    def nr_clauses(self):
+        return len(self.clause_offsets) - 1
+
+    @property
+    def nbytes(self):
+        '''
+        The number of bytes occupied by the arrays of the FormulaSet.
+        '''
+        return self.literals.nbytes + self.clause_offsets.nbytes + self.formula_offsets.nbytes
+
+
+    def formula_clauses(self, index:int):
+        '''
+        Return the clauses of a formula, as a tuple of tuples of signed
+        integer literals.
+        '''
+        clause_start = int(self.formula_offsets[index])
+        clause_end = int(self.formula_offsets[index + 1])
+        offsets = self.clause_offsets[clause_start:clause_end + 1].tolist()
+        literals = self.literals[offsets[0]:offsets[-1]].tolist()
+        base = offsets[0]
+        return tuple(tuple(literals[start - base:end - base])
+                     for start, end in zip(offsets[:-1], offsets[1:]))
+
+
+#%%
+
+def _compile_expressions(propSymbolSet:list, numbered_expressions, label:str = 'expression '):
+    '''
+    Yield a CompiledFormula for each (number, expression) pair, raising
+    ValueError for the first CNF expression that cannot be compiled.
+    '''
+    compiler = CNFCompiler(propSymbolSet)
+    for number, expression_text in numbered_expressions:
+        try:
+            clauses = parse_clauses_checked(expression_text)
+            yield compiler.compile_clauses(clauses)
+        except ValueError as e:
+            raise type(e)(f'{label}{number}: {e}') from e
+
@@ -0,0 +1,160 @@
+"""
+@author: David Herron
+"""
+
+'''
+This module specifies a batch evaluator of the degree to which a set of
+compiled CNF expressions is satisfied by a batch of per-symbol truth
+degrees (e.g. the output probabilities of a neural network), under fuzzy
+logic (t-norm) semantics, using NumPy.
+
+A batch of truth degrees is a float matrix P of shape (N, S), with values
+in [0, 1]: one row per instance, and one column per propositional symbol,
+in propSymbolSet order. The truth degree of a negative literal is 1 - p.
+The truth degree of a clause is the t-conorm (fuzzy OR) of the truth
+degrees of its literals, and the truth degree of a CNF expression is the
+t-norm (fuzzy AND) of the truth degrees of its clauses, per the selected
+semantics:
+
+semantics    | t-norm (AND)             | t-conorm (OR)
+---          | ---                      | ---
+'godel'      | min(a, b)                | max(a, b)
+'product'    | a * b                    | a + b - a * b
+'lukasiewicz'| max(0, a + b - 1)        | min(1, a + b)
+
+On 0/1 truth degrees, all three semantics agree with Boolean evaluation.
+
+The truth degrees of all the literals of all the clauses are gathered
+into an array of shape (N, L), where L is the total number of literals,
+and reduced per clause with segmented reductions (ufunc.reduceat) over
+the contiguous literals of each clause; likewise the clause truth degrees
+per CNF expression. Memory use scales with N * L, however the lengths of
+the clauses vary. Empty clauses (and CNF expressions with no clauses) take
+the identity element of the reduction (0 for t-conorms, 1 for t-norms).
+
+This module requires NumPy.
+'''
+
+#%%
+
+import numpy as np
+
+from .plre_formulaset import FormulaSet, csr_arrays
+from .plre_symbols import SymbolTable
+
+#%%
+
+SEMANTICS = ('godel', 'product', 'lukasiewicz')
+
+
+def _segments(offsets):
+    '''
+    Describe the segments of a CSR offsets array for the segmented
+    reductions: the number of segments, the indices of the non-empty
+    segments, and their starts and lengths.
+    '''
+    offsets = np.asarray(offsets, dtype=np.int64)
+    lengths = np.diff(offsets)
+    nonempty = np.flatnonzero(lengths)
+    return len(lengths), nonempty, offsets[:-1][nonempty], lengths[nonempty]
+
+
+def _t_conorm(x, segments:tuple, semantics:str):
+    '''
+    Reduce truth degrees over segments of the columns of x with the
+    t-conorm (fuzzy OR). (x may be overwritten.)
+    '''
+    nr_segments, nonempty, starts, lengths = segments
+    result = np.zeros((x.shape[0], nr_segments))
+    if len(nonempty) == 0:
+        return result
+    if semantics == 'godel':
+        result[:, nonempty] = np.maximum.reduceat(x, starts, axis=1)
+    elif semantics == 'product':
+        result[:, nonempty] = 1.0 - np.multiply.reduceat(np.subtract(1.0, x, out=x), starts, axis=1)
+    else:
+        result[:, nonempty] = np.minimum(1.0, np.add.reduceat(x, starts, axis=1))
+    return result
+
+
+def _t_norm(x, segments:tuple, semantics:str):
+    '''
+    Reduce truth degrees over segments of the columns of x with the t-norm
+    (fuzzy AND).
+    '''
+    nr_segments, nonempty, starts, lengths = segments
+    result = np.ones((x.shape[0], nr_segments))
+    if len(nonempty) == 0:
+        return result
+    if semantics == 'godel':
+        result[:, nonempty] = np.minimum.reduceat(x, starts, axis=1)
+    elif semantics == 'product':
+        result[:, nonempty] = np.multiply.reduceat(x, starts, axis=1)
+    else:
+        result[:, nonempty] = np.maximum(0.0, np.add.reduceat(x, starts, axis=1) - (lengths - 1))
+    return result
+
+
+#%%
+
+class FuzzyEvaluator():
+    '''
+    An evaluator of the truth degrees of a fixed set of compiled CNF
+    expressions (CompiledFormula objects, or a FormulaSet) for batches of
+    per-symbol truth degrees, under a selectable t-norm semantics.
+    '''
+
+    def __init__(self, propSymbolSet:list,
+                       formulas:list,
+                       semantics:str = 'product'):
+
+        if semantics not in SEMANTICS:
+            raise ValueError(f'semantics must be one of {SEMANTICS}')
+        self.semantics = semantics
+
+        self.symbolTable = SymbolTable.of(propSymbolSet)
+        self.propSymbolSet = self.symbolTable.symbols
+        # (a FormulaSet is used as is, without materialising its formulas)
+        if not isinstance(formulas, FormulaSet):
+            formulas = list(formulas)
+        self.formulas = formulas
+        nr_symbols = len(self.symbolTable)
+
+        # Literal truth degrees are gathered from the columns of the
+        # matrix [P, 1 - P]: positive literal s+1 selects column s, and
+        # negative literal -(s+1) selects column S + s.
+        literals, literal_offsets, clause_offsets = csr_arrays(formulas)
+        literals = np.asarray(literals, dtype=np.int64)
+        self._literal_columns = np.where(literals > 0, literals - 1, nr_symbols - literals - 1)
+        self.nr_clauses = len(literal_offsets) - 1
+        self._clause_segments = _segments(literal_offsets)
+        self._formula_segments = _segments(clause_offsets)
+
+
+    def _check_degrees(self, P):
+        P = np.asarray(P, dtype=np.float64)
+        if P.ndim != 2 or P.shape[1] != len(self.propSymbolSet):
+            raise ValueError(f'truth degree matrix must have shape (N, {len(self.propSymbolSet)})')
+        if P.size and (P.min() < 0.0 or P.max() > 1.0):
+            raise ValueError('truth degrees must lie in [0, 1]')
+        return P
+
+
+    def evaluate_clauses(self, P):
+        '''
+        Evaluate the truth degrees of all clauses for a batch of per-symbol
+        truth degrees, returning a float matrix of shape (N, C).
+        '''
+        P = self._check_degrees(P)
+        literal_degrees = np.concatenate([P, 1.0 - P], axis=1)
+        gathered = literal_degrees[:, self._literal_columns]
+        return _t_conorm(gathered, self._clause_segments, self.semantics)
+
+
+    def evaluate(self, P):
+        '''
+        Evaluate the truth degrees of all formulas for a batch of
+        per-symbol truth degrees, returning a float matrix of shape (N, F).
+        '''
+        clause_degrees = self.evaluate_clauses(P)
+        return _t_norm(clause_degrees, self._formula_segments, self.semantics)
@@ -0,0 +1,173 @@
+"""
+@author: David Herron
+"""
+
+'''
+This module specifies an incremental evaluator of the truth values of a
+set of compiled CNF expressions, for sequences of truth-value assignments
+that differ from one another in only a few symbols (e.g. the predictions
+for consecutive frames of a video).
+
+The evaluator maintains, for every clause, the number of its literals
+that are True, and, for every CNF expression, the number of its clauses
+that are False (i.e. have no True literals). A CNF expression is True
+iff it has no False clauses. An index from each symbol to the clauses in
+which it occurs, positively or negatively, means that changing the truth
+value of a symbol updates only the clauses that mention it. The cost of
+moving to a new truth-value assignment is therefore proportional to the
+number of occurrences of the symbols whose truth values change, not to
+the size of the set of CNF expressions.
+'''
+
+#%%
+
+from .plre_symbols import SymbolTable
+
+#%%
+
+class IncrementalEvaluator():
+    '''
+    A stateful evaluator of the truth values of a fixed set of compiled CNF
+    expressions (CompiledFormula objects) that updates the truth values
+    incrementally as the truth values of symbols change.
+    '''
+
+    def __init__(self, propSymbolSet:list,
+                       formulas:list,
+                       truthValueAssignment:list = None):
+
+        self.symbolTable = SymbolTable.of(propSymbolSet)
+        self.propSymbolSet = self.symbolTable.symbols
+        self.formulas = list(formulas)
+        nr_symbols = len(self.symbolTable)
+
+        # number the clauses of all formulas contiguously, and index the
+        # clauses in which each symbol occurs positively and negatively
+        self._clause_formula = []
+        self._pos_occurrences = [[] for _ in range(nr_symbols)]
+        self._neg_occurrences = [[] for _ in range(nr_symbols)]
+        for formulaIdx, formula in enumerate(self.formulas):
+            for clause in formula.clauses:
+                clauseIdx = len(self._clause_formula)
+                self._clause_formula.append(formulaIdx)
+                for literal in clause:
+                    if literal > 0:
+                        self._pos_occurrences[literal - 1].append(clauseIdx)
+                    else:
+                        self._neg_occurrences[-literal - 1].append(clauseIdx)
+
+        # with every symbol False, a clause's True literals are its
+        # negative literals
+        self._values = [False] * nr_symbols
+        self._true_symbols = set()
+        self._true_counts = [0] * len(self._clause_formula)
+        for occurrences in self._neg_occurrences:
+            for clauseIdx in occurrences:
+                self._true_counts[clauseIdx] += 1
+        self._false_clauses = [0] * len(self.formulas)
+        for clauseIdx, count in enumerate(self._true_counts):
+            if count == 0:
+                self._false_clauses[self._clause_formula[clauseIdx]] += 1
+
+        if truthValueAssignment:
+            self.update(truthValueAssignment)
+
+
+    def truth_values(self):
+        '''
+        Return the current truth values of all formulas.
+        '''
+        return [count == 0 for count in self._false_clauses]
+
+
+    def is_true(self, formulaIdx:int):
+        '''
+        Return the current truth value of a formula.
+        '''
+        return self._false_clauses[formulaIdx] == 0
+
+
+    def truth_value_assignment(self):
+        '''
+        Return the current truth-value assignment (the list of symbols
+        assigned truth value True).
+        '''
+        return [self.propSymbolSet[idx] for idx in sorted(self._true_symbols)]
+
+
+    def _flip(self, idx:int, changed:dict):
+        '''
+        Flip the truth value of one symbol, recording the prior truth
+        value of each formula touched in changed.
+        '''
+        value = not self._values[idx]
+        self._values[idx] = value
+        if value:
+            self._true_symbols.add(idx)
+            becoming_true = self._pos_occurrences[idx]
+            becoming_false = self._neg_occurrences[idx]
+        else:
+            self._true_symbols.discard(idx)
+            becoming_true = self._neg_occurrences[idx]
+            becoming_false = self._pos_occurrences[idx]
+
+        true_counts = self._true_counts
+        false_clauses = self._false_clauses
+        clause_formula = self._clause_formula
+        for clauseIdx in becoming_true:
+            true_counts[clauseIdx] += 1
+            if true_counts[clauseIdx] == 1:
+                formulaIdx = clause_formula[clauseIdx]
+                if formulaIdx not in changed:
+                    changed[formulaIdx] = false_clauses[formulaIdx] == 0
+                false_clauses[formulaIdx] -= 1
+        for clauseIdx in becoming_false:
+            true_counts[clauseIdx] -= 1
+            if true_counts[clauseIdx] == 0:
+                formulaIdx = clause_formula[clauseIdx]
+                if formulaIdx not in changed:
+                    changed[formulaIdx] = false_clauses[formulaIdx] == 0
+                false_clauses[formulaIdx] += 1
+
+
+    def _changed(self, changed:dict):
+        false_clauses = self._false_clauses
+        return sorted(formulaIdx for formulaIdx, was_true in changed.items()
+                      if (false_clauses[formulaIdx] == 0) != was_true)
+
+
+    def flip(self, symbols:list):
+        '''
+        Flip the truth values of the given symbols, and return the sorted
+        indices of the formulas whose truth values changed as a result.
+        '''
+        index = self.symbolTable.index
+        idxs = []
+        for symbol in symbols:
+            idx = index.get(symbol)
+            if idx is None:
+                raise ValueError(f'symbol not in propSymbolSet: {symbol}')
+            idxs.append(idx)
+        changed = {}
+        for idx in idxs:
+            self._flip(idx, changed)
+        return self._changed(changed)
+
+
+    def update(self, truthValueAssignment:list):
+        '''
+        Move to a new truth-value assignment (the list of symbols assigned
+        truth value True), and return the sorted indices of the formulas
+        whose truth values changed as a result.
+
+        Only the symbols whose truth values differ between the current and
+        the new truth-value assignment are flipped.
+        '''
+        true_indices = self.symbolTable.true_indices(truthValueAssignment)
+        changed = {}
+        for idx in self._true_symbols - true_indices:
+            self._flip(idx, changed)
+        for idx in true_indices - self._true_symbols:
+            self._flip(idx, changed)
+        return self._changed(changed)
+
@@ -0,0 +1,157 @@
+"""
+@author: David Herron
+"""
+
+'''
+This module specifies the opt-in performance instrumentation of the PLRE:
+counters (e.g. expressions read, tokens lexed, nodes visited, clauses
+evaluated, short-circuits, cache hits) and timing histograms per phase
+(e.g. 'read', 'parse', 'evaluate').
+
+Instrumentation is disabled by default. Instrumented code checks the
+module attribute 'enabled' before doing any work, so the overhead when
+instrumentation is disabled is one attribute lookup per instrumented
+call site.
+
+Usage:
+
+    import plre.plre_metrics as metrics
+    metrics.enable()
+    ...                          # read, parse and evaluate CNF expressions
+    print(metrics.snapshot())    # or metrics.export(), given a callback
+
+Timing histograms use power-of-two buckets of microseconds: bucket 0
+counts durations below 1us, and bucket i (i >= 1) counts durations in
+[2**(i-1), 2**i) us; the last bucket also counts all longer durations.
+'''
+
+#%%
+
+import time
+
+#%%
+
+enabled = False
+
+NR_BUCKETS = 32
+
+_counters = {}
+_timings = {}
+_callback = None
+
+
+def enable(callback=None):
+    '''
+    Enable instrumentation. If a callback is given, it is called with a
+    snapshot of the metrics whenever export() is called.
+    '''
+    global enabled, _callback
+    enabled = True
+    if callback is not None:
+        _callback = callback
+
+
+def disable():
+    '''
+    Disable instrumentation. Metrics collected so far are retained.
+    '''
+    global enabled
+    enabled = False
+
+
+def set_callback(callback):
+    '''
+    Set (or, given None, clear) the callback called by export().
+    '''
+    global _callback
+    _callback = callback
+
+
+def reset():
+    '''
+    Discard all metrics collected so far.
+    '''
+    _counters.clear()
+    _timings.clear()
+
+
+#%%
+
+def increment(name:str, n:int = 1):
+    '''
+    Add n to a counter.
+    '''
+    if enabled:
+        _counters[name] = _counters.get(name, 0) + n
+
+
+def record_time(phase:str, seconds:float):
+    '''
+    Record the duration of one occurrence of a phase.
+    '''
+    if not enabled:
+        return
+    timing = _timings.get(phase)
+    if timing is None:
+        timing = _timings[phase] = {'count': 0, 'total': 0.0,
+                                    'min': seconds, 'max': seconds,
+                                    'buckets': [0] * NR_BUCKETS}
+    timing['count'] += 1
+    timing['total'] += seconds
+    if seconds < timing['min']:
+        timing['min'] = seconds
+    if seconds > timing['max']:
+        timing['max'] = seconds
+    bucket = min(int(seconds * 1e6).bit_length(), NR_BUCKETS - 1)
+    timing['buckets'][bucket] += 1
+
+
+class timer():
+    '''
+    A context manager that records the duration of a phase, if
+    instrumentation is enabled on entry.
+    '''
+
+    __slots__ = ('phase', 'start')
+
+    def __init__(self, phase:str):
+        self.phase = phase
+        self.start = None
+
+    def __enter__(self):
+        if enabled:
+            self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if self.start is not None:
+            record_time(self.phase, time.perf_counter() - self.start)
+        return False
+
+
+#%%
+
+def snapshot():
+    '''
+    Return a copy of the metrics collected so far, as a dict with keys
+    'counters' (name -> count) and 'timings' (phase -> dict with keys
+    'count', 'total', 'mean', 'min', 'max' and 'buckets').
+    '''
+    timings = {}
+    for phase, timing in _timings.items():
+        timing = dict(timing, buckets=list(timing['buckets']))
+        timing['mean'] = timing['total'] / timing['count']
+        timings[phase] = timing
+    return {'counters': dict(_counters), 'timings': timings}
+
+
+def export():
+    '''
+    Call the callback, if any, with a snapshot of the metrics, and return
+    the snapshot.
+    '''
+    metrics = snapshot()
+    if _callback is not None:
+        _callback(metrics)
+    return metrics
+
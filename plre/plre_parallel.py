@@ -0,0 +1,135 @@
+"""
+@author: David Herron
+"""
+
+'''
+This module specifies functions for parsing and compiling large numbers
+of CNF expressions in parallel, across a pool of worker processes.
+
+The CNF expressions are split into chunks, and each chunk is parsed and
+compiled in a worker process. Workers return CompiledFormula objects
+(compact tuples of signed integers, which pickle cheaply) rather than
+ANTLR parse trees. Results are returned in the order of the input CNF
+expressions. Syntax errors, and references to symbols that are not in
+the propSymbolSet, do not abort the work: they are reported together
+with the (0-based) index of the offending CNF expression.
+'''
+
+#%%
+
+from concurrent.futures import ProcessPoolExecutor
+import itertools
+import os
+
+from .plre_compiler import CNFCompiler
+from .plre_parser import parse_clauses_checked
+from . import plre_utils as pu
+
+#%%
+
+# the compiler of a worker process, created once per worker
+_worker_compiler = None
+
+def _init_worker(propSymbolSet:list):
+    global _worker_compiler
+    _worker_compiler = CNFCompiler(propSymbolSet)
+
+
+def _compile_chunk(chunk:list, compiler:CNFCompiler = None):
+    '''
+    Compile a chunk of (index, expression) pairs, returning a list of
+    (index, CompiledFormula or None, error message or None) triples.
+    '''
+    if compiler is None:
+        compiler = _worker_compiler
+    results = []
+    for idx, expression_text in chunk:
+        try:
+            clauses = parse_clauses_checked(expression_text)
+            formula = compiler.compile_clauses(clauses, expression_text)
+            results.append((idx, formula, None))
+        except ValueError as e:
+            results.append((idx, None, str(e)))
+    return results
+
+
+def _chunks(indexed_expressions, chunksize:int):
+    iterator = iter(indexed_expressions)
+    while True:
+        chunk = list(itertools.islice(iterator, chunksize))
+        if not chunk:
+            return
+        yield chunk
+
+
+#%%
+
+def parse_many(expressions, propSymbolSet:list,
+               max_workers:int = None,
+               chunksize:int = 256):
+    '''
+    Parse and compile CNF expressions in parallel.
+
+    Returns a pair (formulas, errors): formulas is a list, in input order,
+    holding a CompiledFormula for each CNF expression (or None if it could
+    not be compiled); errors is a list of (index, message) pairs, one per
+    CNF expression that could not be compiled.
+
+    If max_workers is 1, the CNF expressions are compiled in the calling
+    process. If max_workers is None, the number of CPUs is used.
+    '''
+    if chunksize < 1:
+        raise ValueError('chunksize must be positive')
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+
+    indexed_expressions = enumerate(expressions)
+    formulas = []
+    errors = []
+
+    def collect(results):
+        for idx, formula, message in results:
+            formulas.append(formula)
+            if message is not None:
+                errors.append((idx, message))
+
+    if max_workers == 1:
+        compiler = CNFCompiler(propSymbolSet)
+        for chunk in _chunks(indexed_expressions, chunksize):
+            collect(_compile_chunk(chunk, compiler))
+        return formulas, errors
+
+    with ProcessPoolExecutor(max_workers=max_workers,
+                             initializer=_init_worker,
+                             initargs=(propSymbolSet,)) as executor:
+        for results in executor.map(_compile_chunk,
+                                    _chunks(indexed_expressions, chunksize)):
+            collect(results)
+    return formulas, errors
+
+
+def load_file(filepath, propSymbolSet:list,
+              max_workers:int = None,
+              chunksize:int = 256,
+              use_mmap:bool = False):
+    '''
+    Read the CNF expressions of a PLRE input text file and parse and
+    compile them in parallel.
+
+    Returns a pair (formulas, errors), as does parse_many(); the messages
+    of errors are prefixed with the number of the line on which the
+    offending CNF expression begins.
+    '''
+    line_numbers = []
+
+    def expressions():
+        for line_number, expression_text in pu.iter_cnf_expressions(filepath, use_mmap):
+            line_numbers.append(line_number)
+            yield expression_text
+
+    formulas, errors = parse_many(expressions(), propSymbolSet,
+                                  max_workers=max_workers, chunksize=chunksize)
+    errors = [(idx, f'line {line_numbers[idx]}: {message}')
+              for idx, message in errors]
+    return formulas, errors
+
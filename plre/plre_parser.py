@@ -0,0 +1,249 @@
+"""
+@author: David Herron
+"""
+
+'''
+This module specifies a hand-coded, single-pass tokenizer and parser for
+CNF expressions, as a fast alternative to the CNF parser generated by
+ANTLR v4 (in the spirit of the hand-coded parser of PLRE v0.5.0).
+
+The grammar CNF.g4 is fixed at exactly three flat levels (formula ->
+clause -> literal), so a CNF expression can be recognised with a single
+left-to-right scan over its tokens, with no backtracking and no parse
+tree. The hand-coded parser accepts the same language as the ANTLR
+parser, including the alternative operator symbols ~, !, NOT for
+negation, |, OR for disjunction and &, AND for conjunction.
+
+The hand-coded parser produces the clauses of a CNF expression directly,
+as lists of (symbol, negated) pairs --- the same structure produced from
+an ANTLR parse tree by cnf_tree_to_clauses(). Only when the hand-coded
+parser rejects a CNF expression is the ANTLR parser invoked, in order to
+report detailed syntax error messages, and to have the final say on
+whether the CNF expression is valid.
+'''
+
+#%%
+
+import re
+
+from antlr4 import CommonTokenStream, InputStream
+from antlr4.error.ErrorListener import ErrorListener
+
+from .CNFLexer import CNFLexer
+from .CNFParser import CNFParser
+from . import plre_metrics as metrics
+from . import plre_utils as pu
+
+#%%
+
+class CNFSyntaxError(ValueError):
+    '''
+    Raised by the hand-coded CNF parser when a CNF expression is not
+    syntactically valid.
+    '''
+    pass
+
+
+#%%
+
+# token types; the same as those of the ANTLR-generated CNFParser
+AND = CNFParser.AND
+OR = CNFParser.OR
+NOT = CNFParser.NOT
+LPAREN = CNFParser.LPAREN
+RPAREN = CNFParser.RPAREN
+VARIABLE = CNFParser.VARIABLE
+
+# Each match consumes any leading whitespace (the characters matched by
+# the WS lexer rule of CNF.g4) followed by one token: a word (VARIABLE or
+# keyword), an operator or parenthesis, or any other single non-whitespace
+# character, which is a token recognition error. (Trailing whitespace
+# matches no token.)
+_TOKEN_PATTERN = re.compile(r'[ \t\r\n]*(?:([a-zA-Z][a-zA-Z0-9_]*)|([&|~!()])|([^ \t\r\n]))')
+
+# a word matching a keyword exactly is that keyword (as in the ANTLR lexer,
+# where the keyword rules precede VARIABLE); longer words are VARIABLEs
+_KEYWORDS = {'AND': AND, 'OR': OR, 'NOT': NOT}
+
+_OPERATORS = {'&': AND, '|': OR, '~': NOT, '!': NOT, '(': LPAREN, ')': RPAREN}
+
+
+#%%
+
+def tokenize_cnf(expression_text:str):
+    '''
+    Convert the text of a CNF expression into a list of (token type,
+    token text) pairs.
+
+    Raises CNFSyntaxError if a character is encountered that cannot
+    begin a token.
+    '''
+    tokens = []
+    for word, operator, other in _TOKEN_PATTERN.findall(expression_text):
+        if word:
+            tokens.append((_KEYWORDS.get(word, VARIABLE), word))
+        elif operator:
+            tokens.append((_OPERATORS[operator], operator))
+        else:
+            raise CNFSyntaxError(f'token recognition error at: {other!r}')
+    return tokens
+
+
+def parse_clauses(expression_text:str):
+    '''
+    Parse the text of a CNF expression into a list of clauses, where each
+    clause is a list of (symbol, negated) pairs.
+
+    Raises CNFSyntaxError if the CNF expression is not syntactically valid.
+    '''
+    if not metrics.enabled:
+        return _parse_clauses(expression_text)
+
+    with metrics.timer('parse'):
+        clauses = _parse_clauses(expression_text)
+    metrics.increment('expressions_parsed')
+    return clauses
+
+
+def _parse_clauses(expression_text:str):
+    tokens = tokenize_cnf(expression_text)
+    if metrics.enabled:
+        metrics.increment('tokens_lexed', len(tokens))
+    nr_tokens = len(tokens)
+    clauses = []
+    idx = 0
+
+    while True:
+        # clause : LPAREN literal (OR literal)* RPAREN | literal
+        parenthesised = idx < nr_tokens and tokens[idx][0] == LPAREN
+        if parenthesised:
+            idx += 1
+        clause = []
+        while True:
+            # literal : NOT atom | atom
+            negated = idx < nr_tokens and tokens[idx][0] == NOT
+            if negated:
+                idx += 1
+            if idx >= nr_tokens:
+                raise CNFSyntaxError('unexpected end of CNF expression')
+            token_type, token_text = tokens[idx]
+            if token_type != VARIABLE:
+                raise CNFSyntaxError(f'unexpected token: {token_text!r}')
+            clause.append((token_text, negated))
+            idx += 1
+            if not parenthesised:
+                break
+            if idx < nr_tokens and tokens[idx][0] == OR:
+                idx += 1
+                continue
+            if idx < nr_tokens and tokens[idx][0] == RPAREN:
+                idx += 1
+                break
+            if idx >= nr_tokens:
+                raise CNFSyntaxError('unexpected end of CNF expression')
+            raise CNFSyntaxError(f'unexpected token: {tokens[idx][1]!r}')
+        clauses.append(clause)
+
+        # cnf : clause (AND clause)* EOF
+        if idx == nr_tokens:
+            return clauses
+        if tokens[idx][0] != AND:
+            raise CNFSyntaxError(f'unexpected token: {tokens[idx][1]!r}')
+        idx += 1
+
+
+#%%
+
+def cnf_tree_to_clauses(tree:CNFParser.CnfContext):
+    '''
+    Walk the parse tree of a CNF expression and return its clauses as
+    a list of lists of (symbol, negated) pairs.
+
+    The walk mirrors the child indexing scheme used by CNFVisitorA:
+    clauses are the even-indexed children of the cnf node, and the
+    literals of a parenthesised clause are its odd-indexed children.
+    '''
+    clauses = []
+    nr_clauses = tree.getChildCount() // 2
+    for clauseIdx in range(nr_clauses):
+        clause_ctx = tree.getChild(clauseIdx * 2)
+        if clause_ctx.getChildCount() == 1:
+            literal_ctxs = [clause_ctx.getChild(0)]
+        else:
+            nr_literals = clause_ctx.getChildCount() // 2
+            literal_ctxs = [clause_ctx.getChild(literalIdx * 2 + 1)
+                            for literalIdx in range(nr_literals)]
+        clause = []
+        for literal_ctx in literal_ctxs:
+            if literal_ctx.getChildCount() == 2:  # NOT atom
+                clause.append((literal_ctx.getChild(1).getText(), True))
+            else:                                 # atom
+                clause.append((literal_ctx.getChild(0).getText(), False))
+        clauses.append(clause)
+    return clauses
+
+
+def parse_cnf_fast(expression_text:str):
+    '''
+    Parse the text of a CNF expression into a list of clauses, where each
+    clause is a list of (symbol, negated) pairs.
+
+    The hand-coded parser is tried first. If it rejects the CNF expression,
+    the expression is re-parsed with the ANTLR parser (via parse_cnf()),
+    which reports detailed syntax error messages. As with parse_cnf(),
+    None is returned if the CNF expression contains syntax errors.
+    '''
+    try:
+        return parse_clauses(expression_text)
+    except CNFSyntaxError:
+        pass
+
+    tree, _ = pu.parse_cnf(expression_text)
+    if tree is None:
+        return None
+    return cnf_tree_to_clauses(tree)
+
+
+#%%
+
+class _CollectingErrorListener(ErrorListener):
+    '''
+    An ANTLR error listener that collects syntax error messages, in the
+    format used by the ANTLR console error listener, instead of printing
+    them.
+    '''
+
+    def __init__(self):
+        super().__init__()
+        self.messages = []
+
+    def syntaxError(self, recognizer, offendingSymbol, line, column, msg, e):
+        self.messages.append(f'line {line}:{column} {msg}')
+
+
+def parse_clauses_checked(expression_text:str):
+    '''
+    Parse the text of a CNF expression into a list of clauses, where each
+    clause is a list of (symbol, negated) pairs, without printing anything.
+
+    The hand-coded parser is tried first. If it rejects the CNF expression,
+    the expression is re-parsed with the ANTLR parser, and if the ANTLR
+    parser rejects it too, CNFSyntaxError is raised with the detailed
+    ANTLR syntax error messages.
+    '''
+    try:
+        return parse_clauses(expression_text)
+    except CNFSyntaxError:
+        pass
+
+    listener = _CollectingErrorListener()
+    lexer = CNFLexer(InputStream(expression_text))
+    lexer.removeErrorListeners()
+    lexer.addErrorListener(listener)
+    parser = CNFParser(CommonTokenStream(lexer))
+    parser.removeErrorListeners()
+    parser.addErrorListener(listener)
+    tree = parser.cnf()
+    if parser.getNumberOfSyntaxErrors() > 0:
+        raise CNFSyntaxError('; '.join(listener.messages))
+    return cnf_tree_to_clauses(tree)
@@ -0,0 +1,562 @@
+"""
+@author: David Herron
+"""
+
+'''
+This module specifies a conflict-driven clause learning (CDCL) SAT solver,
+written in pure Python, for checking whether a set of CNF expressions is
+satisfiable --- i.e. whether any truth-value assignment makes all of them
+True --- and finding such an assignment (a model) if so.
+
+The solver works on the compiled form of CNF expressions (see
+plre_compiler): the clauses of all the formulas are conjoined. It uses:
+- two watched literals per clause, for unit propagation
+- first-UIP conflict analysis, with clause learning and non-chronological
+  backjumping; learnt clauses are minimised by removing literals implied
+  by the others
+- VSIDS-style branching (the unassigned variable of highest activity,
+  where activity is bumped for the variables of each conflict and decays
+  over time), with phase saving
+- restarts following the Luby sequence
+- periodic deletion of learnt clauses of high literal block distance
+  (LBD), and simplification of all clauses by the level-0 assignment
+
+Within the solver, variable v (1-based; the symbol with index v-1 in the
+propSymbolSet) has the literal codes 2*v (positive) and 2*v+1 (negative),
+so that negation is code ^ 1.
+
+Usage:
+
+    from plre.plre_sat import find_model
+    model = find_model(propSymbolSet, formulas)
+    if model is None:
+        print('the CNF expressions are contradictory')
+    else:
+        print(f'satisfied by the truth-value assignment {model}')
+'''
+
+#%%
+
+import heapq
+
+from .plre_symbols import SymbolTable
+
+#%%
+
+def _luby(i:int):
+    '''
+    Return element i (0-based) of the Luby sequence 1 1 2 1 1 2 4 1 1 2 ...
+    '''
+    size, seq = 1, 0
+    while size < i + 1:
+        seq += 1
+        size = 2 * size + 1
+    while size - 1 != i:
+        size = (size - 1) >> 1
+        seq -= 1
+        i = i % size
+    return 1 << seq
+
+
+#%%
+
+class CDCLSolver():
+    '''
+    A CDCL SAT solver over clauses of signed integer literals (as per the
+    DIMACS CNF convention, and CompiledFormula).
+
+    Clauses are added with add_clause(); solve() then returns True (the
+    clauses are satisfiable; see model()), False (unsatisfiable), or None
+    (max_conflicts was reached first). Clauses may be added between calls
+    of solve().
+    '''
+
+    def __init__(self, nr_vars:int = 0,
+                       restart_base:int = 100,
+                       var_decay:float = 0.95):
+
+        self.nr_vars = 0
+        self.restart_base = restart_base
+        self.var_decay = var_decay
+
+        # per literal code: 1 (True), 0 (False) or -1 (unassigned)
+        self._values = [-1, -1]
+        # per literal code: the clauses watching the negation of the
+        # literal, i.e. to be visited when the literal becomes True
+        self._watches = [[], []]
+        # per variable
+        self._level = [0]
+        self._reason = [None]
+        self._activity = [0.0]
+        self._phase = [False]
+        self._seen = [False]
+
+        self.clauses = []
+        self.learnts = []
+        self._learnt_lbds = []
+        self._max_learnts = 0
+
+        self._trail = []
+        self._trail_lim = []
+        self._qhead = 0
+        # the branching heap, of (-activity, variable) entries; the key of
+        # a variable is the first element of its live entry (None if it
+        # has none), and other entries for it are stale
+        self._heap = []
+        self._heap_key = [None]
+        self._var_inc = 1.0
+        self._ok = True
+        self._model = None
+
+        self.stats = {'decisions': 0, 'propagations': 0, 'conflicts': 0,
+                      'restarts': 0, 'learnt_clauses': 0, 'deleted_clauses': 0}
+
+        self._ensure_vars(nr_vars)
+
+
+    def _ensure_vars(self, nr_vars:int):
+        while self.nr_vars < nr_vars:
+            self.nr_vars += 1
+            self._values += [-1, -1]
+            self._watches += [[], []]
+            self._level.append(0)
+            self._reason.append(None)
+            self._activity.append(0.0)
+            self._phase.append(False)
+            self._seen.append(False)
+            self._heap_key.append(0.0)
+            heapq.heappush(self._heap, (0.0, self.nr_vars))
+
+
+    #%%
+
+    def add_clause(self, literals):
+        '''
+        Add a clause, given as an iterable of signed integer literals.
+        Returns False if the clauses are now known to be unsatisfiable.
+        '''
+        if not self._ok:
+            return False
+        self._backtrack(0)
+        codes = set()
+        for literal in literals:
+            if literal == 0 or not isinstance(literal, int):
+                raise ValueError(f'invalid literal: {literal!r}')
+            var = abs(literal)
+            self._ensure_vars(var)
+            codes.add(2 * var + (literal < 0))
+
+        values = self._values
+        clause = []
+        for code in codes:
+            if code ^ 1 in codes or values[code] == 1:
+                # a tautology, or satisfied at level 0
+                return True
+            if values[code] == -1:
+                clause.append(code)
+
+        if not clause:
+            self._ok = False
+        elif len(clause) == 1:
+            self._assign(clause[0], None)
+            if self._propagate() is not None:
+                self._ok = False
+        else:
+            self.clauses.append(clause)
+            self._attach(clause)
+        return self._ok
+
+
+    def _attach(self, clause:list):
+        self._watches[clause[0] ^ 1].append(clause)
+        self._watches[clause[1] ^ 1].append(clause)
+
+
+    def _assign(self, code:int, reason):
+        var = code >> 1
+        self._values[code] = 1
+        self._values[code ^ 1] = 0
+        self._level[var] = len(self._trail_lim)
+        self._reason[var] = reason
+        self._trail.append(code)
+
+
+    #%%
+
+    def _propagate(self):
+        '''
+        Propagate the assignments on the trail, returning a conflicting
+        clause, or None.
+        '''
+        values = self._values
+        watches = self._watches
+        level = self._level
+        reason = self._reason
+        trail = self._trail
+        current_level = len(self._trail_lim)
+        qhead = self._qhead
+        nr_propagations = 0
+
+        while qhead < len(trail):
+            true_code = trail[qhead]
+            qhead += 1
+            nr_propagations += 1
+            false_code = true_code ^ 1
+            watchers = watches[true_code]
+            nr_watchers = len(watchers)
+            i = j = 0
+            while i < nr_watchers:
+                clause = watchers[i]
+                i += 1
+                # make clause[1] the literal that became False
+                if clause[0] == false_code:
+                    clause[0] = clause[1]
+                    clause[1] = false_code
+                first = clause[0]
+                if values[first] == 1:
+                    watchers[j] = clause
+                    j += 1
+                    continue
+                # look for a new literal to watch
+                for k in range(2, len(clause)):
+                    code = clause[k]
+                    if values[code] != 0:
+                        clause[1] = code
+                        clause[k] = false_code
+                        watches[code ^ 1].append(clause)
+                        break
+                else:
+                    watchers[j] = clause
+                    j += 1
+                    if values[first] == 0:
+                        # conflict: keep the remaining watchers
+                        while i < nr_watchers:
+                            watchers[j] = watchers[i]
+                            j += 1
+                            i += 1
+                        del watchers[j:]
+                        self._qhead = len(trail)
+                        self.stats['propagations'] += nr_propagations
+                        return clause
+                    # unit: clause[0] is implied
+                    var = first >> 1
+                    values[first] = 1
+                    values[first ^ 1] = 0
+                    level[var] = current_level
+                    reason[var] = clause
+                    trail.append(first)
+            del watchers[j:]
+
+        self._qhead = qhead
+        self.stats['propagations'] += nr_propagations
+        return None
+
+
+    #%%
+
+    def _bump(self, var:int):
+        activity = self._activity
+        activity[var] += self._var_inc
+        if activity[var] > 1e100:
+            for v in range(1, self.nr_vars + 1):
+                activity[v] *= 1e-100
+            self._var_inc *= 1e-100
+            self._rebuild_heap()
+        elif self._heap_key[var] is not None:
+            self._heap_key[var] = -activity[var]
+            heapq.heappush(self._heap, (-activity[var], var))
+
+
+    def _rebuild_heap(self):
+        values = self._values
+        activity = self._activity
+        self._heap_key = [None] + [-activity[v] if values[2 * v] == -1 else None
+                                   for v in range(1, self.nr_vars + 1)]
+        self._heap = [(key, v) for v, key in enumerate(self._heap_key) if key is not None]
+        heapq.heapify(self._heap)
+
+
+    def _analyze(self, conflict:list):
+        '''
+        Derive a learnt clause from a conflict (first UIP). Returns the
+        learnt clause (its asserting literal first, and a literal of the
+        backjump level second), the backjump level, and its LBD.
+        '''
+        seen = self._seen
+        level = self._level
+        reason = self._reason
+        trail = self._trail
+        current_level = len(self._trail_lim)
+
+        learnt = [None]
+        marked = []
+        nr_pending = 0
+        code = None
+        index = len(trail) - 1
+        clause = conflict
+        while True:
+            for other in (clause if code is None else clause[1:]):
+                var = other >> 1
+                if not seen[var] and level[var] > 0:
+                    seen[var] = True
+                    marked.append(var)
+                    self._bump(var)
+                    if level[var] >= current_level:
+                        nr_pending += 1
+                    else:
+                        learnt.append(other)
+            # the next marked literal on the trail
+            while not seen[trail[index] >> 1]:
+                index -= 1
+            code = trail[index]
+            index -= 1
+            clause = reason[code >> 1]
+            nr_pending -= 1
+            if nr_pending == 0:
+                break
+        learnt[0] = code ^ 1
+
+        # remove the literals implied by the other literals of the clause
+        # (the levels of which are summarised as a bit mask, to cut short
+        # searches through the implications of other levels)
+        levels = 0
+        for other in learnt[1:]:
+            levels |= 1 << (level[other >> 1] & 63)
+        learnt = [learnt[0]] + [other for other in learnt[1:]
+                                if reason[other >> 1] is None or
+                                not self._redundant(other, levels, marked)]
+        for var in marked:
+            seen[var] = False
+
+        if len(learnt) == 1:
+            return learnt, 0, 1
+        highest = max(range(1, len(learnt)), key=lambda k: level[learnt[k] >> 1])
+        learnt[1], learnt[highest] = learnt[highest], learnt[1]
+        lbd = len({level[c >> 1] for c in learnt})
+        return learnt, level[learnt[1] >> 1], lbd
+
+
+    def _redundant(self, code:int, levels:int, marked:list):
+        '''
+        Return True if a literal of a learnt clause is implied by the
+        other (marked) literals, following its reasons recursively.
+        '''
+        seen = self._seen
+        level = self._level
+        reason = self._reason
+        nr_marked = len(marked)
+        stack = [code]
+        while stack:
+            for other in reason[stack.pop() >> 1][1:]:
+                var = other >> 1
+                if seen[var] or level[var] == 0:
+                    continue
+                if reason[var] is None or not (levels >> (level[var] & 63)) & 1:
+                    for var in marked[nr_marked:]:
+                        seen[var] = False
+                    del marked[nr_marked:]
+                    return False
+                seen[var] = True
+                marked.append(var)
+                stack.append(other)
+        return True
+
+
+    def _backtrack(self, target_level:int):
+        if len(self._trail_lim) <= target_level:
+            return
+        values = self._values
+        reason = self._reason
+        phase = self._phase
+        activity = self._activity
+        heap = self._heap
+        heap_key = self._heap_key
+        start = self._trail_lim[target_level]
+        for code in self._trail[start:]:
+            var = code >> 1
+            values[code] = -1
+            values[code ^ 1] = -1
+            reason[var] = None
+            phase[var] = not (code & 1)
+            if heap_key[var] != -activity[var]:
+                heap_key[var] = -activity[var]
+                heapq.heappush(heap, (heap_key[var], var))
+        del self._trail[start:]
+        del self._trail_lim[target_level:]
+        self._qhead = start
+
+
+    def _pick_branch_var(self):
+        heap = self._heap
+        heap_key = self._heap_key
+        values = self._values
+        while heap:
+            key, var = heapq.heappop(heap)
+            if heap_key[var] != key:
+                continue
+            heap_key[var] = None
+            if values[2 * var] == -1:
+                return var
+        return None
+
+
+    #%%
+
+    def _simplify(self):
+        '''
+        At level 0, remove the clauses satisfied by the level-0
+        assignment and the literals it falsifies, delete the learnt
+        clauses of highest LBD, and rebuild the watch lists.
+        '''
+        values = self._values
+
+        def simplified(clauses, lbds):
+            kept, kept_lbds = [], []
+            for clause, lbd in zip(clauses, lbds):
+                if any(values[code] == 1 for code in clause):
+                    continue
+                # (after level-0 propagation, at least two literals remain)
+                kept.append([code for code in clause if values[code] == -1])
+                kept_lbds.append(lbd)
+            return kept, kept_lbds
+
+        self.clauses, _ = simplified(self.clauses, [0] * len(self.clauses))
+        learnts, lbds = simplified(self.learnts, self._learnt_lbds)
+
+        if len(learnts) > self._max_learnts:
+            order = sorted(range(len(learnts)), key=lambda k: lbds[k])
+            keep = set(order[:len(order) // 2])
+            keep.update(k for k in order if lbds[k] <= 2)
+            self.stats['deleted_clauses'] += len(learnts) - len(keep)
+            learnts = [learnts[k] for k in sorted(keep)]
+            lbds = [lbds[k] for k in sorted(keep)]
+            self._max_learnts = int(self._max_learnts * 1.1)
+        self.learnts, self._learnt_lbds = learnts, lbds
+
+        for var in range(1, self.nr_vars + 1):
+            self._reason[var] = None
+        self._watches = [[] for _ in range(len(self._watches))]
+        for clause in self.clauses:
+            self._attach(clause)
+        for clause in self.learnts:
+            self._attach(clause)
+        self._rebuild_heap()
+
+
+    def _search(self, nr_conflicts:int):
+        '''
+        Search until a model or a contradiction is found (returning True
+        or False), or until nr_conflicts conflicts (returning None).
+        '''
+        stats = self.stats
+        conflicts = 0
+        while True:
+            conflict = self._propagate()
+            if conflict is not None:
+                conflicts += 1
+                stats['conflicts'] += 1
+                if not self._trail_lim:
+                    return False
+                learnt, backjump_level, lbd = self._analyze(conflict)
+                self._backtrack(backjump_level)
+                if len(learnt) == 1:
+                    self._assign(learnt[0], None)
+                else:
+                    self.learnts.append(learnt)
+                    self._learnt_lbds.append(lbd)
+                    self._attach(learnt)
+                    self._assign(learnt[0], learnt)
+                stats['learnt_clauses'] += 1
+                self._var_inc /= self.var_decay
+            else:
+                if conflicts >= nr_conflicts:
+                    self._backtrack(0)
+                    return None
+                var = self._pick_branch_var()
+                if var is None:
+                    return True
+                stats['decisions'] += 1
+                self._trail_lim.append(len(self._trail))
+                self._assign(2 * var + (not self._phase[var]), None)
+
+
+    def solve(self, max_conflicts:int = None):
+        '''
+        Decide the satisfiability of the clauses added so far. Returns
+        True (see model()), False, or None if max_conflicts conflicts
+        occurred without a decision.
+        '''
+        self._model = None
+        if not self._ok:
+            return False
+        self._backtrack(0)
+        if self._propagate() is not None:
+            self._ok = False
+            return False
+
+        self._max_learnts = max(len(self.clauses) // 3, 1000)
+        nr_conflicts = 0
+        restart = 0
+        while True:
+            budget = _luby(restart) * self.restart_base
+            if max_conflicts is not None:
+                budget = min(budget, max_conflicts - nr_conflicts)
+            before = self.stats['conflicts']
+            status = self._search(budget)
+            nr_conflicts += self.stats['conflicts'] - before
+            if status is True:
+                values = self._values
+                self._model = [values[2 * var] == 1 for var in range(1, self.nr_vars + 1)]
+                self._backtrack(0)
+                return True
+            if status is False:
+                self._ok = False
+                return False
+            if max_conflicts is not None and nr_conflicts >= max_conflicts:
+                return None
+            restart += 1
+            self.stats['restarts'] += 1
+            if len(self.learnts) > self._max_learnts or restart % 8 == 0:
+                self._simplify()
+
+
+    def model(self):
+        '''
+        Return the model found by the last call of solve() that returned
+        True: a list of truth values, indexed by variable - 1.
+        '''
+        return self._model
+
+
+#%%
+
+def find_model(propSymbolSet:list, formulas, max_conflicts:int = None):
+    '''
+    Decide whether a sequence of compiled CNF expressions (CompiledFormula
+    objects, or a FormulaSet) can all be True at once.
+
+    Returns a truth-value assignment (the list of symbols assigned truth
+    value True) under which all the CNF expressions are True, or None if
+    there is none. Raises RuntimeError if max_conflicts conflicts occur
+    without a decision.
+    '''
+    symbolTable = SymbolTable.of(propSymbolSet)
+    solver = CDCLSolver(len(symbolTable))
+    for formula in formulas:
+        for clause in formula.clauses:
+            if not solver.add_clause(clause):
+                return None
+    status = solver.solve(max_conflicts)
+    if status is None:
+        raise RuntimeError(f'satisfiability undecided after {max_conflicts} conflicts')
+    if not status:
+        return None
+    return [symbol for symbol, value in zip(symbolTable.symbols, solver.model()) if value]
+
+
+def is_satisfiable(propSymbolSet:list, formulas, max_conflicts:int = None):
+    '''
+    Return True if a sequence of compiled CNF expressions can all be True
+    at once, and False if they are contradictory.
+    '''
+    return find_model(propSymbolSet, formulas, max_conflicts) is not None
@@ -0,0 +1,369 @@
+"""
+@author: David Herron
+"""
+
+'''
+This module specifies a long-running PLRE evaluation server, which loads
+named formula sets once and then evaluates their truth values for
+truth-value assignments sent by clients, over HTTP on the loopback
+interface (see plre_client for a client).
+
+The server speaks JSON:
+- GET  /formula-sets
+    -> {name: {"nr_formulas": F, "nr_symbols": S}, ...}
+- POST /formula-sets/<name>/evaluate  {"assignment": [symbols...]}
+    -> {"result": [bool, ...]}                  (one bool per formula)
+- POST /formula-sets/<name>/evaluate  {"assignments": [[symbols...], ...]}
+    -> {"results": [[bool, ...], ...]}          (one list per assignment)
+- GET  /stats
+    -> {"requests": ..., "batches": ..., "assignments": ...}
+Truth-value assignments are lists of the symbols assigned truth value
+True, as used by CNFVisitorA. Errors are reported with HTTP status 400
+(e.g. an unknown symbol) or 404 (an unknown formula set), and a JSON body
+{"error": message}.
+
+Each request is handled on its own thread, but evaluation is done by one
+batching thread per formula set: concurrent requests are coalesced into a
+single assignment matrix of up to max_batch rows, which is evaluated with
+one BatchEvaluator call. A batch takes the requests already queued, and
+waits (at most max_delay seconds) only for requests known to be in
+flight, i.e. received but not yet queued; a lone client is never delayed.
+
+Example (serving a PLRE input text file under the name 'colours'):
+$ python -m plre.plre_server --symbols symbols.txt --formula-set colours constraints.txt
+
+This module requires NumPy.
+'''
+
+#%%
+
+import argparse
+from concurrent.futures import Future
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import queue
+import threading
+import time
+
+import numpy as np
+
+from .plre_batch import BatchEvaluator, assignment_matrix
+from .plre_binfile import open_formula_set
+from . import plre_utils as pu
+
+#%%
+
+class _Coalescer():
+    '''
+    A batching thread that evaluates the assignment matrices submitted
+    to it, coalescing those submitted concurrently into one batch.
+    '''
+
+    def __init__(self, evaluator:BatchEvaluator, max_batch:int, max_delay:float, on_batch):
+        self.evaluator = evaluator
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        # called with the number of rows of each batch evaluated
+        self.on_batch = on_batch
+        self._queue = queue.Queue()
+        # the number of requests being handled (from receipt until their
+        # result is available), as counted by tracking()
+        self.in_flight = 0
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def submit(self, X):
+        '''
+        Submit an assignment matrix, returning a Future of its result.
+        '''
+        future = Future()
+        self._queue.put((X, future))
+        return future
+
+    @contextmanager
+    def tracking(self):
+        '''
+        Count a request as in flight for the duration of the context.
+        '''
+        with self._lock:
+            self.in_flight += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+    def stop(self):
+        self._queue.put(None)
+        self._thread.join()
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            batch = [item]
+            nr_rows = len(item[0])
+            deadline = time.monotonic() + self.max_delay
+            while nr_rows < self.max_batch:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    # wait only for requests received but not yet queued
+                    timeout = deadline - time.monotonic()
+                    if self.in_flight <= len(batch) or timeout <= 0:
+                        break
+                    try:
+                        item = self._queue.get(timeout=min(timeout, 0.0005))
+                    except queue.Empty:
+                        continue
+                if item is None:
+                    self._queue.put(None)
+                    break
+                batch.append(item)
+                nr_rows += len(item[0])
+            self._evaluate(batch)
+
+    def _evaluate(self, batch:list):
+        try:
+            result = self.evaluator.evaluate(np.concatenate([X for X, _ in batch]))
+        except Exception as e:
+            for _, future in batch:
+                future.set_exception(e)
+            return
+        self.on_batch(len(result))
+        start = 0
+        for X, future in batch:
+            future.set_result(result[start:start + len(X)])
+            start += len(X)
+
+
+#%%
+
+class _RequestHandler(BaseHTTPRequestHandler):
+
+    protocol_version = 'HTTP/1.1'
+    # (the headers and body of a reply are sent separately; with Nagle's
+    # algorithm, the body then waits for the delayed ACK of the headers)
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        if self.server.plre.verbose:
+            super().log_message(format, *args)
+
+    def _reply(self, status:int, body:dict):
+        data = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        plre = self.server.plre
+        if self.path == '/formula-sets':
+            self._reply(200, plre.describe())
+        elif self.path == '/stats':
+            with plre._lock:
+                stats = dict(plre.stats)
+            self._reply(200, stats)
+        else:
+            self._reply(404, {'error': f'not found: {self.path}'})
+
+    def do_POST(self):
+        plre = self.server.plre
+        length = int(self.headers.get('Content-Length', 0))
+
+        parts = self.path.strip('/').split('/')
+        if len(parts) != 3 or parts[0] != 'formula-sets' or parts[2] != 'evaluate':
+            self.rfile.read(length)
+            self._reply(404, {'error': f'not found: {self.path}'})
+            return
+        name = parts[1]
+        coalescer = plre._coalescers.get(name)
+        if coalescer is None:
+            self.rfile.read(length)
+            self._reply(404, {'error': f'unknown formula set: {name}'})
+            return
+
+        with coalescer.tracking():
+            body = self.rfile.read(length)
+            try:
+                request = json.loads(body)
+                if 'assignments' in request:
+                    single = False
+                    assignments = request['assignments']
+                elif 'assignment' in request:
+                    single = True
+                    assignments = [request['assignment']]
+                else:
+                    raise ValueError('request must specify assignment or assignments')
+                result = plre.evaluate(name, assignments)
+            except (ValueError, TypeError) as e:
+                error = str(e)
+            else:
+                error = None
+        if error is not None:
+            self._reply(400, {'error': error})
+            return
+
+        if single:
+            self._reply(200, {'result': result[0].tolist()})
+        else:
+            self._reply(200, {'results': result.tolist()})
+
+
+#%%
+
+class PLREServer():
+    '''
+    A PLRE evaluation server, serving named formula sets over HTTP on the
+    loopback interface. A port of 0 selects a free port (see address).
+    '''
+
+    def __init__(self, host:str = '127.0.0.1',
+                       port:int = 0,
+                       max_batch:int = 4096,
+                       max_delay:float = 0.002,
+                       verbose:bool = False):
+
+        if max_batch < 1 or max_delay < 0:
+            raise ValueError('max_batch must be positive, and max_delay non-negative')
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.verbose = verbose
+        self.formula_sets = {}
+        self.stats = {'requests': 0, 'batches': 0, 'assignments': 0}
+        self._coalescers = {}
+        self._lock = threading.Lock()
+        self._thread = None
+
+        self._httpd = ThreadingHTTPServer((host, port), _RequestHandler)
+        self._httpd.daemon_threads = True
+        self._httpd.plre = self
+
+
+    @property
+    def address(self):
+        '''
+        The (host, port) address the server is bound to.
+        '''
+        return self._httpd.server_address[:2]
+
+
+    def add_formula_set(self, name:str, propSymbolSet:list, formulas):
+        '''
+        Serve a formula set (CompiledFormula objects, or a FormulaSet)
+        under a name.
+        '''
+        evaluator = BatchEvaluator(propSymbolSet, formulas)
+        with self._lock:
+            if name in self.formula_sets:
+                raise ValueError(f'formula set already served: {name}')
+            self.formula_sets[name] = evaluator
+            self._coalescers[name] = _Coalescer(evaluator, self.max_batch,
+                                                self.max_delay, self._record_batch)
+
+
+    def _record_batch(self, nr_rows:int):
+        with self._lock:
+            self.stats['batches'] += 1
+            self.stats['assignments'] += nr_rows
+
+
+    def load_formula_set(self, name:str, filepath, propSymbolSet:list = None):
+        '''
+        Serve the formula set of a formula set file or of a PLRE input
+        text file (compiled with respect to the given propSymbolSet).
+        '''
+        formulaSet = open_formula_set(filepath, propSymbolSet)
+        self.add_formula_set(name, formulaSet.symbolTable, formulaSet)
+
+
+    def describe(self):
+        return {name: {'nr_formulas': evaluator.nr_formulas,
+                       'nr_symbols': len(evaluator.propSymbolSet)}
+                for name, evaluator in self.formula_sets.items()}
+
+
+    def evaluate(self, name:str, truthValueAssignments:list):
+        '''
+        Evaluate the truth values of a named formula set for a list of
+        truth-value assignments, coalesced with concurrent requests.
+        Returns a Boolean matrix of shape (N, F).
+        '''
+        evaluator = self.formula_sets[name]
+        X = assignment_matrix(evaluator.symbolTable, truthValueAssignments)
+        with self._lock:
+            self.stats['requests'] += 1
+        return self._coalescers[name].submit(X).result()
+
+
+    def serve_forever(self, poll_interval:float = 0.5):
+        self._httpd.serve_forever(poll_interval)
+
+    def start(self):
+        '''
+        Serve requests on a background thread.
+        '''
+        self._thread = threading.Thread(target=self.serve_forever, args=(0.05,), daemon=True)
+        self._thread.start()
+        return self
+
+    def shutdown(self):
+        '''
+        Stop serving requests, and release the socket and batching threads.
+        '''
+        if self._thread is not None:
+            self._httpd.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._httpd.server_close()
+        for coalescer in self._coalescers.values():
+            coalescer.stop()
+        self._coalescers.clear()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.shutdown()
+        return False
+
+
+#%%
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Run a PLRE evaluation server.')
+    parser.add_argument('--formula-set', nargs=2, action='append', required=True,
+                        metavar=('NAME', 'FILE'),
+                        help='serve a formula set file or PLRE input text file under NAME')
+    parser.add_argument('--symbols', metavar='FILE',
+                        help='the propSymbolSet file, for PLRE input text files')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--max-batch', type=int, default=4096)
+    parser.add_argument('--max-delay', type=float, default=0.002,
+                        help='seconds to wait for requests in flight to coalesce')
+    parser.add_argument('--verbose', action='store_true')
+    args = parser.parse_args(argv)
+
+    propSymbolSet = pu.get_prop_symbols(args.symbols) if args.symbols else None
+    server = PLREServer(port=args.port, max_batch=args.max_batch,
+                        max_delay=args.max_delay, verbose=args.verbose)
+    for name, filepath in args.formula_set:
+        server.load_formula_set(name, filepath, propSymbolSet)
+    host, port = server.address
+    print(f'serving {", ".join(server.formula_sets)} on http://{host}:{port}')
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.shutdown()
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,238 @@
+"""
+@author: David Herron
+"""
+
+'''
+This module specifies a multi-core batch evaluator, which evaluates large
+batches of truth-value assignments across a pool of worker processes
+without pickling the assignments, the compiled CNF expressions or the
+results.
+
+The compiled CNF expressions (the CSR arrays of a FormulaSet; see
+plre_formulaset), the assignment matrix and the result matrix are all
+placed in blocks of multiprocessing.shared_memory. Each worker attaches to
+the blocks by name, builds its BatchEvaluator (see plre_batch) once, and
+then evaluates the row ranges it is sent --- (start, stop) pairs --- writing
+its results directly into the shared result matrix.
+
+To avoid copying the assignment matrix into shared memory, fill the array
+returned by assignment_buffer() before calling evaluate().
+
+Batches of fewer than min_parallel_rows truth-value assignments are
+evaluated in the calling process.
+
+This module requires NumPy.
+'''
+
+#%%
+
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import resource_tracker, shared_memory
+import os
+
+import numpy as np
+
+from .plre_batch import BatchEvaluator
+from .plre_formulaset import FormulaSet
+
+#%%
+
+def _attach(name:str):
+    '''
+    Attach to an existing shared memory block, which the attaching process
+    does not own (and must not unlink).
+    '''
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        pass
+    # before Python 3.13, attaching registers the block with the resource
+    # tracker (which forked workers share with the parent process), so
+    # registration is suppressed while attaching
+    register = resource_tracker.register
+    resource_tracker.register = lambda name, rtype: None
+    try:
+        return shared_memory.SharedMemory(name=name)
+    finally:
+        resource_tracker.register = register
+
+
+def _share_array(arr):
+    '''
+    Copy an array into a new shared memory block, returning the block and
+    a descriptor (name, dtype, shape) from which to attach to it.
+    '''
+    shm = shared_memory.SharedMemory(create=True, size=max(arr.nbytes, 1))
+    np.ndarray(arr.shape, dtype=arr.dtype, buffer=shm.buf)[...] = arr
+    return shm, (shm.name, arr.dtype.str, arr.shape)
+
+
+#%%
+
+# the state of a worker process: its evaluator, and the shared memory
+# blocks it has attached to, by role
+_worker_evaluator = None
+_worker_blocks = {}
+
+def _init_worker(propSymbolSet:list, formula_descriptors:list):
+    global _worker_evaluator
+    arrays = []
+    for role, (name, dtype, shape) in zip(('literals', 'clause_offsets', 'formula_offsets'),
+                                          formula_descriptors):
+        shm = _attach(name)
+        arrays.append(np.ndarray(shape, dtype=dtype, buffer=shm.buf))
+        _worker_blocks[role] = (shm, arrays[-1])
+    # (the arrays were validated by the parent process)
+    formulaSet = FormulaSet(propSymbolSet, *arrays, validate=False)
+    _worker_evaluator = BatchEvaluator(formulaSet.symbolTable, formulaSet)
+
+
+def _worker_array(role:str, descriptor:tuple):
+    name, dtype, shape = descriptor
+    block = _worker_blocks.get(role)
+    if block is not None and block[0].name == name and block[1].shape == tuple(shape):
+        return block[1]
+    if block is not None:
+        shm = block[0]
+        del block, _worker_blocks[role]
+        _release(shm, unlink=False)
+    shm = _attach(name)
+    arr = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+    _worker_blocks[role] = (shm, arr)
+    return arr
+
+
+def _evaluate_rows(assignments:tuple, results:tuple, start:int, stop:int):
+    X = _worker_array('assignments', assignments)
+    out = _worker_array('results', results)
+    out[start:stop] = _worker_evaluator.evaluate(X[start:stop])
+    return stop - start
+
+
+def _release(shm, unlink:bool = True):
+    try:
+        shm.close()
+    except BufferError:
+        # an array over the block is still referenced; the mapping is
+        # released when that array is
+        pass
+    if unlink:
+        shm.unlink()
+
+
+#%%
+
+class SharedMemoryBatchEvaluator():
+    '''
+    An evaluator of the truth values of a fixed set of compiled CNF
+    expressions (CompiledFormula objects, or a FormulaSet) for batches of
+    truth-value assignments, parallelised over a pool of worker processes
+    communicating through shared memory.
+    '''
+
+    def __init__(self, propSymbolSet:list, formulas,
+                       max_workers:int = None,
+                       min_parallel_rows:int = 4096):
+
+        if max_workers is None:
+            max_workers = os.cpu_count() or 1
+        if max_workers < 1:
+            raise ValueError('max_workers must be positive')
+        self.max_workers = max_workers
+        self.min_parallel_rows = min_parallel_rows
+
+        if not isinstance(formulas, FormulaSet):
+            formulas = FormulaSet.from_formulas(propSymbolSet, formulas)
+        self.local_evaluator = BatchEvaluator(propSymbolSet, formulas)
+        self.propSymbolSet = self.local_evaluator.propSymbolSet
+
+        self._formula_blocks = []
+        descriptors = []
+        for arr in (formulas.literals, formulas.clause_offsets, formulas.formula_offsets):
+            shm, descriptor = _share_array(np.ascontiguousarray(arr))
+            self._formula_blocks.append(shm)
+            descriptors.append(descriptor)
+
+        # the assignment and result blocks are reused while large enough
+        self._blocks = {'assignments': None, 'results': None}
+
+        self._executor = ProcessPoolExecutor(max_workers, initializer=_init_worker,
+                                             initargs=(self.propSymbolSet, descriptors))
+
+
+    @property
+    def nr_formulas(self):
+        return self.local_evaluator.nr_formulas
+
+
+    def _block_array(self, role:str, shape:tuple, dtype):
+        '''
+        Return a shared memory block of at least the size of an array of
+        the given shape and dtype, and the array over it.
+        '''
+        dtype = np.dtype(dtype)
+        nbytes = max(int(np.prod(shape)) * dtype.itemsize, 1)
+        shm = self._blocks[role]
+        if shm is None or shm.size < nbytes:
+            if shm is not None:
+                _release(shm)
+            shm = self._blocks[role] = shared_memory.SharedMemory(create=True, size=nbytes)
+        return shm, np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+
+
+    def assignment_buffer(self, nr_rows:int):
+        '''
+        Return a Boolean array of shape (nr_rows, S) in shared memory, to
+        be filled with truth-value assignments and passed to evaluate().
+        The array is valid until the next call of assignment_buffer() or
+        evaluate().
+        '''
+        return self._block_array('assignments', (nr_rows, len(self.propSymbolSet)), bool)[1]
+
+
+    def evaluate(self, X):
+        '''
+        Evaluate the truth values of all formulas for a batch of
+        truth-value assignments, returning a Boolean matrix of shape (N, F).
+        '''
+        X = self.local_evaluator._check_assignments(X)
+        nr_rows = X.shape[0]
+        if nr_rows < self.min_parallel_rows or self.max_workers == 1:
+            return self.local_evaluator.evaluate(X)
+
+        shm, shared_X = self._block_array('assignments', X.shape, bool)
+        # (X need not be copied if it is the array of assignment_buffer())
+        if not (X.dtype == bool and X.flags.c_contiguous and
+                X.__array_interface__['data'][0] == shared_X.__array_interface__['data'][0]):
+            shared_X[...] = X
+        result_shm, result = self._block_array('results', (nr_rows, self.nr_formulas), bool)
+
+        assignments = (shm.name, shared_X.dtype.str, shared_X.shape)
+        results = (result_shm.name, result.dtype.str, result.shape)
+        bounds = np.linspace(0, nr_rows, 2 * self.max_workers + 1).astype(int).tolist()
+        futures = [self._executor.submit(_evaluate_rows, assignments, results, start, stop)
+                   for start, stop in zip(bounds[:-1], bounds[1:]) if start < stop]
+        for future in futures:
+            future.result()
+        return result.copy()
+
+
+    def close(self):
+        '''
+        Shut down the worker processes and release the shared memory.
+        '''
+        if self._executor is None:
+            return
+        self._executor.shutdown()
+        self._executor = None
+        for shm in self._formula_blocks + [shm for shm in self._blocks.values() if shm]:
+            _release(shm)
+        self._formula_blocks = []
+        self._blocks = {'assignments': None, 'results': None}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
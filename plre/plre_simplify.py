@@ -0,0 +1,140 @@
+"""
+@author: David Herron
+"""
+
+'''
+This module specifies an optional simplification pass over compiled CNF
+expressions (CompiledFormula objects; see plre_compiler).
+
+Each formula is simplified independently of the others, and its truth
+value is preserved under every truth-value assignment. The pass removes:
+- duplicate literals within a clause: (A | A | B) -> (A | B)
+- tautological clauses, which contain a literal and its negation:
+  (A | !A | B) is always True, and is dropped
+- duplicate clauses (with the same literals, in any order)
+- subsumed clauses: a clause whose literals include all the literals of
+  another clause of the same formula is implied by it, and is dropped
+- by unit propagation, literals falsified by a unit clause: given the
+  unit clause (A), the formula can only be True if A is True, so !A is
+  removed from the other clauses of the formula (and the clauses
+  containing A are subsumed by (A))
+
+A formula found to contain an empty clause (e.g. A & !A propagates to
+(A) & ()) is always False, and is simplified to a single empty clause.
+A formula all of whose clauses are tautologies is simplified to a formula
+with no clauses, which is always True.
+
+The pass reports what it removed, as a dict of counts with the keys in
+REPORT_KEYS.
+'''
+
+#%%
+
+from .plre_compiler import CompiledFormula
+
+#%%
+
+REPORT_KEYS = ('duplicate_literals',
+               'tautologies',
+               'duplicate_clauses',
+               'subsumed_clauses',
+               'propagated_literals')
+
+
+def _propagate_units(clauses:list, report:dict):
+    '''
+    Apply unit propagation to a list of clauses until no unit clause
+    changes the clauses any further.
+    '''
+    while True:
+        units = {clause[0] for clause in clauses if len(clause) == 1}
+        if not units:
+            return clauses
+        changed = False
+        propagated = []
+        for clause in clauses:
+            if len(clause) > 1 and any(literal in units for literal in clause):
+                report['subsumed_clauses'] += 1
+                changed = True
+                continue
+            reduced = tuple(literal for literal in clause if -literal not in units)
+            if len(reduced) < len(clause):
+                report['propagated_literals'] += len(clause) - len(reduced)
+                changed = True
+            propagated.append(reduced)
+        clauses = propagated
+        if not changed:
+            return clauses
+
+
+def _remove_subsumed(clauses:list, report:dict):
+    '''
+    Remove the clauses subsumed by (or equal to an earlier instance of)
+    another clause, retaining the order of the remaining clauses.
+    '''
+    literal_sets = [frozenset(clause) for clause in clauses]
+    kept = []
+    # a clause can only be subsumed by a clause of no greater length
+    for idx in sorted(range(len(clauses)), key=lambda idx: len(clauses[idx])):
+        literals = literal_sets[idx]
+        if any(literal_sets[other] <= literals for other in kept):
+            report['subsumed_clauses'] += 1
+        else:
+            kept.append(idx)
+    return [clauses[idx] for idx in sorted(kept)]
+
+
+#%%
+
+def simplify_formula(formula:CompiledFormula, report:dict = None):
+    '''
+    Simplify a CompiledFormula, returning a new CompiledFormula with the
+    same truth value under every truth-value assignment.
+
+    The text (if any) of the formula is retained, as the simplified
+    formula is equivalent to it. If a report dict is given, the counts of
+    what was removed are added to it.
+    '''
+    if report is None:
+        report = dict.fromkeys(REPORT_KEYS, 0)
+
+    clauses = []
+    seen = set()
+    for clause in formula.clauses:
+        literals = tuple(dict.fromkeys(clause))
+        report['duplicate_literals'] += len(clause) - len(literals)
+        if any(-literal in literals for literal in literals):
+            report['tautologies'] += 1
+            continue
+        key = frozenset(literals)
+        if key in seen:
+            report['duplicate_clauses'] += 1
+            continue
+        seen.add(key)
+        clauses.append(literals)
+
+    clauses = _propagate_units(clauses, report)
+    clauses = _remove_subsumed(clauses, report)
+    return CompiledFormula(clauses, getattr(formula, 'text', None))
+
+
+def simplify_formulas(formulas):
+    '''
+    Simplify each of a sequence of compiled CNF expressions (CompiledFormula
+    objects, or the formulas of a FormulaSet).
+
+    Returns a list of simplified CompiledFormula objects, and a report
+    dict of the total counts of what was removed (keys REPORT_KEYS), plus
+    'formulas_simplified', the number of formulas that changed.
+    '''
+    report = dict.fromkeys(REPORT_KEYS, 0)
+    nr_simplified = 0
+    simplified = []
+    for formula in formulas:
+        original = formula.clauses
+        result = simplify_formula(formula, report)
+        if result.clauses != original:
+            nr_simplified += 1
+        simplified.append(result)
+    report['formulas_simplified'] = nr_simplified
+    return simplified, report
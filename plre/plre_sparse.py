@@ -0,0 +1,149 @@
+"""
+@author: David Herron
+"""
+
+'''
+This module specifies a batch evaluator for sparse batches of truth-value
+assignments, given in CSR (compressed sparse row) form: an array of the
+indices (within the propSymbolSet) of the symbols assigned truth value
+True, and an array of per-row offsets into it, so that the true symbols of
+assignment i are indices[indptr[i]:indptr[i+1]]. (The indices and indptr
+arrays of a scipy.sparse.csr_matrix may be passed as they are.)
+
+No dense (N, S) matrix is formed. Given no true symbols, a clause is True
+iff it has a negative literal; each true symbol then changes the number of
+True literals of only the clauses in which it occurs (+1 per positive
+occurrence, -1 per negative occurrence). So the evaluator gathers, for
+every (assignment, true symbol) pair, the occurrences of the symbol, sums
+the changes per (assignment, clause), and adjusts the count of False
+clauses of the affected formulas only. Time and memory scale with the
+number of true symbols (times the number of clauses in which they occur),
+plus the (N, F) result.
+
+This module requires NumPy.
+'''
+
+#%%
+
+import numpy as np
+
+from .plre_formulaset import csr_arrays
+from .plre_symbols import SymbolTable
+
+#%%
+
+def sparse_assignments(propSymbolSet:list, truthValueAssignments:list):
+    '''
+    Convert a list of truth-value assignments (each a list of the symbols
+    assigned truth value True, as used by CNFVisitorA) into CSR form: a
+    pair (indices, indptr) of int64 arrays.
+    '''
+    symbolTable = SymbolTable.of(propSymbolSet)
+    indices = []
+    indptr = [0]
+    for truthValueAssignment in truthValueAssignments:
+        indices.extend(sorted(symbolTable.true_indices(truthValueAssignment)))
+        indptr.append(len(indices))
+    return np.array(indices, dtype=np.int64), np.array(indptr, dtype=np.int64)
+
+
+#%%
+
+class SparseBatchEvaluator():
+    '''
+    An evaluator of the truth values of a fixed set of compiled CNF
+    expressions (CompiledFormula objects, or a FormulaSet) for batches of
+    truth-value assignments given in CSR form.
+    '''
+
+    def __init__(self, propSymbolSet:list, formulas):
+
+        self.symbolTable = SymbolTable.of(propSymbolSet)
+        self.propSymbolSet = self.symbolTable.symbols
+        self.formulas = formulas
+        nr_symbols = len(self.symbolTable)
+
+        literals, literal_offsets, clause_offsets = csr_arrays(formulas)
+        nr_clauses = len(literal_offsets) - 1
+        self.nr_formulas = len(clause_offsets) - 1
+        self.nr_clauses = nr_clauses
+        literal_clauses = np.repeat(np.arange(nr_clauses), np.diff(literal_offsets))
+        self._clause_formula = np.repeat(np.arange(self.nr_formulas), np.diff(clause_offsets))
+
+        # the occurrences of each symbol, grouped by symbol: the clauses
+        # of symbol s are occurrence_clauses[occurrence_ptr[s]:occurrence_ptr[s+1]]
+        symbols = np.abs(literals) - 1
+        order = np.argsort(symbols, kind='stable')
+        self._occurrence_clauses = literal_clauses[order]
+        self._occurrence_signs = np.where(literals[order] > 0, 1, -1)
+        self._occurrence_ptr = np.zeros(nr_symbols + 1, dtype=np.int64)
+        np.cumsum(np.bincount(symbols, minlength=nr_symbols), out=self._occurrence_ptr[1:])
+
+        # the clauses that are False given no true symbols (those with no
+        # negative literals, including empty clauses), and the number of
+        # such clauses per formula
+        self.neg_counts = np.bincount(literal_clauses[literals < 0], minlength=nr_clauses)
+        self._default_false = self.neg_counts == 0
+        self._default_false_counts = np.bincount(self._clause_formula[self._default_false],
+                                                 minlength=self.nr_formulas)
+
+
+    def _check_assignments(self, indices, indptr):
+        indices = np.asarray(indices, dtype=np.int64)
+        indptr = np.asarray(indptr, dtype=np.int64)
+        if (indptr.ndim != 1 or len(indptr) == 0 or indptr[0] != 0 or
+                indptr[-1] != len(indices) or np.any(np.diff(indptr) < 0)):
+            raise ValueError('inconsistent sparse assignment arrays')
+        if len(indices) and (indices.min() < 0 or indices.max() >= len(self.propSymbolSet)):
+            raise ValueError('sparse assignment symbol index out of range of propSymbolSet')
+        return indices, indptr
+
+
+    def evaluate(self, indices, indptr):
+        '''
+        Evaluate the truth values of all formulas for a batch of N
+        truth-value assignments in CSR form, returning a Boolean matrix
+        of shape (N, F).
+        '''
+        indices, indptr = self._check_assignments(indices, indptr)
+        nr_rows = len(indptr) - 1
+        nr_symbols = len(self.propSymbolSet)
+        nr_clauses = self.nr_clauses
+        nr_formulas = self.nr_formulas
+
+        result = np.empty((nr_rows, nr_formulas), dtype=bool)
+        result[...] = self._default_false_counts == 0
+        if len(indices) == 0:
+            return result
+
+        # the distinct (row, symbol) pairs
+        rows = np.repeat(np.arange(nr_rows, dtype=np.int64), np.diff(indptr))
+        keys = np.unique(rows * nr_symbols + indices)
+        rows, symbols = np.divmod(keys, nr_symbols)
+
+        # every occurrence of every true symbol, as (row, clause, sign)
+        starts = self._occurrence_ptr[symbols]
+        lengths = self._occurrence_ptr[symbols + 1] - starts
+        nr_occurrences = int(lengths.sum())
+        if nr_occurrences == 0:
+            return result
+        firsts = np.cumsum(lengths) - lengths
+        positions = np.repeat(starts - firsts, lengths) + np.arange(nr_occurrences)
+        keys = np.repeat(rows, lengths) * nr_clauses + self._occurrence_clauses[positions]
+
+        # the change in the number of True literals, per touched
+        # (row, clause), and the resulting change in clause falsity
+        keys, inverse = np.unique(keys, return_inverse=True)
+        changes = np.bincount(inverse, weights=self._occurrence_signs[positions])
+        rows, clauses = np.divmod(keys, nr_clauses)
+        now_false = self.neg_counts[clauses] + changes <= 0
+        false_changes = now_false.astype(np.int64) - self._default_false[clauses]
+        changed = false_changes != 0
+
+        # the number of False clauses per touched (row, formula)
+        formulas = self._clause_formula[clauses[changed]]
+        keys, inverse = np.unique(rows[changed] * nr_formulas + formulas, return_inverse=True)
+        false_counts = np.bincount(inverse, weights=false_changes[changed])
+        false_counts += self._default_false_counts[keys % nr_formulas]
+        result.reshape(-1)[keys] = false_counts == 0
+        return result
@@ -0,0 +1,107 @@
+"""
+@author: David Herron
+"""
+
+'''
+This module specifies a symbol table for a set of propositional symbols.
+
+A symbol table interns the propositional symbols of a propSymbolSet:
+each symbol is mapped to a dense integer index (its position within the
+propSymbolSet) by a hash table, so that validating a symbol, looking up
+its index and recording its usage all take constant time, regardless of
+the number of symbols.
+
+Wherever the PLRE takes a propSymbolSet (the evaluators, the compiler,
+the FormulaSet, CNFVisitorA, ...), a SymbolTable may be passed in place
+of the list of symbols (see SymbolTable.of), so that the objects built
+for one propSymbolSet can share one table rather than each building its
+own.
+'''
+
+#%%
+
+class SymbolTable():
+    '''
+    A hash-indexed table of the propositional symbols of a propSymbolSet.
+
+    Symbols are identified by their 0-based index within the propSymbolSet.
+    '''
+
+    def __init__(self, propSymbolSet:list):
+
+        # verify there are no duplicate symbols
+        index = {symbol: idx for idx, symbol in enumerate(propSymbolSet)}
+        if len(index) < len(propSymbolSet):
+            raise ValueError('propSymbolSet contains duplicate symbols')
+
+        self.symbols = list(propSymbolSet)
+        self.index = index
+
+
+    @classmethod
+    def of(cls, propSymbolSet):
+        '''
+        Return propSymbolSet if it is already a SymbolTable; otherwise,
+        return a new SymbolTable for the given list of symbols.
+
+        This is how every PLRE constructor taking a propSymbolSet accepts
+        either a list of symbols or a SymbolTable; e.g. the CNFVisitorA
+        instances for successive truth-value assignments can share one.
+        '''
+        if isinstance(propSymbolSet, SymbolTable):
+            return propSymbolSet
+        return cls(propSymbolSet)
+
+
+    def __len__(self):
+        return len(self.symbols)
+
+    def __contains__(self, symbol):
+        return symbol in self.index
+
+    def __iter__(self):
+        return iter(self.symbols)
+
+
+    def lookup(self, symbol:str):
+        '''
+        Return the index of a symbol, or raise ValueError if the symbol is
+        not a member of the propSymbolSet.
+        '''
+        idx = self.index.get(symbol)
+        if idx is None:
+            raise ValueError(f'symbol in CNF expression not recognised: {symbol}')
+        return idx
+
+
+    def true_indices(self, truthValueAssignment:list):
+        '''
+        Validate a truth-value assignment (the list of symbols assigned
+        truth value True) and return the indices of its symbols, as a
+        frozenset.
+        '''
+        if not isinstance(truthValueAssignment, list):
+            raise ValueError('a truth-value assignment (list) is required')
+        if len(truthValueAssignment) > len(self.symbols):
+            raise ValueError('a truth-value assignment cannot be larger than propSymbolSet')
+        # (note: it is valid for a tVA to be empty, i.e. for no symbol to be True)
+        index = self.index
+        idxs = []
+        for symbol in truthValueAssignment:
+            idx = index.get(symbol)
+            if idx is None:
+                raise ValueError(f'symbol in truth-value assignment not in propSymbolSet: {symbol}')
+            idxs.append(idx)
+        return frozenset(idxs)
+
+
+    def truth_values(self, truthValueAssignment:list):
+        '''
+        Validate a truth-value assignment and return it as a list of
+        Boolean truth values indexed by symbol index.
+        '''
+        values = [False] * len(self.symbols)
+        for idx in self.true_indices(truthValueAssignment):
+            values[idx] = True
+        return values
+
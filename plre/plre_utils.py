@@ -9,9 +9,16 @@ A module of utility functionality.
 #%%
 
 from antlr4 import *
+from antlr4.error.ErrorListener import ConsoleErrorListener
+from antlr4.error.ErrorStrategy import DefaultErrorStrategy
+from antlr4.error.Errors import ParseCancellationException
 from plre.CNFLexer import CNFLexer
 from plre.CNFParser import CNFParser
+import plre.plre_metrics as metrics
+import mmap
+import os
 import re
+import threading
 
 #%%
 
@@ -37,6 +44,62 @@ def get_cnf_expressions_old(filepath):
 
 #%%
 
+def _read_lines(filepath, use_mmap:bool = False):
+    '''
+    Yield the lines of a text file, one at a time.
+
+    If use_mmap is True, the file is memory-mapped (and decoded as UTF-8)
+    rather than read through a buffered text stream.
+    '''
+    if not use_mmap:
+        with open(filepath, 'r') as fp:
+            yield from fp
+        return
+
+    with open(filepath, 'rb') as fp:
+        if os.fstat(fp.fileno()).st_size == 0:
+            return
+        with mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            for line in iter(mm.readline, b''):
+                yield line.decode('utf-8').replace('\r\n', '\n')
+
+
+def iter_cnf_expressions(filepath, use_mmap:bool = False):
+    '''
+    Extract CNF expressions from a text file, lazily.
+
+    This generator function yields (line_number, expression) pairs, where
+    line_number is the 1-based number of the line on which the CNF
+    expression begins. Each CNF expression is yielded as soon as the
+    blank line (or end of file) that terminates it has been read, so
+    memory use is bounded by the size of the largest CNF expression
+    rather than by the size of the file.
+
+    The CNF expressions extracted are the same as those extracted by
+    get_cnf_expressions(): comment lines --- those starting with '#' ---
+    are ignored, and one or more blank lines separate CNF expressions.
+    If use_mmap is True, the file is memory-mapped.
+    '''
+    block = []
+    block_line_number = None
+    for line_number, line in enumerate(_read_lines(filepath, use_mmap), start=1):
+        if line.startswith('#'):
+            continue
+        if line.strip():
+            if not block:
+                block_line_number = line_number
+            block.append(line)
+        elif block:
+            if metrics.enabled:
+                metrics.increment('expressions_read')
+            yield block_line_number, ''.join(block).strip()
+            block = []
+    if block:
+        if metrics.enabled:
+            metrics.increment('expressions_read')
+        yield block_line_number, ''.join(block).strip()
+
+
 def get_cnf_expressions(filepath):
     '''
     Extract CNF expressions from a text file.
@@ -50,33 +113,100 @@ def get_cnf_expressions(filepath):
     are extracted.  This feature permits PLRE users to document the
     propositional logic formulae they specify, in CNF, in PLRE input
     text files.
+
+    The file is read incrementally, via iter_cnf_expressions().
     '''
-    # read the contents into a list of strings, one string per line
-    with open(filepath, 'r') as fp:
-        lines = fp.readlines()
-    
-    # remove comment lines; and, in the process, concatenate the strings
-    # for the lines into one large string of content
-    content = ''.join(line for line in lines if not line.startswith('#'))
+    if not metrics.enabled:
+        return [expression for _, expression in iter_cnf_expressions(filepath)]
 
-    # split the content into distinct CNF expressions; split on one or 
-    # more adjacent blank lines
-    blocks = re.split(r'\n\s*\n', content.strip())
-    expressions = [block.strip() for block in blocks if block.strip()]
+    with metrics.timer('read'):
+        return [expression for _, expression in iter_cnf_expressions(filepath)]
 
-    return expressions
+
+def get_prop_symbols(filepath):
+    '''
+    Extract a propSymbolSet from a text file listing the propositional
+    symbols, in order. Symbols are separated by whitespace and/or commas;
+    comment lines --- those starting with '#' --- are ignored.
+    '''
+    symbols = []
+    for line in _read_lines(filepath):
+        if line.startswith('#'):
+            continue
+        symbols.extend(symbol for symbol in re.split(r'[\s,]+', line) if symbol)
+    return symbols
 
 
 #%%
 
+# one reusable CNF lexer/parser pair per thread
+_parsing = threading.local()
+
+def _get_lexer_and_parser():
+    '''
+    Return the CNF lexer and parser of the calling thread, creating them
+    on first use.
+    '''
+    if not hasattr(_parsing, 'parser'):
+        _parsing.lexer = CNFLexer(InputStream(''))
+        _parsing.parser = CNFParser(CommonTokenStream(_parsing.lexer))
+    return _parsing.lexer, _parsing.parser
+
+
 def parse_cnf(expression_text):
-    input_stream = InputStream(expression_text)
-    lexer = CNFLexer(input_stream)
+    '''
+    Parse the text of a CNF expression and return a pair (tree, parser).
+    If the CNF expression contains syntax errors, tree is None.
+
+    One CNF lexer and parser pair is reused (per thread) for every CNF
+    expression, so the parser returned is shared: its state (e.g.
+    getNumberOfSyntaxErrors()) reflects the most recent call only.
+
+    Parsing is done in two stages. The first stage uses the faster SLL
+    prediction mode with a bail-out error strategy, which abandons the
+    parse at the first syntax error without attempting recovery or
+    reporting. Only if the first stage fails is the CNF expression
+    re-parsed in full LL prediction mode with the default error strategy,
+    which recovers from and reports (prints) syntax errors.
+    '''
+    if not metrics.enabled:
+        return _parse_cnf(expression_text)
+
+    with metrics.timer('parse'):
+        tree, parser = _parse_cnf(expression_text)
+    metrics.increment('expressions_parsed')
+    # (the token stream includes the EOF token)
+    metrics.increment('tokens_lexed', len(parser.getTokenStream().tokens) - 1)
+    return tree, parser
+
+
+def _parse_cnf(expression_text):
+    lexer, parser = _get_lexer_and_parser()
+    lexer.inputStream = InputStream(expression_text)
     stream = CommonTokenStream(lexer)
-    parser = CNFParser(stream)
+    parser.setTokenStream(stream)
+
+    # stage 1: SLL prediction, bail out on the first syntax error
+    parser.removeErrorListeners()
+    parser._errHandler = BailErrorStrategy()
+    parser._interp.predictionMode = PredictionMode.SLL
+    try:
+        tree = parser.cnf()
+        return tree, parser
+    except ParseCancellationException:
+        pass
+
+    # stage 2: full LL prediction, with error recovery and reporting
+    if metrics.enabled:
+        metrics.increment('ll_fallbacks')
+    parser.addErrorListener(ConsoleErrorListener.INSTANCE)
+    parser._errHandler = DefaultErrorStrategy()
+    parser._interp.predictionMode = PredictionMode.LL
+    parser.reset()
     tree = parser.cnf()
     if parser.getNumberOfSyntaxErrors() > 0:
+        if metrics.enabled:
+            metrics.increment('syntax_errors', parser.getNumberOfSyntaxErrors())
         print(f'syntax errors: {parser.getNumberOfSyntaxErrors()}')
         return None, parser
     return tree, parser
-
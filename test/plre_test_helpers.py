@@ -0,0 +1,26 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+@author: David Herron
+"""
+
+'''
+Helpers shared by the pytest test modules.
+
+The test modules import this module after appending the parent directory
+of the 'plre' package to sys.path.
+'''
+
+#%%
+
+from plre.plre_compiler import CNFCompiler
+
+#%%
+
+def compile_expressions(propSymbolSet:list, expressions:list):
+    '''
+    Compile a list of CNF expressions with respect to propSymbolSet,
+    returning a list of CompiledFormula objects.
+    '''
+    compiler = CNFCompiler(propSymbolSet)
+    return [compiler.compile_expression(expr) for expr in expressions]
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+@author: David Herron
+"""
+
+'''
+A pytest test module.
+
+This test module defines tests for the NumPy batch evaluator, verifying
+that it computes the same truth values as CNFVisitorA.
+'''
+
+#%%
+
+# Specify whether you have installed the PLRE in your
+# Python environment. If you have not done so, don't
+# worry, we handle that case.
+use_installed_package = False
+
+
+#%%
+
+# NOTE:
+# If the PLRE is not installed, the code block below appends the parent
+# directory of the 'plre' package (folder) to sys.path so that the 'plre'
+# can be found when the import statements are processed. But the solution
+# only works if 'pytest' is invoked at the command line from within the
+# 'test' directory.
+#
+# Example:
+# $ cd test
+# $ pytest
+
+import os
+import sys
+
+if use_installed_package:
+    pass
+else:
+    plre_parent_dir = os.path.abspath('..')
+    if not os.path.exists(plre_parent_dir):
+        print('Error obtaining PLRE parent directory')
+    sys.path.append(plre_parent_dir)
+
+import itertools
+
+import pytest
+
+np = pytest.importorskip('numpy')
+
+import plre.plre_utils as pu
+from plre.CNFVisitorA import CNFVisitorA
+from plre.plre_compiler import CNFCompiler, CompiledFormula
+from plre.plre_batch import BatchEvaluator, ViolationReport, assignment_matrix
+
+
+#%%
+
+propSymbolSet = ['A', 'B', 'C', 'D']
+
+expressions = [
+    'A',
+    '(!A)',
+    '(A | B | !C)',
+    'A & (B | C) & !D',
+    '(A | B) & (C | !D)',
+    '(A | B | !C) & (!B | C | !D) & (!A | D)',
+    '(A | !A) & (B | B)',
+]
+
+truthValueAssignments = [list(combo)
+                         for r in range(len(propSymbolSet) + 1)
+                         for combo in itertools.combinations(propSymbolSet, r)]
+
+
+#%%
+
+class Test_BatchEvaluator:
+
+    def test_agrees_with_visitor(self):
+        compiler = CNFCompiler(propSymbolSet)
+        formulas = [compiler.compile_expression(expr) for expr in expressions]
+        trees = [pu.parse_cnf(expr)[0] for expr in expressions]
+        evaluator = BatchEvaluator(propSymbolSet, formulas)
+        X = assignment_matrix(propSymbolSet, truthValueAssignments)
+        result = evaluator.evaluate(X)
+        assert result.shape == (len(truthValueAssignments), len(expressions))
+        for row, tva in enumerate(truthValueAssignments):
+            visitor = CNFVisitorA(propSymbolSet, tva)
+            assert list(result[row]) == [visitor.visit(tree) for tree in trees]
+
+    def test_formula_without_clauses_is_true(self):
+        formulas = [CompiledFormula([]), CompiledFormula([[1]]), CompiledFormula([])]
+        evaluator = BatchEvaluator(propSymbolSet, formulas)
+        X = assignment_matrix(propSymbolSet, [[], ['A']])
+        assert evaluator.evaluate(X).tolist() == [[True, False, True],
+                                                  [True, True, True]]
+
+    def test_empty_batch(self):
+        compiler = CNFCompiler(propSymbolSet)
+        evaluator = BatchEvaluator(propSymbolSet, [compiler.compile_expression('A & B')])
+        X = np.zeros((0, len(propSymbolSet)), dtype=bool)
+        assert evaluator.evaluate(X).shape == (0, 1)
+
+    def test_wrong_shape(self):
+        evaluator = BatchEvaluator(propSymbolSet, [CompiledFormula([[1]])])
+        with pytest.raises(ValueError):
+            evaluator.evaluate(np.zeros((2, 3), dtype=bool))
+
+    def test_assignment_matrix_unknown_symbol(self):
+        with pytest.raises(ValueError):
+            assignment_matrix(propSymbolSet, [['Z']])
+
+    def test_aggregate_queries(self):
+        compiler = CNFCompiler(propSymbolSet)
+        formulas = [compiler.compile_expression(expr) for expr in expressions]
+        evaluator = BatchEvaluator(propSymbolSet, formulas)
+        X = assignment_matrix(propSymbolSet, truthValueAssignments)
+        result = evaluator.evaluate(X)
+        assert evaluator.all_satisfied(X).tolist() == result.all(axis=1).tolist()
+        assert evaluator.count_satisfied(X).tolist() == result.sum(axis=1).tolist()
+        violated = evaluator.violated_indices(X)
+        first = evaluator.first_violation(X)
+        for row in range(len(truthValueAssignments)):
+            expected = [idx for idx in range(len(formulas)) if not result[row, idx]]
+            assert violated[row].tolist() == expected
+            assert first[row] == (expected[0] if expected else -1)
+
+    def test_aggregate_queries_without_formulas(self):
+        evaluator = BatchEvaluator(propSymbolSet, [])
+        X = assignment_matrix(propSymbolSet, [[], ['A']])
+        assert evaluator.all_satisfied(X).tolist() == [True, True]
+        assert evaluator.first_violation(X).tolist() == [-1, -1]
+        assert [v.tolist() for v in evaluator.violated_indices(X)] == [[], []]
+
+
+#%%
+
+class Test_ViolationReport:
+
+    def test_violations_agree_with_clause_values(self):
+        compiler = CNFCompiler(propSymbolSet)
+        formulas = [compiler.compile_expression(expr) for expr in expressions]
+        evaluator = BatchEvaluator(propSymbolSet, formulas)
+        X = assignment_matrix(propSymbolSet, truthValueAssignments)
+        report = evaluator.evaluate_with_violations(X)
+        assert isinstance(report, ViolationReport)
+        assert (report.truth_values == evaluator.evaluate(X)).all()
+        clause_values = evaluator.evaluate_clauses(X)
+        for row in range(len(truthValueAssignments)):
+            assert report.violated_clauses(row).tolist() == \
+                   np.flatnonzero(~clause_values[row]).tolist()
+            for formulaIdx in range(len(formulas)):
+                start, stop = evaluator.clause_offsets[formulaIdx:formulaIdx + 2]
+                violated = report.violated_formula_clauses(row, formulaIdx).tolist()
+                assert violated == np.flatnonzero(~clause_values[row, start:stop]).tolist()
+                assert (len(violated) == 0) == report.truth_values[row, formulaIdx]
+        assert report.formula_violations.tolist() == \
+               (~report.truth_values).sum(axis=0).tolist()
+        assert report.clause_violations.tolist() == (~clause_values).sum(axis=0).tolist()
+        assert report.nr_violations == int((~clause_values).sum())
+
+    def test_formula_clause_numbers(self):
+        formulas = [CompiledFormula([[1], [2]]), CompiledFormula([[-1], [3], [-3, 4]])]
+        evaluator = BatchEvaluator(propSymbolSet, formulas)
+        report = evaluator.evaluate_with_violations(assignment_matrix(propSymbolSet, [['A', 'C']]))
+        assert report.violated_clauses(0).tolist() == [1, 2, 4]
+        assert report.violated_formula_clauses(0, 0).tolist() == [1]
+        assert report.violated_formula_clauses(0, 1).tolist() == [0, 2]
+        assert report.formula_violations.tolist() == [1, 1]
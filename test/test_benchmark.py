@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+@author: David Herron
+"""
+
+'''
+A pytest test module.
+
+This test module defines smoke tests for the benchmark suite and its
+synthetic workload generators.
+'''
+
+#%%
+
+# Specify whether you have installed the PLRE in your
+# Python environment. If you have not done so, don't
+# worry, we handle that case.
+use_installed_package = False
+
+
+#%%
+
+# NOTE:
+# If the PLRE is not installed, the code block below appends the parent
+# directory of the 'plre' package (folder) to sys.path so that the 'plre'
+# can be found when the import statements are processed. But the solution
+# only works if 'pytest' is invoked at the command line from within the
+# 'test' directory.
+#
+# Example:
+# $ cd test
+# $ pytest
+
+import json
+import os
+import sys
+
+if use_installed_package:
+    pass
+else:
+    plre_parent_dir = os.path.abspath('..')
+    if not os.path.exists(plre_parent_dir):
+        print('Error obtaining PLRE parent directory')
+    sys.path.append(plre_parent_dir)
+
+sys.path.append(os.path.join(os.path.abspath('..'), 'benchmark'))
+
+import plre.plre_parser as pp
+
+import run_benchmarks
+import workloads
+
+import pytest
+
+
+#%%
+
+tiny_workload = dict(run_benchmarks.DEFAULT_WORKLOAD,
+                     nr_symbols=10, nr_formulas=5, nr_clauses=3, nr_assignments=4)
+
+
+#%%
+
+class Test_Workloads:
+
+    def test_formula_texts_are_valid_k_cnf(self):
+        symbols = workloads.make_symbols(10)
+        texts = workloads.random_formula_texts(5, symbols, nr_clauses=4, clause_width=3)
+        for text in texts:
+            clauses = pp.parse_clauses(text)
+            assert len(clauses) == 4
+            assert all(len(clause) == 3 for clause in clauses)
+
+    def test_generators_are_deterministic(self):
+        symbols = workloads.make_symbols(10)
+        assert (workloads.random_assignments(3, symbols, seed=7) ==
+                workloads.random_assignments(3, symbols, seed=7))
+
+
+#%%
+
+class Test_Benchmarks:
+
+    def test_run_all_benchmarks(self):
+        names = sorted(run_benchmarks.available_benchmarks())
+        current = run_benchmarks.run_benchmarks(names, tiny_workload, repeat=1)
+        assert sorted(current['results']) == names
+        for result in current['results'].values():
+            assert result['throughput'] > 0
+            assert result['peak_memory_bytes'] > 0
+
+    def test_compare_flags_regressions(self):
+        baseline = {'results': {'x': {'throughput': 100.0, 'unit': 'u/s',
+                                      'peak_memory_bytes': 1000}}}
+        current = {'results': {'x': {'throughput': 70.0, 'unit': 'u/s',
+                                     'peak_memory_bytes': 1300}}}
+        assert len(run_benchmarks.compare(current, baseline, 0.25)) == 2
+        assert run_benchmarks.compare(current, baseline, 0.35) == []
+
+    def test_missing_baselines(self):
+        baseline = {'results': {'x': {'throughput': 100.0, 'unit': 'u/s',
+                                      'peak_memory_bytes': 1000}}}
+        current = {'results': {name: baseline['results']['x'] for name in ['x', 'y']}}
+        assert run_benchmarks.compare(current, baseline, 0.25) == []
+        assert run_benchmarks.missing_baselines(current, baseline) == ['y']
+
+    def test_baseline_covers_all_benchmarks(self):
+        with open(run_benchmarks.DEFAULT_BASELINE, 'r') as fp:
+            baseline = json.load(fp)
+        for name in list(run_benchmarks.BENCHMARKS) + list(run_benchmarks.NUMPY_BENCHMARKS):
+            assert name in baseline['results']
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+@author: David Herron
+"""
+
+'''
+A pytest test module.
+
+This test module defines tests for the binary formula set file format.
+'''
+
+#%%
+
+# Specify whether you have installed the PLRE in your
+# Python environment. If you have not done so, don't
+# worry, we handle that case.
+use_installed_package = False
+
+
+#%%
+
+# NOTE:
+# If the PLRE is not installed, the code block below appends the parent
+# directory of the 'plre' package (folder) to sys.path so that the 'plre'
+# can be found when the import statements are processed. But the solution
+# only works if 'pytest' is invoked at the command line from within the
+# 'test' directory.
+#
+# Example:
+# $ cd test
+# $ pytest
+
+import os
+import sys
+
+if use_installed_package:
+    pass
+else:
+    plre_parent_dir = os.path.abspath('..')
+    if not os.path.exists(plre_parent_dir):
+        print('Error obtaining PLRE parent directory')
+    sys.path.append(plre_parent_dir)
+
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from plre.plre_binfile import (compile_file, load_compiled, read_formula_set,
+                               read_header, source_checksum, write_formula_set)
+from plre.plre_formulaset import FormulaSet
+
+
+#%%
+
+propSymbolSet = ['A', 'B', 'C', 'D']
+
+source_text = '# constraints\nA & (!B | C)\n\n(!D)\n\n(A | B | C | D) & !A\n'
+
+
+def clauses_of(formulaSet):
+    return [view.clauses for view in formulaSet]
+
+
+#%%
+
+class Test_FormulaSetFile:
+
+    @pytest.mark.parametrize('mmap', [True, False])
+    def test_round_trip(self, tmp_path, mmap):
+        formulaSet = FormulaSet.from_expressions(propSymbolSet,
+                                                 ['A & (!B | C)', '(!D)', 'B', '(A | !A)'])
+        filepath = tmp_path / 'set.plrefs'
+        write_formula_set(filepath, formulaSet)
+        loaded = read_formula_set(filepath, mmap=mmap)
+        assert loaded.propSymbolSet == propSymbolSet
+        assert clauses_of(loaded) == clauses_of(formulaSet)
+        if mmap:
+            assert isinstance(loaded.literals.base, np.memmap) or \
+                   isinstance(loaded.literals, np.memmap)
+            assert not loaded.literals.flags.writeable
+
+    def test_empty_set(self, tmp_path):
+        filepath = tmp_path / 'set.plrefs'
+        write_formula_set(filepath, FormulaSet.from_formulas(propSymbolSet, []))
+        assert len(read_formula_set(filepath)) == 0
+
+    def test_header(self, tmp_path):
+        source = tmp_path / 'constraints.txt'
+        source.write_text(source_text)
+        filepath = tmp_path / 'set.plrefs'
+        compile_file(source, filepath, propSymbolSet)
+        header = read_header(filepath)
+        assert header['nr_symbols'] == 4
+        assert header['nr_formulas'] == 3
+        assert header['nr_clauses'] == 5
+        assert header['checksum'] == source_checksum(source)
+        assert header['literals_offset'] % 64 == 0
+
+    def test_not_a_formula_set_file(self, tmp_path):
+        filepath = tmp_path / 'set.plrefs'
+        filepath.write_bytes(b'A & B\n' * 40)
+        with pytest.raises(ValueError, match='not a PLRE formula set file'):
+            read_formula_set(filepath)
+
+    def test_truncated_file(self, tmp_path):
+        filepath = tmp_path / 'set.plrefs'
+        write_formula_set(filepath, FormulaSet.from_expressions(propSymbolSet, ['A & B']))
+        filepath.write_bytes(filepath.read_bytes()[:-4])
+        with pytest.raises(ValueError, match='corrupt'):
+            read_formula_set(filepath)
+
+
+#%%
+
+class Test_LoadCompiled:
+
+    def test_compiles_once_then_reuses(self, tmp_path):
+        source = tmp_path / 'constraints.txt'
+        source.write_text(source_text)
+        filepath = tmp_path / 'constraints.plrefs'
+        formulaSet = load_compiled(source, filepath, propSymbolSet)
+        assert clauses_of(formulaSet) == [((1,), (-2, 3)), ((-4,),), ((1, 2, 3, 4), (-1,))]
+        mtime = filepath.stat().st_mtime_ns
+        load_compiled(source, filepath, propSymbolSet)
+        assert filepath.stat().st_mtime_ns == mtime
+
+    def test_recompiles_when_source_changes(self, tmp_path):
+        source = tmp_path / 'constraints.txt'
+        source.write_text(source_text)
+        filepath = tmp_path / 'constraints.plrefs'
+        load_compiled(source, filepath, propSymbolSet)
+        source.write_text('B\n')
+        assert clauses_of(load_compiled(source, filepath, propSymbolSet)) == [((2,),)]
+
+    def test_recompiles_when_symbols_change(self, tmp_path):
+        source = tmp_path / 'constraints.txt'
+        source.write_text('B\n')
+        filepath = tmp_path / 'constraints.plrefs'
+        load_compiled(source, filepath, propSymbolSet)
+        formulaSet = load_compiled(source, filepath, ['B', 'A'])
+        assert formulaSet.propSymbolSet == ['B', 'A']
+        assert clauses_of(formulaSet) == [((1,),)]
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+@author: David Herron
+"""
+
+'''
+A pytest test module.
+
+This test module defines tests for the bitset evaluator, verifying that
+it computes the same truth values as the compiled evaluator.
+'''
+
+#%%
+
+# Specify whether you have installed the PLRE in your
+# Python environment. If you have not done so, don't
+# worry, we handle that case.
+use_installed_package = False
+
+
+#%%
+
+# NOTE:
+# If the PLRE is not installed, the code block below appends the parent
+# directory of the 'plre' package (folder) to sys.path so that the 'plre'
+# can be found when the import statements are processed. But the solution
+# only works if 'pytest' is invoked at the command line from within the
+# 'test' directory.
+#
+# Example:
+# $ cd test
+# $ pytest
+
+import os
+import sys
+
+if use_installed_package:
+    pass
+else:
+    plre_parent_dir = os.path.abspath('..')
+    if not os.path.exists(plre_parent_dir):
+        print('Error obtaining PLRE parent directory')
+    sys.path.append(plre_parent_dir)
+
+import itertools
+
+from plre.plre_compiler import CNFCompiler, CompiledEvaluator
+from plre.plre_bitset import BitsetEvaluator, pack_assignment, pack_words
+
+import pytest
+
+
+#%%
+
+propSymbolSet = ['A', 'B', 'C', 'D']
+
+expressions = [
+    'A',
+    '(!A)',
+    '(A | B | !C)',
+    'A & (B | C) & !D',
+    '(A | B) & (C | !D)',
+    '(A | B | !C) & (!B | C | !D) & (!A | D)',
+    '(A | !A) & (B | B)',
+]
+
+truthValueAssignments = [list(combo)
+                         for r in range(len(propSymbolSet) + 1)
+                         for combo in itertools.combinations(propSymbolSet, r)]
+
+
+#%%
+
+class Test_BitsetEvaluator:
+
+    def test_agrees_with_compiled_evaluator(self):
+        compiler = CNFCompiler(propSymbolSet)
+        formulas = [compiler.compile_expression(expr) for expr in expressions]
+        bitset = BitsetEvaluator(propSymbolSet, formulas)
+        for tva in truthValueAssignments:
+            expected = CompiledEvaluator(propSymbolSet, tva).evaluate_all(formulas)
+            packed = bitset.pack(tva)
+            assert bitset.evaluate(packed) == expected
+            assert [bitset.evaluate_formula(f, packed)
+                    for f in range(len(formulas))] == expected
+
+    def test_pack_assignment(self):
+        assert pack_assignment(propSymbolSet, ['A', 'D']) == 0b1001
+        assert pack_assignment(propSymbolSet, []) == 0
+
+    def test_words(self):
+        symbols = [f'S{idx}' for idx in range(130)]
+        compiler = CNFCompiler(symbols)
+        formula = compiler.compile_expression('S0 & (S64 | S65) & !S129')
+        bitset = BitsetEvaluator(symbols, [formula])
+        assert pack_words([1, 2, 0]) == bitset.pack(['S0', 'S65'])
+        assert bitset.evaluate([1, 2, 0]) == [True]
+        assert bitset.evaluate([1, 2, 2]) == [False]
+
+    def test_integer_scalars(self):
+        np = pytest.importorskip('numpy')
+        compiler = CNFCompiler(propSymbolSet)
+        formulas = [compiler.compile_expression(expr) for expr in expressions]
+        bitset = BitsetEvaluator(propSymbolSet, formulas)
+        for tva in truthValueAssignments:
+            packed = bitset.pack(tva)
+            expected = bitset.evaluate(packed)
+            assert bitset.evaluate(np.uint64(packed)) == expected
+            assert bitset.evaluate(np.int32(packed)) == expected
+            assert bitset.evaluate_formula(0, np.uint8(packed)) == expected[0]
+
+    def test_bits_beyond_symbol_set(self):
+        bitset = BitsetEvaluator(propSymbolSet, [])
+        with pytest.raises(ValueError):
+            bitset.evaluate(1 << 4)
+        with pytest.raises(ValueError):
+            bitset.evaluate(-1)
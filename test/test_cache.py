@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+@author: David Herron
+"""
+
+'''
+A pytest test module.
+
+This test module defines tests for the LRU cache of compiled CNF
+expressions keyed by canonical expression text.
+'''
+
+#%%
+
+# Specify whether you have installed the PLRE in your
+# Python environment. If you have not done so, don't
+# worry, we handle that case.
+use_installed_package = False
+
+
+#%%
+
+# NOTE:
+# If the PLRE is not installed, the code block below appends the parent
+# directory of the 'plre' package (folder) to sys.path so that the 'plre'
+# can be found when the import statements are processed. But the solution
+# only works if 'pytest' is invoked at the command line from within the
+# 'test' directory.
+#
+# Example:
+# $ cd test
+# $ pytest
+
+import os
+import sys
+
+if use_installed_package:
+    pass
+else:
+    plre_parent_dir = os.path.abspath('..')
+    if not os.path.exists(plre_parent_dir):
+        print('Error obtaining PLRE parent directory')
+    sys.path.append(plre_parent_dir)
+
+from plre.plre_cache import ParseCache, canonical_expression
+
+import pytest
+
+
+#%%
+
+propSymbolSet = ['A', 'B', 'C', 'D']
+
+
+#%%
+
+class Test_CanonicalExpression:
+
+    def test_variants_share_canonical_form(self):
+        variants = ['(B | !A) AND C',
+                    '(NOT A OR B) & (C)',
+                    '(~A|B)\n&\nC']
+        assert {canonical_expression(v) for v in variants} == {'(!A | B) & (C)'}
+
+    def test_clause_order_is_retained(self):
+        assert canonical_expression('A & B') != canonical_expression('B & A')
+
+    def test_invalid_expression(self):
+        assert canonical_expression('(A & B)') is None
+
+
+#%%
+
+class Test_ParseCache:
+
+    def test_duplicates_share_one_object(self):
+        cache = ParseCache(propSymbolSet)
+        f1 = cache.compile('(B | !A) AND C')
+        f2 = cache.compile('(NOT A OR B) & (C)')
+        assert f1 is f2
+        assert f1.clauses == ((-1, 2), (3,))
+        assert cache.stats() == {'size': 1, 'maxsize': 4096,
+                                 'hits': 1, 'misses': 1, 'evictions': 0}
+
+    def test_hit_does_not_parse(self, monkeypatch):
+        import plre.plre_cache
+        cache = ParseCache(propSymbolSet)
+        formula = cache.compile('(B | !A) AND C')
+        calls = []
+        parse = plre.plre_cache.parse_cnf_fast
+        monkeypatch.setattr(plre.plre_cache, 'parse_cnf_fast',
+                            lambda text: calls.append(text) or parse(text))
+        assert cache.compile('(B | !A) AND C') is formula
+        assert calls == []
+        assert cache.compile('(NOT A OR B) & (C)') is formula
+        assert calls == ['(NOT A OR B) & (C)']
+        assert cache.hits == 2
+
+    def test_lru_eviction(self):
+        cache = ParseCache(propSymbolSet, maxsize=2)
+        cache.compile('A')
+        cache.compile('B')
+        cache.compile('A')          # A becomes most recently used
+        cache.compile('C')          # evicts B
+        assert 'A' in cache and 'C' in cache and 'B' not in cache
+        assert cache.evictions == 1
+        assert len(cache) == 2
+
+    def test_invalid_expressions_are_not_cached(self):
+        cache = ParseCache(propSymbolSet)
+        assert cache.compile('A &') is None
+        assert len(cache) == 0
+
+    def test_unknown_symbol(self):
+        cache = ParseCache(propSymbolSet)
+        with pytest.raises(ValueError):
+            cache.compile('A & Z')
+
+    def test_clear(self):
+        cache = ParseCache(propSymbolSet, maxsize=None)
+        cache.compile_all(['A', 'A', 'B'])
+        cache.clear()
+        assert cache.stats() == {'size': 0, 'maxsize': None,
+                                 'hits': 0, 'misses': 0, 'evictions': 0}
+
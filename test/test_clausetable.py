@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+@author: David Herron
+"""
+
+'''
+A pytest test module.
+
+This test module defines tests for the shared clause table and the
+evaluator built over it, verifying that it computes the same truth values
+as CompiledEvaluator.
+'''
+
+#%%
+
+# Specify whether you have installed the PLRE in your
+# Python environment. If you have not done so, don't
+# worry, we handle that case.
+use_installed_package = False
+
+
+#%%
+
+# NOTE:
+# If the PLRE is not installed, the code block below appends the parent
+# directory of the 'plre' package (folder) to sys.path so that the 'plre'
+# can be found when the import statements are processed. But the solution
+# only works if 'pytest' is invoked at the command line from within the
+# 'test' directory.
+#
+# Example:
+# $ cd test
+# $ pytest
+
+import os
+import sys
+
+if use_installed_package:
+    pass
+else:
+    plre_parent_dir = os.path.abspath('..')
+    if not os.path.exists(plre_parent_dir):
+        print('Error obtaining PLRE parent directory')
+    sys.path.append(plre_parent_dir)
+
+import itertools
+
+import pytest
+
+import plre.plre_metrics as metrics
+from plre.plre_clausetable import ClauseTable, SharedClauseEvaluator
+from plre.plre_compiler import CompiledEvaluator, CompiledFormula
+
+from plre_test_helpers import compile_expressions
+
+
+#%%
+
+propSymbolSet = ['Red', 'Green', 'Blue', 'Big']
+
+expressions = [
+    '(!Red | !Green) & (!Red | !Blue) & (!Green | !Blue)',
+    '(!Green | !Red) & Big',
+    '(Red | Green | Blue)',
+    '(!Blue | !Red) & (Big | !Big)',
+    'Red & !Red',
+]
+
+truthValueAssignments = [list(combo)
+                         for r in range(len(propSymbolSet) + 1)
+                         for combo in itertools.combinations(propSymbolSet, r)]
+
+
+#%%
+
+class Test_ClauseTable:
+
+    def test_hash_consing(self):
+        table = ClauseTable()
+        assert table.intern((-1, -2)) == 0
+        assert table.intern((3,)) == 1
+        assert table.intern((-2, -1)) == 0
+        assert table.intern((-1, -2, -1)) == 0
+        assert len(table) == 2
+        assert table.nr_occurrences == 4
+        assert (-2, -1) in table
+        assert (1, 2) not in table
+
+
+#%%
+
+class Test_SharedClauseEvaluator:
+
+    def test_agrees_with_compiled_evaluator(self):
+        formulas = compile_expressions(propSymbolSet, expressions)
+        evaluator = SharedClauseEvaluator(propSymbolSet, formulas)
+        compiled = CompiledEvaluator(propSymbolSet, [])
+        for tva in truthValueAssignments:
+            compiled.set_assignment(tva)
+            assert evaluator.evaluate_all(tva) == compiled.evaluate_all(formulas)
+
+    def test_sharing_stats(self):
+        formulas = compile_expressions(propSymbolSet, expressions)
+        evaluator = SharedClauseEvaluator(propSymbolSet, formulas)
+        assert evaluator.sharing_stats() == {'clause_occurrences': 10,
+                                             'distinct_clauses': 8}
+        assert evaluator.formula_clauses[1][0] == evaluator.formula_clauses[0][0]
+
+    def test_each_distinct_clause_evaluated_once(self):
+        formulas = compile_expressions(propSymbolSet, expressions)
+        evaluator = SharedClauseEvaluator(propSymbolSet, formulas)
+        metrics.reset()
+        metrics.enable()
+        try:
+            evaluator.evaluate_all(['Red'])
+            assert metrics.snapshot()['counters']['clauses_evaluated'] == 8
+        finally:
+            metrics.disable()
+            metrics.reset()
+
+    def test_empty_formula_and_clause(self):
+        formulas = [CompiledFormula([]), CompiledFormula([()]), CompiledFormula([(), (1,)])]
+        evaluator = SharedClauseEvaluator(propSymbolSet, formulas)
+        assert evaluator.evaluate_all(['Red']) == [True, False, False]
@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+@author: David Herron
+"""
+
+'''
+A pytest test module.
+
+This test module defines tests for the 'plre' command-line batch
+evaluator.
+'''
+
+#%%
+
+# Specify whether you have installed the PLRE in your
+# Python environment. If you have not done so, don't
+# worry, we handle that case.
+use_installed_package = False
+
+
+#%%
+
+# NOTE:
+# If the PLRE is not installed, the code block below appends the parent
+# directory of the 'plre' package (folder) to sys.path so that the 'plre'
+# can be found when the import statements are processed. But the solution
+# only works if 'pytest' is invoked at the command line from within the
+# 'test' directory.
+#
+# Example:
+# $ cd test
+# $ pytest
+
+import os
+import sys
+
+if use_installed_package:
+    pass
+else:
+    plre_parent_dir = os.path.abspath('..')
+    if not os.path.exists(plre_parent_dir):
+        print('Error obtaining PLRE parent directory')
+    sys.path.append(plre_parent_dir)
+
+from concurrent.futures import ThreadPoolExecutor
+import io
+import json
+import subprocess
+
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from plre.plre_binfile import compile_file
+from plre.plre_cli import evaluate_stream, main
+from plre.plre_compiler import CNFCompiler, CompiledEvaluator
+
+
+#%%
+
+propSymbolSet = ['A', 'B', 'C', 'D']
+
+expressions = [
+    'A',
+    '(A | B | !C)',
+    'A & (B | C) & !D',
+    '(A | B) & (C | !D)',
+]
+
+truthValueAssignments = [[], ['A'], ['A', 'B'], ['C', 'D'], ['A', 'B', 'C', 'D'], ['B', 'C']]
+
+
+@pytest.fixture
+def files(tmp_path):
+    constraints = tmp_path / 'constraints.txt'
+    constraints.write_text('\n\n'.join(expressions) + '\n')
+    symbols = tmp_path / 'symbols.txt'
+    symbols.write_text('A B C D\n')
+    return constraints, symbols
+
+
+def expected_values():
+    compiler = CNFCompiler(propSymbolSet)
+    formulas = [compiler.compile_expression(expr) for expr in expressions]
+    evaluator = CompiledEvaluator(propSymbolSet, [])
+    values = []
+    for tva in truthValueAssignments:
+        evaluator.set_assignment(tva)
+        values.append(evaluator.evaluate_all(formulas))
+    return values
+
+
+def jsonl_input():
+    return io.StringIO(''.join(json.dumps(tva) + '\n' for tva in truthValueAssignments))
+
+
+def csv_input():
+    lines = ['D,B,A,C']
+    for tva in truthValueAssignments:
+        lines.append(','.join('1' if symbol in tva else '0' for symbol in 'DBAC'))
+    return io.StringIO('\n'.join(lines) + '\n')
+
+
+#%%
+
+class Test_EvaluateStream:
+
+    @pytest.mark.parametrize('max_workers', [1, 2])
+    @pytest.mark.parametrize('input_format', ['jsonl', 'csv'])
+    def test_values(self, files, input_format, max_workers):
+        constraints, _ = files
+        output = io.StringIO()
+        stream = jsonl_input() if input_format == 'jsonl' else csv_input()
+        nr_assignments = evaluate_stream(constraints, stream, output, propSymbolSet,
+                                         input_format=input_format, chunksize=4,
+                                         max_workers=max_workers)
+        assert nr_assignments == len(truthValueAssignments)
+        assert [json.loads(line) for line in output.getvalue().splitlines()] == expected_values()
+
+    def test_constraints_compiled_once(self, files, monkeypatch):
+        # the workers receive the compiled constraints, not the text file
+        initargs = []
+        class InlineExecutor(ThreadPoolExecutor):
+            def __init__(self, max_workers, initializer, initargs):
+                super().__init__(max_workers)
+                initializer(*initargs)
+                self.initargs = initargs
+            def __enter__(self):
+                initargs.append(self.initargs)
+                return self
+        monkeypatch.setattr('plre.plre_cli.ProcessPoolExecutor', InlineExecutor)
+        constraints, _ = files
+        output = io.StringIO()
+        evaluate_stream(constraints, jsonl_input(), output, propSymbolSet,
+                        chunksize=4, max_workers=2)
+        assert isinstance(initargs[0][0], tuple)
+        assert [json.loads(line) for line in output.getvalue().splitlines()] == expected_values()
+
+    def test_reports(self, files):
+        constraints, _ = files
+        expected = expected_values()
+        outputs = {}
+        for report in ['all', 'count', 'violations']:
+            output = io.StringIO()
+            evaluate_stream(constraints, jsonl_input(), output, propSymbolSet,
+                            report=report, chunksize=4)
+            outputs[report] = [json.loads(line) for line in output.getvalue().splitlines()]
+        assert outputs['all'] == [all(values) for values in expected]
+        assert outputs['count'] == [sum(values) for values in expected]
+        assert outputs['violations'] == [[idx for idx, value in enumerate(values) if not value]
+                                         for values in expected]
+
+    def test_blank_lines_skipped(self, files):
+        constraints, _ = files
+        output = io.StringIO()
+        evaluate_stream(constraints, io.StringIO('["A"]\n\n[]\n'), output, propSymbolSet,
+                        report='all')
+        assert output.getvalue() == 'false\nfalse\n'
+
+    def test_invalid_input_line_number(self, files):
+        constraints, _ = files
+        with pytest.raises(ValueError, match='^line 3: .*not in propSymbolSet: Z'):
+            evaluate_stream(constraints, io.StringIO('["A"]\n[]\n["Z"]\n'),
+                            io.StringIO(), propSymbolSet)
+        with pytest.raises(ValueError, match='^line 2: expected 2 0/1 values'):
+            evaluate_stream(constraints, io.StringIO('A,B\n1,x\n'),
+                            io.StringIO(), propSymbolSet, input_format='csv')
+        for line in ['[["A"]]', '"A"', '{"A": 1}', '[1]']:
+            with pytest.raises(ValueError, match='^line 2: expected a JSON list of symbols'):
+                evaluate_stream(constraints, io.StringIO(f'["A"]\n{line}\n'),
+                                io.StringIO(), propSymbolSet)
+        for row in ['2,0', '-1,0', '1,300']:
+            with pytest.raises(ValueError, match='^line 3: expected 2 0/1 values'):
+                evaluate_stream(constraints, io.StringIO(f'A,B\n1,0\n{row}\n'),
+                                io.StringIO(), propSymbolSet, input_format='csv')
+
+    def test_unknown_csv_column(self, files):
+        constraints, _ = files
+        with pytest.raises(ValueError, match='^line 1: CSV column not in propSymbolSet: Z$'):
+            evaluate_stream(constraints, io.StringIO('A,Z\n1,0\n'),
+                            io.StringIO(), propSymbolSet, input_format='csv')
+
+
+#%%
+
+class Test_Main:
+
+    def test_main_with_files(self, files, tmp_path):
+        constraints, symbols = files
+        input_file = tmp_path / 'assignments.jsonl'
+        input_file.write_text(jsonl_input().getvalue())
+        output_file = tmp_path / 'results.jsonl'
+        status = main([str(constraints), '--symbols', str(symbols), '--input', str(input_file),
+                       '--output', str(output_file), '--report', 'count', '--chunk-size', '2'])
+        assert status == 0
+        assert [int(line) for line in output_file.read_text().splitlines()] == \
+               [sum(values) for values in expected_values()]
+
+    def test_main_with_formula_set_file(self, files, tmp_path, monkeypatch, capsys):
+        constraints, _ = files
+        binary = tmp_path / 'constraints.plrefs'
+        compile_file(constraints, binary, propSymbolSet)
+        monkeypatch.setattr('sys.stdin', io.StringIO('["B"]\n'))
+        assert main([str(binary), '--report', 'violations']) == 0
+        assert capsys.readouterr().out == '[0, 2]\n'
+
+    def test_main_without_numpy(self, files):
+        # (run in a subprocess in which NumPy cannot be imported)
+        constraints, _ = files
+        code = ('import sys; sys.modules["numpy"] = None; '
+                'from plre.plre_cli import main; '
+                f'sys.exit(main([{str(constraints)!r}]))')
+        result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True,
+                                cwd=os.path.abspath('..'))
+        assert result.returncode == 1
+        assert "pip install 'plre[numpy]'" in result.stderr
+
+    def test_main_requires_symbols(self, files, capsys):
+        constraints, _ = files
+        assert main([str(constraints)]) == 1
+        assert 'propSymbolSet is required' in capsys.readouterr().err
@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+@author: David Herron
+"""
+
+'''
+A pytest test module.
+
+This test module defines tests for compiling CNF expressions into the
+flat integer clause IR, and for evaluating the truth values of compiled
+CNF expressions.
+'''
+
+#%%
+
+# Specify whether you have installed the PLRE in your
+# Python environment. If you have not done so, don't
+# worry, we handle that case.
+use_installed_package = False
+
+
+#%%
+
+# NOTE:
+# If the PLRE is not installed, the code block below appends the parent
+# directory of the 'plre' package (folder) to sys.path so that the 'plre'
+# can be found when the import statements are processed. But the solution
+# only works if 'pytest' is invoked at the command line from within the
+# 'test' directory.
+#
+# Example:
+# $ cd test
+# $ pytest
+
+import os
+import sys
+
+if use_installed_package:
+    pass
+else:
+    plre_parent_dir = os.path.abspath('..')
+    if not os.path.exists(plre_parent_dir):
+        print('Error obtaining PLRE parent directory')
+    sys.path.append(plre_parent_dir)
+
+import itertools
+import pickle
+
+import plre.plre_utils as pu
+from plre.CNFVisitorA import CNFVisitorA
+from plre.plre_compiler import CNFCompiler, CompiledEvaluator, CompiledFormula
+from plre.plre_symbols import SymbolTable
+
+import pytest
+
+
+#%%
+
+propSymbolSet = ['A', 'B', 'C', 'D']
+
+formulae = [
+    'A',
+    '(!A)',
+    '(A | B | !C)',
+    'A & (B | C) & !D',
+    '(A | B) & (C | !D)',
+    '(A | B | !C) & (!B | C | !D) & (!A | D)',
+    '(A OR NOT B) AND (~C | D)',
+]
+
+def all_assignments(symbols):
+    for r in range(len(symbols) + 1):
+        for combo in itertools.combinations(symbols, r):
+            yield list(combo)
+
+
+#%%
+
+class Test_Compilation:
+
+    def test_compile_signed_literals(self):
+        compiler = CNFCompiler(propSymbolSet)
+        formula = compiler.compile_expression('(A | B) & (C | !D)')
+        assert formula.clauses == ((1, 2), (3, -4))
+
+    def test_compile_single_literal(self):
+        compiler = CNFCompiler(propSymbolSet)
+        formula = compiler.compile_expression('!C')
+        assert formula.clauses == ((-3,),)
+
+    def test_compile_records_symbol_usage(self):
+        compiler = CNFCompiler(propSymbolSet)
+        compiler.compile_expression('A & !C')
+        assert compiler.propSymbolUsage == [True, False, True, False]
+
+    def test_compile_unknown_symbol(self):
+        compiler = CNFCompiler(propSymbolSet)
+        with pytest.raises(ValueError):
+            compiler.compile_expression('A & Z')
+
+    def test_compile_syntax_error(self):
+        compiler = CNFCompiler(propSymbolSet)
+        assert compiler.compile_expression('(A & B') is None
+
+    def test_compiled_formula_pickles(self):
+        formula = CompiledFormula([[1, -2], [3]], '(A | !B) & C')
+        formula2 = pickle.loads(pickle.dumps(formula))
+        assert formula2 == formula
+        assert formula2.text == formula.text
+
+
+#%%
+
+class Test_CompiledEvaluation:
+
+    @pytest.mark.parametrize('expression', formulae)
+    def test_agrees_with_visitor(self, expression):
+        compiler = CNFCompiler(propSymbolSet)
+        formula = compiler.compile_expression(expression)
+        tree, _ = pu.parse_cnf(expression)
+        for tva in all_assignments(propSymbolSet):
+            visitor = CNFVisitorA(propSymbolSet, tva)
+            evaluator = CompiledEvaluator(propSymbolSet, tva)
+            assert evaluator.evaluate(formula) == visitor.visit(tree)
+
+    def test_readme_example(self):
+        compiler = CNFCompiler(['A', 'B', 'C', 'D', 'E'])
+        formulas = [compiler.compile_expression(expr) for expr in
+                    ['(A | B | !C)', '(A | B) & (C | !D)', '(A | B) & (C | !D) & E']]
+        evaluator = CompiledEvaluator(['A', 'B', 'C', 'D', 'E'], ['A', 'C'])
+        assert evaluator.evaluate_all(formulas) == [True, True, False]
+
+    def test_invalid_assignment(self):
+        with pytest.raises(ValueError):
+            CompiledEvaluator(propSymbolSet, ['A', 'Z'])
+
+
+#%%
+
+class Test_AggregateQueries:
+
+    def setup_method(self):
+        compiler = CNFCompiler(propSymbolSet)
+        self.formulas = [compiler.compile_expression(expr) for expr in
+                         ['A', '(A | B) & C', '!D', '(B | D)']]
+
+    def test_aggregates(self):
+        evaluator = CompiledEvaluator(propSymbolSet, ['A', 'B'])
+        assert evaluator.all_satisfied(self.formulas) is False
+        assert evaluator.first_violation(self.formulas) == 1
+        assert evaluator.count_satisfied(self.formulas) == 3
+        assert evaluator.violated_indices(self.formulas) == [1]
+
+    def test_all_true(self):
+        evaluator = CompiledEvaluator(propSymbolSet, ['A', 'B', 'C'])
+        assert evaluator.all_satisfied(self.formulas) is True
+        assert evaluator.first_violation(self.formulas) is None
+        assert evaluator.count_satisfied(self.formulas) == 4
+        assert evaluator.violated_indices(self.formulas) == []
+
+    def test_all_satisfied_stops_at_first_violation(self):
+        evaluator = CompiledEvaluator(propSymbolSet, [])
+        evaluated = []
+        def formulas():
+            for formula in self.formulas:
+                evaluated.append(formula)
+                yield formula
+        assert evaluator.all_satisfied(formulas()) is False
+        assert evaluated == self.formulas[:1]
+
+
+#%%
+
+class Test_SymbolTable:
+
+    def test_shared_symbol_table(self):
+        symbolTable = SymbolTable(propSymbolSet)
+        tree, _ = pu.parse_cnf('(A | !B) & C')
+        for tva in all_assignments(propSymbolSet):
+            visitor1 = CNFVisitorA(symbolTable, tva)
+            visitor2 = CNFVisitorA(propSymbolSet, tva)
+            assert visitor1.visit(tree) == visitor2.visit(tree)
+        assert visitor1.propSymbolUsage == [True, True, True, False]
+
+    def test_duplicate_symbols(self):
+        with pytest.raises(ValueError):
+            SymbolTable(['A', 'B', 'A'])
+
+    def test_lookup(self):
+        symbolTable = SymbolTable(propSymbolSet)
+        assert symbolTable.lookup('C') == 2
+        assert 'D' in symbolTable and 'Z' not in symbolTable
+        with pytest.raises(ValueError):
+            symbolTable.lookup('Z')
+
+    def test_visitor_unknown_symbol(self):
+        tree, _ = pu.parse_cnf('A & Z')
+        visitor = CNFVisitorA(propSymbolSet, ['A'])
+        with pytest.raises(ValueError):
+            visitor.visit(tree)
+
+    def test_truth_values(self):
+        symbolTable = SymbolTable(propSymbolSet)
+        assert symbolTable.truth_values(['D', 'A']) == [True, False, False, True]
+        assert symbolTable.true_indices(['D', 'A']) == frozenset([0, 3])
+        with pytest.raises(ValueError):
+            symbolTable.truth_values(('A',))
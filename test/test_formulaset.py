@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+@author: David Herron
+"""
+
+'''
+A pytest test module.
+
+This test module defines tests for the array-backed FormulaSet container.
+'''
+
+#%%
+
+# Specify whether you have installed the PLRE in your
+# Python environment. If you have not done so, don't
+# worry, we handle that case.
+use_installed_package = False
+
+
+#%%
+
+# NOTE:
+# If the PLRE is not installed, the code block below appends the parent
+# directory of the 'plre' package (folder) to sys.path so that the 'plre'
+# can be found when the import statements are processed. But the solution
+# only works if 'pytest' is invoked at the command line from within the
+# 'test' directory.
+#
+# Example:
+# $ cd test
+# $ pytest
+
+import os
+import sys
+
+if use_installed_package:
+    pass
+else:
+    plre_parent_dir = os.path.abspath('..')
+    if not os.path.exists(plre_parent_dir):
+        print('Error obtaining PLRE parent directory')
+    sys.path.append(plre_parent_dir)
+
+import pickle
+
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from plre.plre_batch import BatchEvaluator, assignment_matrix
+from plre.plre_compiler import CompiledFormula
+from plre.plre_formulaset import FormulaSet, FormulaView, csr_arrays
+
+from plre_test_helpers import compile_expressions
+
+
+#%%
+
+propSymbolSet = ['A', 'B', 'C', 'D']
+
+expressions = [
+    'A',
+    '(!A)',
+    '(A | B | !C)',
+    'A & (B | C) & !D',
+    '(A | B) & (C | !D)',
+    '(A | B | !C) & (!B | C | !D) & (!A | D)',
+]
+
+
+#%%
+
+class Test_FormulaSet:
+
+    def test_layout(self):
+        formulaSet = FormulaSet.from_expressions(propSymbolSet, ['A & (!B | C)', '(!D)'])
+        assert formulaSet.literals.dtype == np.int32
+        assert formulaSet.literals.tolist() == [1, -2, 3, -4]
+        assert formulaSet.clause_offsets.tolist() == [0, 1, 3, 4]
+        assert formulaSet.formula_offsets.tolist() == [0, 2, 3]
+        assert len(formulaSet) == 2
+        assert formulaSet.nr_clauses == 3
+
+    def test_views_match_compiled_formulas(self):
+        formulas = compile_expressions(propSymbolSet, expressions)
+        formulaSet = FormulaSet.from_formulas(propSymbolSet, formulas)
+        assert len(formulaSet) == len(formulas)
+        for view, formula in zip(formulaSet, formulas):
+            assert isinstance(view, FormulaView)
+            assert view.clauses == formula.clauses
+            assert len(view) == len(formula)
+            assert view.to_compiled() == formula
+        assert formulaSet[-1].clauses == formulas[-1].clauses
+        with pytest.raises(IndexError):
+            formulaSet[len(formulas)]
+
+    def test_view_has_no_dict(self):
+        formulas = compile_expressions(propSymbolSet, expressions)
+        view = FormulaSet.from_formulas(propSymbolSet, formulas)[0]
+        with pytest.raises(AttributeError):
+            view.extra = 1
+
+    def test_empty_formulas_and_clauses(self):
+        formulas = [CompiledFormula([]), CompiledFormula([[], [2]]), CompiledFormula([])]
+        formulaSet = FormulaSet.from_formulas(propSymbolSet, formulas)
+        assert [view.clauses for view in formulaSet] == [(), ((), (2,)), ()]
+
+    def test_empty_set(self):
+        formulaSet = FormulaSet.from_formulas(propSymbolSet, [])
+        assert len(formulaSet) == 0
+        assert list(formulaSet) == []
+
+    def test_from_file(self, tmp_path):
+        filepath = tmp_path / 'input.txt'
+        filepath.write_text('# comment\nA & B\n\n(!C | D)\n')
+        formulaSet = FormulaSet.from_file(filepath, propSymbolSet)
+        assert [view.clauses for view in formulaSet] == [((1,), (2,)), ((-3, 4),)]
+
+    def test_from_file_error_line_number(self, tmp_path):
+        filepath = tmp_path / 'input.txt'
+        filepath.write_text('A\n\n(A | Z)\n')
+        with pytest.raises(ValueError, match='^line 3: .*not recognised: Z'):
+            FormulaSet.from_file(filepath, propSymbolSet)
+
+    def test_inconsistent_arrays(self):
+        with pytest.raises(ValueError):
+            FormulaSet(propSymbolSet, [1, 2], [0, 1], [0, 1])
+        with pytest.raises(ValueError):
+            FormulaSet(propSymbolSet, [5], [0, 1], [0, 1])
+
+    def test_pickle_round_trip(self):
+        formulas = compile_expressions(propSymbolSet, expressions)
+        formulaSet = FormulaSet.from_formulas(propSymbolSet, formulas)
+        copy = pickle.loads(pickle.dumps(formulaSet))
+        assert [view.clauses for view in copy] == [view.clauses for view in formulaSet]
+
+    def test_csr_arrays_of_formula_set(self):
+        formulas = compile_expressions(propSymbolSet, expressions)
+        formulaSet = FormulaSet.from_formulas(propSymbolSet, formulas)
+        assert all(a is b for a, b in zip(csr_arrays(formulaSet),
+                                          (formulaSet.literals,
+                                           formulaSet.clause_offsets,
+                                           formulaSet.formula_offsets)))
+
+
+#%%
+
+class Test_BatchEvaluatorOverFormulaSet:
+
+    def test_agrees_with_formula_list(self):
+        formulas = compile_expressions(propSymbolSet, expressions)
+        formulaSet = FormulaSet.from_formulas(propSymbolSet, formulas)
+        X = assignment_matrix(propSymbolSet, [[], ['A'], ['A', 'C'], ['B', 'D']])
+        expected = BatchEvaluator(propSymbolSet, formulas).evaluate(X)
+        evaluator = BatchEvaluator(propSymbolSet, formulaSet)
+        assert evaluator.formulas is formulaSet
+        assert (evaluator.evaluate(X) == expected).all()
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+@author: David Herron
+"""
+
+'''
+A pytest test module.
+
+This test module defines tests for the fuzzy (t-norm) batch evaluator.
+'''
+
+#%%
+
+# Specify whether you have installed the PLRE in your
+# Python environment. If you have not done so, don't
+# worry, we handle that case.
+use_installed_package = False
+
+
+#%%
+
+# NOTE:
+# If the PLRE is not installed, the code block below appends the parent
+# directory of the 'plre' package (folder) to sys.path so that the 'plre'
+# can be found when the import statements are processed. But the solution
+# only works if 'pytest' is invoked at the command line from within the
+# 'test' directory.
+#
+# Example:
+# $ cd test
+# $ pytest
+
+import os
+import sys
+
+if use_installed_package:
+    pass
+else:
+    plre_parent_dir = os.path.abspath('..')
+    if not os.path.exists(plre_parent_dir):
+        print('Error obtaining PLRE parent directory')
+    sys.path.append(plre_parent_dir)
+
+import itertools
+
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from plre.plre_compiler import CNFCompiler, CompiledFormula
+from plre.plre_batch import BatchEvaluator, assignment_matrix
+from plre.plre_formulaset import FormulaSet
+from plre.plre_fuzzy import FuzzyEvaluator, SEMANTICS
+
+from plre_test_helpers import compile_expressions
+
+
+#%%
+
+propSymbolSet = ['A', 'B', 'C', 'D']
+
+expressions = [
+    'A',
+    '(!A)',
+    '(A | B | !C)',
+    'A & (B | C) & !D',
+    '(A | B) & (C | !D)',
+    '(A | B | !C) & (!B | C | !D) & (!A | D)',
+]
+
+truthValueAssignments = [list(combo)
+                         for r in range(len(propSymbolSet) + 1)
+                         for combo in itertools.combinations(propSymbolSet, r)]
+
+
+#%%
+
+class Test_FuzzyEvaluator:
+
+    @pytest.mark.parametrize('semantics', SEMANTICS)
+    def test_agrees_with_boolean_evaluation(self, semantics):
+        formulas = compile_expressions(propSymbolSet, expressions)
+        X = assignment_matrix(propSymbolSet, truthValueAssignments)
+        expected = BatchEvaluator(propSymbolSet, formulas).evaluate(X)
+        fuzzy = FuzzyEvaluator(propSymbolSet, formulas, semantics)
+        assert np.array_equal(fuzzy.evaluate(X.astype(float)), expected.astype(float))
+
+    def test_degrees(self):
+        compiler = CNFCompiler(propSymbolSet)
+        formula = compiler.compile_expression('(A | !B) & C')
+        P = np.array([[0.5, 0.5, 0.8, 0.0]])
+        # clause (A | !B): a = 0.5, 1 - b = 0.5
+        expected = {'godel': min(max(0.5, 0.5), 0.8),
+                    'product': (0.5 + 0.5 - 0.25) * 0.8,
+                    'lukasiewicz': max(0.0, min(1.0, 0.5 + 0.5) + 0.8 - 1)}
+        for semantics, value in expected.items():
+            fuzzy = FuzzyEvaluator(propSymbolSet, [formula], semantics)
+            assert fuzzy.evaluate(P)[0, 0] == pytest.approx(value)
+
+    @pytest.mark.parametrize('semantics', SEMANTICS)
+    def test_empty_clause_and_formula(self, semantics):
+        formulas = [CompiledFormula([]), CompiledFormula([[]]), CompiledFormula([[1], [-2, 3]])]
+        fuzzy = FuzzyEvaluator(propSymbolSet, formulas, semantics)
+        result = fuzzy.evaluate(np.full((2, 4), 0.5))
+        assert result.shape == (2, 3)
+        assert np.all(result[:, 0] == 1.0) and np.all(result[:, 1] == 0.0)
+
+    @pytest.mark.parametrize('semantics', SEMANTICS)
+    def test_mixed_clause_lengths(self, semantics):
+        # a reference evaluation, clause by clause, of clauses of very
+        # different lengths
+        rng = np.random.default_rng(0)
+        formulas = [CompiledFormula([[1, -2, 3, -4] * 10, [2]]),
+                    CompiledFormula([[-1], [], [3, 4]]),
+                    CompiledFormula([[4, -3]])]
+        P = rng.random((5, 4))
+        def conorm(degrees):
+            if semantics == 'godel':
+                return max(degrees, default=0.0)
+            if semantics == 'product':
+                return 1.0 - np.prod([1.0 - d for d in degrees])
+            return min(1.0, sum(degrees))
+        def norm(degrees):
+            if semantics == 'godel':
+                return min(degrees, default=1.0)
+            if semantics == 'product':
+                return np.prod(degrees)
+            return max(0.0, sum(degrees) - (len(degrees) - 1))
+        expected = [[norm([conorm([p[l - 1] if l > 0 else 1.0 - p[-l - 1] for l in clause])
+                           for clause in formula.clauses])
+                     for formula in formulas]
+                    for p in P]
+        for formulaSet in [formulas, FormulaSet.from_formulas(propSymbolSet, formulas)]:
+            fuzzy = FuzzyEvaluator(propSymbolSet, formulaSet, semantics)
+            assert fuzzy.evaluate(P) == pytest.approx(np.array(expected))
+
+    def test_invalid_input(self):
+        fuzzy = FuzzyEvaluator(propSymbolSet, compile_expressions(propSymbolSet, expressions))
+        with pytest.raises(ValueError):
+            fuzzy.evaluate(np.full((1, 4), 1.5))
+        with pytest.raises(ValueError):
+            fuzzy.evaluate(np.zeros((1, 3)))
+        with pytest.raises(ValueError):
+            FuzzyEvaluator(propSymbolSet, [], semantics='zadeh')
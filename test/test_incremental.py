@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+@author: David Herron
+"""
+
+'''
+A pytest test module.
+
+This test module defines tests for the incremental evaluator, verifying
+that its truth values, and the changes it reports, agree with evaluating
+every formula from scratch.
+'''
+
+#%%
+
+# Specify whether you have installed the PLRE in your
+# Python environment. If you have not done so, don't
+# worry, we handle that case.
+use_installed_package = False
+
+
+#%%
+
+# NOTE:
+# If the PLRE is not installed, the code block below appends the parent
+# directory of the 'plre' package (folder) to sys.path so that the 'plre'
+# can be found when the import statements are processed. But the solution
+# only works if 'pytest' is invoked at the command line from within the
+# 'test' directory.
+#
+# Example:
+# $ cd test
+# $ pytest
+
+import os
+import sys
+
+if use_installed_package:
+    pass
+else:
+    plre_parent_dir = os.path.abspath('..')
+    if not os.path.exists(plre_parent_dir):
+        print('Error obtaining PLRE parent directory')
+    sys.path.append(plre_parent_dir)
+
+import random
+
+from plre.plre_compiler import CNFCompiler, CompiledEvaluator, CompiledFormula
+from plre.plre_incremental import IncrementalEvaluator
+
+import pytest
+
+
+#%%
+
+propSymbolSet = ['A', 'B', 'C', 'D', 'E']
+
+expressions = [
+    'A',
+    '(A | B | !C)',
+    'A & (B | C) & !D',
+    '(A | B) & (C | !D)',
+    '(A | B | !C) & (!B | C | !D) & (!A | D)',
+    '(A | !A) & (E | E)',
+    '!E',
+]
+
+
+#%%
+
+class Test_IncrementalEvaluator:
+
+    def test_agrees_with_full_evaluation(self):
+        compiler = CNFCompiler(propSymbolSet)
+        formulas = [compiler.compile_expression(expr) for expr in expressions]
+        incremental = IncrementalEvaluator(propSymbolSet, formulas)
+        rng = random.Random(0)
+        previous = CompiledEvaluator(propSymbolSet, []).evaluate_all(formulas)
+        assert incremental.truth_values() == previous
+        for _ in range(300):
+            tva = [s for s in propSymbolSet if rng.random() < 0.5]
+            changed = incremental.update(tva)
+            current = CompiledEvaluator(propSymbolSet, tva).evaluate_all(formulas)
+            assert incremental.truth_values() == current
+            assert changed == [idx for idx in range(len(formulas))
+                               if current[idx] != previous[idx]]
+            assert incremental.truth_value_assignment() == tva
+            previous = current
+
+    def test_flip(self):
+        compiler = CNFCompiler(propSymbolSet)
+        formulas = [compiler.compile_expression(expr) for expr in ['A & B', 'C', '!C']]
+        incremental = IncrementalEvaluator(propSymbolSet, formulas, ['A'])
+        assert incremental.truth_values() == [False, False, True]
+        assert incremental.flip(['B', 'C']) == [0, 1, 2]
+        assert incremental.truth_values() == [True, True, False]
+        # flipping a symbol back and forth changes nothing
+        assert incremental.flip(['C', 'C']) == []
+
+    def test_empty_clause_and_formula(self):
+        formulas = [CompiledFormula([]), CompiledFormula([[]])]
+        incremental = IncrementalEvaluator(propSymbolSet, formulas)
+        assert incremental.truth_values() == [True, False]
+
+    def test_unknown_symbol(self):
+        incremental = IncrementalEvaluator(propSymbolSet, [])
+        with pytest.raises(ValueError):
+            incremental.flip(['Z'])
+        with pytest.raises(ValueError):
+            incremental.update(['Z'])
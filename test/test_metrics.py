@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+@author: David Herron
+"""
+
+'''
+A pytest test module.
+
+This test module defines tests for the opt-in performance instrumentation.
+'''
+
+#%%
+
+# Specify whether you have installed the PLRE in your
+# Python environment. If you have not done so, don't
+# worry, we handle that case.
+use_installed_package = False
+
+
+#%%
+
+# NOTE:
+# If the PLRE is not installed, the code block below appends the parent
+# directory of the 'plre' package (folder) to sys.path so that the 'plre'
+# can be found when the import statements are processed. But the solution
+# only works if 'pytest' is invoked at the command line from within the
+# 'test' directory.
+#
+# Example:
+# $ cd test
+# $ pytest
+
+import os
+import sys
+
+if use_installed_package:
+    pass
+else:
+    plre_parent_dir = os.path.abspath('..')
+    if not os.path.exists(plre_parent_dir):
+        print('Error obtaining PLRE parent directory')
+    sys.path.append(plre_parent_dir)
+
+import plre.plre_metrics as metrics
+import plre.plre_utils as pu
+from plre.CNFVisitorA import CNFVisitorA
+from plre.plre_cache import ParseCache
+from plre.plre_compiler import CNFCompiler, CompiledEvaluator
+
+import pytest
+
+
+#%%
+
+propSymbolSet = ['A', 'B', 'C', 'D']
+
+demo_file = os.path.join(plre_parent_dir, 'demo', 'demo1_cnf_expressions.txt')
+
+
+@pytest.fixture(autouse=True)
+def clean_metrics():
+    metrics.reset()
+    yield
+    metrics.disable()
+    metrics.set_callback(None)
+    metrics.reset()
+
+
+def fail_if_called(*args, **kwargs):
+    raise AssertionError('metrics recorded while disabled')
+
+
+#%%
+
+class Test_Metrics:
+
+    def test_disabled_by_default(self):
+        tree, _ = pu.parse_cnf('A & B')
+        CNFVisitorA(propSymbolSet, ['A']).visit(tree)
+        assert metrics.snapshot() == {'counters': {}, 'timings': {}}
+
+    def test_disabled_call_sites_do_no_work(self, monkeypatch):
+        # with instrumentation disabled, no call site records anything
+        monkeypatch.setattr(metrics, 'timer', fail_if_called)
+        monkeypatch.setattr(metrics, 'increment', fail_if_called)
+        assert pu.get_cnf_expressions(demo_file)
+        cache = ParseCache(propSymbolSet, maxsize=1)
+        cache.compile_all(['A', 'A', 'B'])
+        pu.parse_cnf('A & B')
+        formula = CNFCompiler(propSymbolSet).compile_expression('(A | B) & C')
+        assert not CompiledEvaluator(propSymbolSet, ['A']).evaluate(formula)
+
+    def test_disabled_batch_evaluation(self, monkeypatch):
+        np = pytest.importorskip('numpy')
+        from plre.plre_batch import BatchEvaluator
+        monkeypatch.setattr(metrics, 'timer', fail_if_called)
+        monkeypatch.setattr(metrics, 'increment', fail_if_called)
+        formula = CNFCompiler(propSymbolSet).compile_expression('(A | B) & C')
+        evaluator = BatchEvaluator(propSymbolSet, [formula])
+        X = np.zeros((2, 4), dtype=bool)
+        evaluator.evaluate(X)
+        evaluator.evaluate_with_violations(X)
+
+    def test_read_parse_and_visit(self):
+        metrics.enable()
+        expressions = pu.get_cnf_expressions(demo_file)
+        tree, _ = pu.parse_cnf('(A | B) & !C')
+        visitor = CNFVisitorA(propSymbolSet, ['A'])
+        assert visitor.visit(tree) == True
+        snapshot = metrics.snapshot()
+        counters = snapshot['counters']
+        assert counters['expressions_read'] == len(expressions)
+        assert counters['expressions_parsed'] == 1
+        assert counters['tokens_lexed'] == 8
+        assert counters['formulas_evaluated'] == 1
+        assert counters['clauses_evaluated'] == 2
+        # cnf + 2 clauses + 3 literals + 3 atoms
+        assert counters['nodes_visited'] == 9
+        for phase in ('read', 'parse', 'evaluate'):
+            timing = snapshot['timings'][phase]
+            assert timing['count'] == 1
+            assert sum(timing['buckets']) == 1
+            assert timing['min'] <= timing['mean'] <= timing['max']
+
+    def test_short_circuits(self):
+        metrics.enable()
+        tree, _ = pu.parse_cnf('A & (B | C) & D')
+        CNFVisitorA(propSymbolSet, [], shortCircuit=True).visit(tree)
+        formula = CNFCompiler(propSymbolSet).compile_expression('A & (B | C) & D')
+        CompiledEvaluator(propSymbolSet, []).evaluate(formula)
+        counters = metrics.snapshot()['counters']
+        assert counters['short_circuits'] == 2
+        assert counters['literals_evaluated'] == 1
+
+    def test_cache_counters(self):
+        metrics.enable()
+        cache = ParseCache(propSymbolSet, maxsize=1)
+        cache.compile_all(['A', 'A', 'B'])
+        counters = metrics.snapshot()['counters']
+        assert (counters['cache_hits'], counters['cache_misses'],
+                counters['cache_evictions']) == (1, 2, 1)
+
+    def test_export_callback(self):
+        exported = []
+        metrics.enable(callback=exported.append)
+        pu.parse_cnf('A')
+        snapshot = metrics.export()
+        assert exported == [snapshot]
+        metrics.disable()
+        pu.parse_cnf('A')
+        assert metrics.snapshot()['counters']['expressions_parsed'] == 1
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+@author: David Herron
+"""
+
+'''
+A pytest test module.
+
+This test module defines tests for parsing and compiling CNF expressions
+in parallel.
+'''
+
+#%%
+
+# Specify whether you have installed the PLRE in your
+# Python environment. If you have not done so, don't
+# worry, we handle that case.
+use_installed_package = False
+
+
+#%%
+
+# NOTE:
+# If the PLRE is not installed, the code block below appends the parent
+# directory of the 'plre' package (folder) to sys.path so that the 'plre'
+# can be found when the import statements are processed. But the solution
+# only works if 'pytest' is invoked at the command line from within the
+# 'test' directory.
+#
+# Example:
+# $ cd test
+# $ pytest
+
+import os
+import sys
+
+if use_installed_package:
+    pass
+else:
+    plre_parent_dir = os.path.abspath('..')
+    if not os.path.exists(plre_parent_dir):
+        print('Error obtaining PLRE parent directory')
+    sys.path.append(plre_parent_dir)
+
+from plre.plre_compiler import CNFCompiler
+from plre.plre_parallel import parse_many, load_file
+from plre.plre_parser import CNFSyntaxError, parse_clauses_checked
+
+import pytest
+
+
+#%%
+
+propSymbolSet = ['A', 'B', 'C', 'D']
+
+expressions = ['A', '(A | !B)', 'A &', '(C | D) & !A', 'A & Z', '1B'] * 5
+
+demo_file = os.path.join(plre_parent_dir, 'demo', 'demo1_cnf_expressions.txt')
+
+
+#%%
+
+class Test_ParseMany:
+
+    @pytest.mark.parametrize('max_workers', [1, 2])
+    def test_preserves_order_and_reports_errors(self, max_workers):
+        formulas, errors = parse_many(expressions, propSymbolSet,
+                                      max_workers=max_workers, chunksize=4)
+        compiler = CNFCompiler(propSymbolSet)
+        assert len(formulas) == len(expressions)
+        for idx, expression in enumerate(expressions):
+            if idx % 6 in (2, 4):
+                assert formulas[idx] is None
+            else:
+                assert formulas[idx] == compiler.compile_expression(expression)
+        assert [idx for idx, _ in errors] == [idx for idx in range(len(expressions))
+                                              if idx % 6 in (2, 4)]
+        assert 'not recognised: Z' in errors[1][1]
+
+    def test_load_file(self):
+        formulas, errors = load_file(demo_file, propSymbolSet, max_workers=2)
+        assert errors == []
+        assert len(formulas) == 17
+
+    def test_load_file_error_line_numbers(self, tmp_path):
+        filepath = tmp_path / 'input.txt'
+        filepath.write_text('# comment\nA\n\n(A & B)\n')
+        formulas, errors = load_file(filepath, propSymbolSet, max_workers=1)
+        assert formulas[1] is None
+        assert errors[0][0] == 1
+        assert errors[0][1].startswith('line 4: ')
+
+
+#%%
+
+class Test_ParseClausesChecked:
+
+    def test_collects_antlr_messages(self, capsys):
+        with pytest.raises(CNFSyntaxError) as excinfo:
+            parse_clauses_checked('(A & B)')
+        assert "line 1:3" in str(excinfo.value)
+        captured = capsys.readouterr()
+        assert captured.out == '' and captured.err == ''
+
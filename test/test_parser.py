@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+@author: David Herron
+"""
+
+'''
+A pytest test module.
+
+This test module defines tests for the hand-coded CNF parser, verifying
+that it accepts the same language as the CNF parser generated by ANTLR v4,
+and that it produces the same clauses.
+'''
+
+#%%
+
+# Specify whether you have installed the PLRE in your
+# Python environment. If you have not done so, don't
+# worry, we handle that case.
+use_installed_package = False
+
+
+#%%
+
+# NOTE:
+# If the PLRE is not installed, the code block below appends the parent
+# directory of the 'plre' package (folder) to sys.path so that the 'plre'
+# can be found when the import statements are processed. But the solution
+# only works if 'pytest' is invoked at the command line from within the
+# 'test' directory.
+#
+# Example:
+# $ cd test
+# $ pytest
+
+import os
+import sys
+
+if use_installed_package:
+    pass
+else:
+    plre_parent_dir = os.path.abspath('..')
+    if not os.path.exists(plre_parent_dir):
+        print('Error obtaining PLRE parent directory')
+    sys.path.append(plre_parent_dir)
+
+import random
+
+import plre.plre_utils as pu
+import plre.plre_parser as pp
+
+import pytest
+
+
+#%%
+
+positive_examples = [
+    'A',
+    '(!A)',
+    'NOT A',
+    '~A',
+    '(A | B | !C)',
+    '(A OR B OR NOT C)',
+    'A AND B',
+    'A & (B | C) & !D',
+    '(A | !B | C) & \n(D | !E) &\n(!F | G)',
+    '(ANDY | ORB) & NOTE',
+    'x_1 & Y2',
+    'A ',
+    'A\n',
+    ' (A | B) & C  ',
+    '(A | B) &\tC\r\n',
+]
+
+negative_examples = [
+    '',
+    '(A & B)',
+    '(A & B | C)',
+    '(A | B) | C',
+    'A | B',
+    '(A|B) & (C D)',
+    'A &',
+    'A & (',
+    'A & )',
+    'A !& B',
+    '!!A',
+    '()',
+    '(A |)',
+    'NOT',
+    'A & AND',
+]
+
+
+#%%
+
+class Test_HandCodedParser:
+
+    @pytest.mark.parametrize('expression', positive_examples)
+    def test_positive_examples(self, expression):
+        clauses = pp.parse_clauses(expression)
+        tree, _ = pu.parse_cnf(expression)
+        assert clauses == pp.cnf_tree_to_clauses(tree)
+
+    @pytest.mark.parametrize('expression', negative_examples)
+    def test_negative_examples(self, expression):
+        with pytest.raises(pp.CNFSyntaxError):
+            pp.parse_clauses(expression)
+        assert pp.parse_cnf_fast(expression) is None
+
+    def test_token_recognition_error_defers_to_antlr(self):
+        # the ANTLR lexer reports and skips unrecognised characters, so
+        # the ANTLR parser (which has the final say) accepts this expression
+        expression = '1A'
+        with pytest.raises(pp.CNFSyntaxError):
+            pp.parse_clauses(expression)
+        assert pp.parse_cnf_fast(expression) == [[('A', False)]]
+
+    def test_clause_structure(self):
+        clauses = pp.parse_clauses('(A | NOT B) AND ~C')
+        assert clauses == [[('A', False), ('B', True)], [('C', True)]]
+
+    def test_agrees_with_antlr_on_random_token_strings(self):
+        rng = random.Random(0)
+        alphabet = ['A', 'B', 'NOT', '!', '&', 'AND', '|', 'OR', '(', ')']
+        for _ in range(500):
+            expression = ' '.join(rng.choice(alphabet)
+                                  for _ in range(rng.randint(1, 8)))
+            tree, parser = pu.parse_cnf(expression)
+            antlr_ok = parser.getNumberOfSyntaxErrors() == 0
+            try:
+                clauses = pp.parse_clauses(expression)
+                fast_ok = True
+            except pp.CNFSyntaxError:
+                fast_ok = False
+            assert fast_ok == antlr_ok, expression
+            if fast_ok:
+                assert clauses == pp.cnf_tree_to_clauses(tree)
+
@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+@author: David Herron
+"""
+
+'''
+A pytest test module.
+
+This test module defines tests for the CDCL SAT solver, verifying its
+models and comparing its decisions with exhaustive search.
+'''
+
+#%%
+
+# Specify whether you have installed the PLRE in your
+# Python environment. If you have not done so, don't
+# worry, we handle that case.
+use_installed_package = False
+
+
+#%%
+
+# NOTE:
+# If the PLRE is not installed, the code block below appends the parent
+# directory of the 'plre' package (folder) to sys.path so that the 'plre'
+# can be found when the import statements are processed. But the solution
+# only works if 'pytest' is invoked at the command line from within the
+# 'test' directory.
+#
+# Example:
+# $ cd test
+# $ pytest
+
+import os
+import sys
+
+if use_installed_package:
+    pass
+else:
+    plre_parent_dir = os.path.abspath('..')
+    if not os.path.exists(plre_parent_dir):
+        print('Error obtaining PLRE parent directory')
+    sys.path.append(plre_parent_dir)
+
+import itertools
+import random
+import time
+
+import pytest
+
+from plre.plre_compiler import CNFCompiler, CompiledEvaluator, CompiledFormula
+from plre.plre_formulaset import FormulaSet
+from plre.plre_sat import CDCLSolver, _luby, find_model, is_satisfiable
+
+
+#%%
+
+propSymbolSet = ['A', 'B', 'C', 'D', 'E']
+
+
+def brute_force_satisfiable(nr_vars, clauses):
+    for values in itertools.product((False, True), repeat=nr_vars):
+        if all(any(values[abs(l) - 1] == (l > 0) for l in clause) for clause in clauses):
+            return True
+    return False
+
+
+def random_clauses(rng, nr_vars, nr_clauses, max_length=3):
+    clauses = []
+    for _ in range(nr_clauses):
+        variables = rng.sample(range(1, nr_vars + 1), rng.randint(1, min(max_length, nr_vars)))
+        clauses.append([v if rng.random() < 0.5 else -v for v in variables])
+    return clauses
+
+
+def pigeonhole(nr_holes):
+    # nr_holes + 1 pigeons, each in some hole, no two in the same hole
+    def var(pigeon, hole):
+        return pigeon * nr_holes + hole + 1
+    clauses = [[var(p, h) for h in range(nr_holes)] for p in range(nr_holes + 1)]
+    for h in range(nr_holes):
+        for p, q in itertools.combinations(range(nr_holes + 1), 2):
+            clauses.append([-var(p, h), -var(q, h)])
+    return clauses
+
+
+def check_model(clauses, model):
+    return all(any(model[abs(l) - 1] == (l > 0) for l in clause) for clause in clauses)
+
+
+#%%
+
+class Test_CDCLSolver():
+
+    def test_luby(self):
+        assert [_luby(i) for i in range(15)] == [1, 1, 2, 1, 1, 2, 4, 1, 1, 2, 1, 1, 2, 4, 8]
+
+    def test_trivial(self):
+        solver = CDCLSolver()
+        assert solver.solve() is True
+        assert solver.model() == []
+
+        solver = CDCLSolver(2)
+        solver.add_clause([1, -2])
+        solver.add_clause([2])
+        assert solver.solve() is True
+        assert solver.model() == [True, True]
+
+    def test_contradictions(self):
+        solver = CDCLSolver()
+        assert solver.add_clause([]) is False
+        assert solver.solve() is False
+
+        solver = CDCLSolver()
+        solver.add_clause([1])
+        assert solver.add_clause([-1]) is False
+        assert solver.solve() is False
+
+    def test_invalid_literal(self):
+        with pytest.raises(ValueError):
+            CDCLSolver().add_clause([1, 0])
+
+    def test_random_against_brute_force(self):
+        rng = random.Random(7)
+        for trial in range(300):
+            nr_vars = rng.randint(1, 10)
+            clauses = random_clauses(rng, nr_vars, rng.randint(1, 45))
+            # (frequent restarts exercise the level-0 simplification)
+            solver = CDCLSolver(nr_vars, restart_base=rng.choice((1, 100)))
+            for clause in clauses:
+                solver.add_clause(clause)
+            status = solver.solve()
+            assert status == brute_force_satisfiable(nr_vars, clauses)
+            if status:
+                assert check_model(clauses, solver.model())
+
+    def test_incremental(self):
+        solver = CDCLSolver(3)
+        solver.add_clause([1, 2, 3])
+        assert solver.solve() is True
+        solver.add_clause([-1])
+        solver.add_clause([-2])
+        assert solver.solve() is True
+        assert solver.model() == [False, False, True]
+        solver.add_clause([-3])
+        assert solver.solve() is False
+
+    def test_pigeonhole(self):
+        solver = CDCLSolver()
+        for clause in pigeonhole(6):
+            solver.add_clause(clause)
+        assert solver.solve() is False
+        assert solver.stats['conflicts'] > 0
+        assert solver.stats['learnt_clauses'] > 0
+
+    def test_max_conflicts(self):
+        solver = CDCLSolver()
+        for clause in pigeonhole(8):
+            solver.add_clause(clause)
+        assert solver.solve(max_conflicts=10) is None
+        assert solver.model() is None
+
+    def test_large_instance(self):
+        # a random 3-SAT instance of thousands of variables and tens of
+        # thousands of clauses, well below the satisfiability threshold
+        rng = random.Random(3)
+        nr_vars = 6000
+        clauses = [[v if rng.random() < 0.5 else -v
+                    for v in rng.sample(range(1, nr_vars + 1), 3)]
+                   for _ in range(18000)]
+        solver = CDCLSolver(nr_vars)
+        for clause in clauses:
+            solver.add_clause(clause)
+        start = time.perf_counter()
+        assert solver.solve() is True
+        assert time.perf_counter() - start < 30
+        assert check_model(clauses, solver.model())
+
+
+#%%
+
+class Test_FindModel():
+
+    def test_satisfiable(self):
+        compiler = CNFCompiler(propSymbolSet)
+        formulas = [compiler.compile_expression(expr) for expr in
+                    ['(A | B)', '(!A | C)', '(!B | !C) & (D | !E)', '!D']]
+        model = find_model(propSymbolSet, formulas)
+        assert model is not None
+        evaluator = CompiledEvaluator(propSymbolSet, model)
+        assert evaluator.all_satisfied(formulas)
+        assert is_satisfiable(propSymbolSet, formulas)
+
+    def test_unsatisfiable(self):
+        compiler = CNFCompiler(propSymbolSet)
+        formulas = [compiler.compile_expression(expr) for expr in
+                    ['(A | B)', '!A', '(!B | C)', '!C & D']]
+        assert find_model(propSymbolSet, formulas) is None
+        assert not is_satisfiable(propSymbolSet, formulas)
+
+    def test_empty_clause(self):
+        assert find_model(propSymbolSet, [CompiledFormula([()])]) is None
+        assert find_model(propSymbolSet, [CompiledFormula([])]) == []
+
+    def test_formula_set(self):
+        formulaSet = FormulaSet.from_expressions(propSymbolSet,
+                                                 ['A & !B', '(B | C)', '(!C | D | E)'])
+        model = find_model(propSymbolSet, formulaSet)
+        assert 'A' in model and 'B' not in model and 'C' in model
+        assert 'D' in model or 'E' in model
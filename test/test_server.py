@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+@author: David Herron
+"""
+
+'''
+A pytest test module.
+
+This test module defines tests for the PLRE evaluation server and its
+client.
+'''
+
+#%%
+
+# Specify whether you have installed the PLRE in your
+# Python environment. If you have not done so, don't
+# worry, we handle that case.
+use_installed_package = False
+
+
+#%%
+
+# NOTE:
+# If the PLRE is not installed, the code block below appends the parent
+# directory of the 'plre' package (folder) to sys.path so that the 'plre'
+# can be found when the import statements are processed. But the solution
+# only works if 'pytest' is invoked at the command line from within the
+# 'test' directory.
+#
+# Example:
+# $ cd test
+# $ pytest
+
+import os
+import sys
+
+if use_installed_package:
+    pass
+else:
+    plre_parent_dir = os.path.abspath('..')
+    if not os.path.exists(plre_parent_dir):
+        print('Error obtaining PLRE parent directory')
+    sys.path.append(plre_parent_dir)
+
+import threading
+import time
+
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from plre.plre_batch import BatchEvaluator, assignment_matrix
+from plre.plre_client import PLREClient
+from plre.plre_server import PLREServer
+
+from plre_test_helpers import compile_expressions
+
+
+#%%
+
+propSymbolSet = ['A', 'B', 'C', 'D']
+
+expressions = [
+    'A',
+    '(A | B | !C)',
+    'A & (B | C) & !D',
+    '(A | B) & (C | !D)',
+]
+
+truthValueAssignments = [[], ['A'], ['A', 'B'], ['C', 'D'], ['A', 'B', 'C', 'D']]
+
+
+@pytest.fixture
+def server():
+    server = PLREServer(max_delay=0.05)
+    formulas = compile_expressions(propSymbolSet, expressions)
+    server.add_formula_set('demo', propSymbolSet, formulas)
+    with server:
+        yield server
+
+
+@pytest.fixture
+def client(server):
+    host, port = server.address
+    with PLREClient(host, port, timeout=10) as client:
+        yield client
+
+
+#%%
+
+class Test_Server:
+
+    def test_formula_sets(self, client):
+        assert client.formula_sets() == {'demo': {'nr_formulas': 4, 'nr_symbols': 4}}
+
+    def test_evaluate(self, client):
+        formulas = compile_expressions(propSymbolSet, expressions)
+        expected = BatchEvaluator(propSymbolSet, formulas).evaluate(
+            assignment_matrix(propSymbolSet, truthValueAssignments)).tolist()
+        assert client.evaluate_batch('demo', truthValueAssignments) == expected
+        for tva, row in zip(truthValueAssignments, expected):
+            assert client.evaluate('demo', tva) == row
+
+    def test_sequential_request_latency(self, client):
+        # successive requests on one connection are neither held back by
+        # Nagle's algorithm and delayed ACKs (about 40 ms per request),
+        # nor by waiting max_delay (50 ms) for other requests to coalesce
+        client.evaluate('demo', ['A'])
+        nr_requests = 20
+        start = time.perf_counter()
+        for _ in range(nr_requests):
+            client.evaluate('demo', ['A'])
+        assert (time.perf_counter() - start) / nr_requests < 0.01
+
+    def test_errors(self, client):
+        with pytest.raises(ValueError, match='unknown formula set'):
+            client.evaluate('other', ['A'])
+        with pytest.raises(ValueError, match='not in propSymbolSet: Z'):
+            client.evaluate('demo', ['A', 'Z'])
+        # the connection remains usable
+        assert client.evaluate('demo', ['A']) == [True, True, False, True]
+
+    def test_concurrent_requests_are_coalesced(self, server):
+        host, port = server.address
+        nr_clients = 8
+        results = [None] * nr_clients
+        barrier = threading.Barrier(nr_clients)
+
+        def request(idx):
+            with PLREClient(host, port, timeout=10) as client:
+                barrier.wait()
+                results[idx] = client.evaluate('demo', ['A'] if idx % 2 else ['C'])
+
+        threads = [threading.Thread(target=request, args=(idx,)) for idx in range(nr_clients)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        for idx, result in enumerate(results):
+            assert result == ([True, True, False, True] if idx % 2 else
+                              [False, False, False, False])
+        stats = server.stats
+        assert stats['requests'] == nr_clients
+        assert stats['assignments'] == nr_clients
+        assert stats['batches'] < nr_clients
+
+    def test_load_formula_set(self, tmp_path):
+        filepath = tmp_path / 'constraints.txt'
+        filepath.write_text('A & B\n\n(!C | D)\n')
+        server = PLREServer()
+        server.load_formula_set('file', filepath, propSymbolSet)
+        with server:
+            host, port = server.address
+            with PLREClient(host, port, timeout=10) as client:
+                assert client.evaluate('file', ['A', 'B', 'C']) == [True, False]
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+@author: David Herron
+"""
+
+'''
+A pytest test module.
+
+This test module defines tests for the multi-core batch evaluator,
+verifying that it computes the same truth values as BatchEvaluator.
+'''
+
+#%%
+
+# Specify whether you have installed the PLRE in your
+# Python environment. If you have not done so, don't
+# worry, we handle that case.
+use_installed_package = False
+
+
+#%%
+
+# NOTE:
+# If the PLRE is not installed, the code block below appends the parent
+# directory of the 'plre' package (folder) to sys.path so that the 'plre'
+# can be found when the import statements are processed. But the solution
+# only works if 'pytest' is invoked at the command line from within the
+# 'test' directory.
+#
+# Example:
+# $ cd test
+# $ pytest
+
+import os
+import sys
+
+if use_installed_package:
+    pass
+else:
+    plre_parent_dir = os.path.abspath('..')
+    if not os.path.exists(plre_parent_dir):
+        print('Error obtaining PLRE parent directory')
+    sys.path.append(plre_parent_dir)
+
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from plre.plre_batch import BatchEvaluator
+from plre.plre_formulaset import FormulaSet
+from plre.plre_sharedmem import SharedMemoryBatchEvaluator
+
+from plre_test_helpers import compile_expressions
+
+
+#%%
+
+propSymbolSet = ['A', 'B', 'C', 'D', 'E']
+
+expressions = [
+    'A',
+    '(A | B | !C)',
+    'A & (B | C) & !D',
+    '(A | B) & (C | !D) & (!E | D)',
+    '(!A | !B) & (!A | !C) & (!B | !C)',
+]
+
+
+def random_assignments(nr_rows, seed=0):
+    return np.random.default_rng(seed).random((nr_rows, len(propSymbolSet))) < 0.5
+
+
+#%%
+
+class Test_SharedMemoryBatchEvaluator:
+
+    def test_agrees_with_batch_evaluator(self):
+        formulas = compile_expressions(propSymbolSet, expressions)
+        expected_evaluator = BatchEvaluator(propSymbolSet, formulas)
+        with SharedMemoryBatchEvaluator(propSymbolSet, formulas, max_workers=2,
+                                        min_parallel_rows=1) as evaluator:
+            for nr_rows in [1, 7, 500, 60]:
+                X = random_assignments(nr_rows, seed=nr_rows)
+                assert (evaluator.evaluate(X) == expected_evaluator.evaluate(X)).all()
+
+    def test_assignment_buffer(self):
+        formulas = compile_expressions(propSymbolSet, expressions)
+        formulaSet = FormulaSet.from_formulas(propSymbolSet, formulas)
+        X = random_assignments(100)
+        expected = BatchEvaluator(propSymbolSet, formulaSet).evaluate(X)
+        with SharedMemoryBatchEvaluator(propSymbolSet, formulaSet, max_workers=2,
+                                        min_parallel_rows=1) as evaluator:
+            buffer = evaluator.assignment_buffer(len(X))
+            buffer[...] = X
+            assert (evaluator.evaluate(buffer) == expected).all()
+
+    def test_small_batches_evaluated_locally(self):
+        formulas = compile_expressions(propSymbolSet, expressions)
+        X = random_assignments(10)
+        with SharedMemoryBatchEvaluator(propSymbolSet, formulas, max_workers=2) as evaluator:
+            assert (evaluator.evaluate(X) ==
+                    BatchEvaluator(propSymbolSet, formulas).evaluate(X)).all()
+            assert evaluator._blocks['assignments'] is None
+
+    def test_wrong_shape(self):
+        formulas = compile_expressions(propSymbolSet, expressions)
+        with SharedMemoryBatchEvaluator(propSymbolSet, formulas,
+                                        max_workers=2) as evaluator:
+            with pytest.raises(ValueError):
+                evaluator.evaluate(np.zeros((2, 3), dtype=bool))
+
+    def test_close_is_idempotent(self):
+        formulas = compile_expressions(propSymbolSet, expressions)
+        evaluator = SharedMemoryBatchEvaluator(propSymbolSet, formulas,
+                                               max_workers=2, min_parallel_rows=1)
+        evaluator.evaluate(random_assignments(20))
+        evaluator.close()
+        evaluator.close()
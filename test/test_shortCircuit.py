@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+@author: David Herron
+"""
+
+'''
+A pytest test module.
+
+This test module defines tests for short-circuit evaluation by CNFVisitorA
+and for adaptive (profile-guided) clause and literal ordering.
+'''
+
+#%%
+
+# Specify whether you have installed the PLRE in your
+# Python environment. If you have not done so, don't
+# worry, we handle that case.
+use_installed_package = False
+
+
+#%%
+
+# NOTE:
+# If the PLRE is not installed, the code block below appends the parent
+# directory of the 'plre' package (folder) to sys.path so that the 'plre'
+# can be found when the import statements are processed. But the solution
+# only works if 'pytest' is invoked at the command line from within the
+# 'test' directory.
+#
+# Example:
+# $ cd test
+# $ pytest
+
+import os
+import sys
+
+if use_installed_package:
+    pass
+else:
+    plre_parent_dir = os.path.abspath('..')
+    if not os.path.exists(plre_parent_dir):
+        print('Error obtaining PLRE parent directory')
+    sys.path.append(plre_parent_dir)
+
+import itertools
+import random
+
+import plre.plre_utils as pu
+from plre.CNFVisitorA import CNFVisitorA
+from plre.plre_compiler import CNFCompiler, CompiledEvaluator
+from plre.plre_adaptive import AdaptiveEvaluator
+
+import pytest
+
+
+#%%
+
+propSymbolSet = ['A', 'B', 'C', 'D']
+
+expressions = [
+    'A',
+    '(A | B | !C)',
+    'A & (B | C) & !D',
+    '(A | B) & (C | !D)',
+    '(A | B | !C) & (!B | C | !D) & (!A | D)',
+]
+
+truthValueAssignments = [list(combo)
+                         for r in range(len(propSymbolSet) + 1)
+                         for combo in itertools.combinations(propSymbolSet, r)]
+
+
+#%%
+
+class Test_ShortCircuitVisitor:
+
+    @pytest.mark.parametrize('expression', expressions)
+    def test_agrees_with_full_evaluation(self, expression):
+        tree, _ = pu.parse_cnf(expression)
+        for tva in truthValueAssignments:
+            visitor1 = CNFVisitorA(propSymbolSet, tva)
+            visitor2 = CNFVisitorA(propSymbolSet, tva, shortCircuit=True)
+            assert visitor1.visit(tree) == visitor2.visit(tree)
+
+    def test_skips_remaining_clauses(self):
+        tree, _ = pu.parse_cnf('A & (B | C) & D')
+        visitor = CNFVisitorA(propSymbolSet, [], shortCircuit=True)
+        assert visitor.visit(tree) == False
+        assert visitor.propSymbolUsage == [True, False, False, False]
+
+    def test_skips_remaining_literals(self):
+        tree, _ = pu.parse_cnf('(A | B | C)')
+        visitor = CNFVisitorA(propSymbolSet, ['A'], shortCircuit=True)
+        assert visitor.visit(tree) == True
+        assert visitor.propSymbolUsage == [True, False, False, False]
+
+
+#%%
+
+class Test_AdaptiveEvaluator:
+
+    def test_agrees_with_compiled_evaluator(self):
+        compiler = CNFCompiler(propSymbolSet)
+        formulas = [compiler.compile_expression(expr) for expr in expressions]
+        adaptive = AdaptiveEvaluator(propSymbolSet, formulas,
+                                     sample_interval=2, reorder_interval=3)
+        rng = random.Random(0)
+        for _ in range(200):
+            tva = rng.choice(truthValueAssignments)
+            evaluator = CompiledEvaluator(propSymbolSet, tva)
+            assert adaptive.evaluate_all(tva) == evaluator.evaluate_all(formulas)
+        assert adaptive.nr_samples == 100
+
+    def test_reorders_by_profile(self):
+        compiler = CNFCompiler(propSymbolSet)
+        formula = compiler.compile_expression('(A | B) & (C | D) & !D')
+        adaptive = AdaptiveEvaluator(propSymbolSet, [formula],
+                                     sample_interval=1, reorder_interval=4)
+        # D is always True, so !D is always False; B is always True
+        for _ in range(4):
+            adaptive.evaluate_all(['B', 'D'])
+        plan = adaptive.ordered_clauses(0)
+        assert plan[0] == (-4,)
+        assert (2, 1) in plan
+
+    def test_reset_profile(self):
+        compiler = CNFCompiler(propSymbolSet)
+        formula = compiler.compile_expression('(A | B) & !D')
+        adaptive = AdaptiveEvaluator(propSymbolSet, [formula],
+                                     sample_interval=1, reorder_interval=1)
+        adaptive.evaluate_all(['B', 'D'])
+        assert adaptive.ordered_clauses(0) != formula.clauses
+        adaptive.reset_profile()
+        assert adaptive.ordered_clauses(0) == formula.clauses
+
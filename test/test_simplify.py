@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+@author: David Herron
+"""
+
+'''
+A pytest test module.
+
+This test module defines tests for the simplification pass over compiled
+CNF expressions, verifying that simplified formulas have the same truth
+values as the original formulas under every truth-value assignment.
+'''
+
+#%%
+
+# Specify whether you have installed the PLRE in your
+# Python environment. If you have not done so, don't
+# worry, we handle that case.
+use_installed_package = False
+
+
+#%%
+
+# NOTE:
+# If the PLRE is not installed, the code block below appends the parent
+# directory of the 'plre' package (folder) to sys.path so that the 'plre'
+# can be found when the import statements are processed. But the solution
+# only works if 'pytest' is invoked at the command line from within the
+# 'test' directory.
+#
+# Example:
+# $ cd test
+# $ pytest
+
+import os
+import sys
+
+if use_installed_package:
+    pass
+else:
+    plre_parent_dir = os.path.abspath('..')
+    if not os.path.exists(plre_parent_dir):
+        print('Error obtaining PLRE parent directory')
+    sys.path.append(plre_parent_dir)
+
+import itertools
+import random
+
+import pytest
+
+from plre.plre_compiler import CNFCompiler, CompiledEvaluator, CompiledFormula
+from plre.plre_simplify import REPORT_KEYS, simplify_formula, simplify_formulas
+
+
+#%%
+
+propSymbolSet = ['A', 'B', 'C', 'D']
+
+truthValueAssignments = [list(combo)
+                         for r in range(len(propSymbolSet) + 1)
+                         for combo in itertools.combinations(propSymbolSet, r)]
+
+
+def simplify(expression_text):
+    formula = CNFCompiler(propSymbolSet).compile_expression(expression_text)
+    report = dict.fromkeys(REPORT_KEYS, 0)
+    return simplify_formula(formula, report).clauses, report
+
+
+def truth_values(formula):
+    evaluator = CompiledEvaluator(propSymbolSet, [])
+    values = []
+    for tva in truthValueAssignments:
+        evaluator.set_assignment(tva)
+        values.append(evaluator.evaluate(formula))
+    return values
+
+
+#%%
+
+class Test_SimplifyFormula:
+
+    def test_duplicate_literals(self):
+        clauses, report = simplify('(A | A | B | !C | !C)')
+        assert clauses == ((1, 2, -3),)
+        assert report['duplicate_literals'] == 2
+
+    def test_tautology(self):
+        clauses, report = simplify('(A | !A | B) & (C | D)')
+        assert clauses == ((3, 4),)
+        assert report['tautologies'] == 1
+
+    def test_all_tautologies_is_true(self):
+        clauses, _ = simplify('(A | !A) & (!B | B)')
+        assert clauses == ()
+
+    def test_duplicate_clauses(self):
+        clauses, report = simplify('(A | B) & (C | D) & (B | A)')
+        assert clauses == ((1, 2), (3, 4))
+        assert report['duplicate_clauses'] == 1
+
+    def test_subsumption(self):
+        clauses, report = simplify('(A | B | C) & (B | C | D) & (A | B)')
+        assert clauses == ((2, 3, 4), (1, 2))
+        assert report['subsumed_clauses'] == 1
+
+    def test_unit_propagation(self):
+        clauses, report = simplify('A & (!A | B) & (A | C) & (!B | C | D)')
+        assert clauses == ((1,), (2,), (3, 4))
+        assert report['propagated_literals'] == 2
+        assert report['subsumed_clauses'] == 1
+
+    def test_contradiction_is_false(self):
+        clauses, _ = simplify('A & (B | C) & (!A | D) & !D')
+        assert clauses == ((),)
+
+    def test_empty_clause_is_false(self):
+        formula = CompiledFormula([(1, 2), (), (3,)])
+        assert simplify_formula(formula).clauses == ((),)
+
+    def test_retains_text(self):
+        formula = CNFCompiler(propSymbolSet).compile_expression('(A | A)')
+        assert simplify_formula(formula).text == '(A | A)'
+
+    def test_preserves_truth_values(self):
+        rng = random.Random(0)
+        literals = [1, 2, 3, 4, -1, -2, -3, -4]
+        for _ in range(300):
+            clauses = [[rng.choice(literals) for _ in range(rng.randint(1, 4))]
+                       for _ in range(rng.randint(0, 6))]
+            formula = CompiledFormula(clauses)
+            simplified = simplify_formula(formula)
+            assert truth_values(simplified) == truth_values(formula), clauses
+
+
+#%%
+
+class Test_SimplifyFormulas:
+
+    def test_report_totals(self):
+        compiler = CNFCompiler(propSymbolSet)
+        formulas = [compiler.compile_expression(expr)
+                    for expr in ['(A | A)', '(A | B)', '(B | !B) & C']]
+        simplified, report = simplify_formulas(formulas)
+        assert [formula.clauses for formula in simplified] == [((1,),), ((1, 2),), ((3,),)]
+        assert report == {'duplicate_literals': 1, 'tautologies': 1,
+                          'duplicate_clauses': 0, 'subsumed_clauses': 0,
+                          'propagated_literals': 0, 'formulas_simplified': 2}
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+@author: David Herron
+"""
+
+'''
+A pytest test module.
+
+This test module defines tests for the sparse batch evaluator, verifying
+that it computes the same truth values as BatchEvaluator.
+'''
+
+#%%
+
+# Specify whether you have installed the PLRE in your
+# Python environment. If you have not done so, don't
+# worry, we handle that case.
+use_installed_package = False
+
+
+#%%
+
+# NOTE:
+# If the PLRE is not installed, the code block below appends the parent
+# directory of the 'plre' package (folder) to sys.path so that the 'plre'
+# can be found when the import statements are processed. But the solution
+# only works if 'pytest' is invoked at the command line from within the
+# 'test' directory.
+#
+# Example:
+# $ cd test
+# $ pytest
+
+import os
+import sys
+
+if use_installed_package:
+    pass
+else:
+    plre_parent_dir = os.path.abspath('..')
+    if not os.path.exists(plre_parent_dir):
+        print('Error obtaining PLRE parent directory')
+    sys.path.append(plre_parent_dir)
+
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from plre.plre_batch import BatchEvaluator, assignment_matrix
+from plre.plre_compiler import CompiledFormula
+from plre.plre_formulaset import FormulaSet
+from plre.plre_sparse import SparseBatchEvaluator, sparse_assignments
+
+from plre_test_helpers import compile_expressions
+
+
+#%%
+
+propSymbolSet = ['A', 'B', 'C', 'D', 'E']
+
+expressions = [
+    'A',
+    '(!A)',
+    '(A | B | !C)',
+    'A & (B | C) & !D',
+    '(A | B) & (C | !D) & (!E | D)',
+    '(A | !A) & (B | B)',
+    '(!A | !B) & (!A | !C) & (!B | !C)',
+]
+
+
+def to_csr(X):
+    indices = np.concatenate([np.flatnonzero(row) for row in X] + [np.zeros(0, dtype=np.intp)])
+    indptr = np.concatenate([[0], np.cumsum(X.sum(axis=1))])
+    return indices, indptr
+
+
+#%%
+
+class Test_SparseBatchEvaluator:
+
+    def test_agrees_with_batch_evaluator(self):
+        formulas = compile_expressions(propSymbolSet, expressions)
+        X = np.random.default_rng(0).random((300, len(propSymbolSet))) < 0.3
+        expected = BatchEvaluator(propSymbolSet, formulas).evaluate(X)
+        evaluator = SparseBatchEvaluator(propSymbolSet, formulas)
+        assert (evaluator.evaluate(*to_csr(X)) == expected).all()
+
+    def test_formula_set(self):
+        formulas = compile_expressions(propSymbolSet, expressions)
+        formulaSet = FormulaSet.from_formulas(propSymbolSet, formulas)
+        tvas = [[], ['A'], ['B', 'D'], ['A', 'B', 'C', 'D', 'E']]
+        expected = BatchEvaluator(propSymbolSet, formulaSet).evaluate(
+            assignment_matrix(propSymbolSet, tvas))
+        evaluator = SparseBatchEvaluator(propSymbolSet, formulaSet)
+        assert (evaluator.evaluate(*sparse_assignments(propSymbolSet, tvas)) == expected).all()
+
+    def test_duplicate_indices(self):
+        evaluator = SparseBatchEvaluator(propSymbolSet, [CompiledFormula([[-1, 2]])])
+        assert evaluator.evaluate([0, 0, 1], [0, 3]).tolist() == [[True]]
+        assert evaluator.evaluate([0, 0], [0, 2]).tolist() == [[False]]
+
+    def test_empty_formulas_and_clauses(self):
+        formulas = [CompiledFormula([]), CompiledFormula([()]), CompiledFormula([(), (1,)])]
+        evaluator = SparseBatchEvaluator(propSymbolSet, formulas)
+        assert evaluator.evaluate([0], [0, 0, 1]).tolist() == [[True, False, False],
+                                                               [True, False, False]]
+
+    def test_empty_batch(self):
+        formulas = compile_expressions(propSymbolSet, expressions)
+        evaluator = SparseBatchEvaluator(propSymbolSet, formulas)
+        assert evaluator.evaluate([], [0]).shape == (0, len(expressions))
+
+    def test_invalid_arrays(self):
+        formulas = compile_expressions(propSymbolSet, expressions)
+        evaluator = SparseBatchEvaluator(propSymbolSet, formulas)
+        with pytest.raises(ValueError):
+            evaluator.evaluate([0, 1], [0, 1])
+        with pytest.raises(ValueError):
+            evaluator.evaluate([5], [0, 1])
+
+    def test_sparse_assignments_unknown_symbol(self):
+        with pytest.raises(ValueError):
+            sparse_assignments(propSymbolSet, [['Z']])
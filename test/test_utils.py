@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+@author: David Herron
+"""
+
+'''
+A pytest test module.
+
+This test module defines tests for reading CNF expressions from PLRE
+input text files.
+'''
+
+#%%
+
+# Specify whether you have installed the PLRE in your
+# Python environment. If you have not done so, don't
+# worry, we handle that case.
+use_installed_package = False
+
+
+#%%
+
+# NOTE:
+# If the PLRE is not installed, the code block below appends the parent
+# directory of the 'plre' package (folder) to sys.path so that the 'plre'
+# can be found when the import statements are processed. But the solution
+# only works if 'pytest' is invoked at the command line from within the
+# 'test' directory.
+#
+# Example:
+# $ cd test
+# $ pytest
+
+import os
+import sys
+
+if use_installed_package:
+    pass
+else:
+    plre_parent_dir = os.path.abspath('..')
+    if not os.path.exists(plre_parent_dir):
+        print('Error obtaining PLRE parent directory')
+    sys.path.append(plre_parent_dir)
+
+import plre.plre_utils as pu
+
+import pytest
+
+
+#%%
+
+content = '''# a comment
+A & B
+
+# another comment
+(A | B) &
+(C | !D)
+
+\t
+!A
+'''
+
+demo_file = os.path.join(plre_parent_dir, 'demo', 'demo1_cnf_expressions.txt')
+
+
+#%%
+
+class Test_ReadingExpressions:
+
+    @pytest.mark.parametrize('use_mmap', [False, True])
+    def test_iter_cnf_expressions(self, tmp_path, use_mmap):
+        filepath = tmp_path / 'input.txt'
+        filepath.write_text(content)
+        assert list(pu.iter_cnf_expressions(filepath, use_mmap=use_mmap)) == [
+            (2, 'A & B'),
+            (5, '(A | B) &\n(C | !D)'),
+            (9, '!A'),
+        ]
+
+    def test_iter_is_lazy(self, tmp_path):
+        filepath = tmp_path / 'input.txt'
+        filepath.write_text(content)
+        expressions = pu.iter_cnf_expressions(filepath)
+        assert next(expressions) == (2, 'A & B')
+
+    @pytest.mark.parametrize('use_mmap', [False, True])
+    def test_empty_file(self, tmp_path, use_mmap):
+        filepath = tmp_path / 'input.txt'
+        filepath.write_text('')
+        assert list(pu.iter_cnf_expressions(filepath, use_mmap=use_mmap)) == []
+
+    def test_demo_file(self):
+        expressions = pu.get_cnf_expressions(demo_file)
+        assert len(expressions) == 17
+        assert expressions[-1] == '(A | B | !C) & \n(!B | C | !D) & \n(!A | D)'
+
+    def test_get_prop_symbols(self, tmp_path):
+        filepath = tmp_path / 'symbols.txt'
+        filepath.write_text('# symbols\nRed, Green\nBlue\n\nBig Small\n')
+        assert pu.get_prop_symbols(filepath) == ['Red', 'Green', 'Blue', 'Big', 'Small']
+
+
+
+#%%
+
+class Test_ParseCnf:
+
+    def test_lexer_and_parser_are_reused(self):
+        _, parser1 = pu.parse_cnf('A & B')
+        _, parser2 = pu.parse_cnf('(A | !C)')
+        assert parser1 is parser2
+
+    def test_valid_after_invalid(self):
+        tree, parser = pu.parse_cnf('(A & B')
+        assert tree is None and parser.getNumberOfSyntaxErrors() == 1
+        tree, parser = pu.parse_cnf('(A | B) & !C')
+        assert parser.getNumberOfSyntaxErrors() == 0
+        assert tree.getText() == '(A|B)&!C<EOF>'
+
+    def test_syntax_errors_are_reported(self, capsys):
+        tree, _ = pu.parse_cnf('A & )')
+        assert tree is None
+        captured = capsys.readouterr()
+        assert 'syntax errors: 1' in captured.out
+        assert "line 1:4" in captured.err